@@ -6,144 +6,278 @@ This example demonstrates how to load and use the cloud configuration
 from config/cloud_settings.yaml to set up cloud storage backends.
 """
 
+import json
 import os
 import sys
-import yaml
+import time
 from pathlib import Path
 
-# Add the project root to the Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# Add the project root to the Python path when run as a script; importers
+# are expected to have it on sys.path already
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if __name__ == "__main__" and _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from pipeline.utils.common import create_storage_backend, DataManager
 
+CREDENTIAL_ENV_VARS = (
+    'AWS_ACCESS_KEY_ID',
+    'AWS_SECRET_ACCESS_KEY',
+    'AWS_SESSION_TOKEN',
+    'AWS_DEFAULT_REGION',
+    'AWS_REGION',
+    'GOOGLE_APPLICATION_CREDENTIALS',
+    'AZURE_STORAGE_CONNECTION_STRING',
+)
+BACKEND_CACHE_TTL_SECONDS = 3300
+
+# (provider, bucket, account, region) -> (created_at, backend)
+_backend_cache = {}
+
+# Config section holding each provider's settings
+PROVIDER_SECTIONS = {'s3': 'aws', 'gcs': 'gcs', 'azure': 'azure'}
+
+def _load_provider_config(stream):
+    """Build the config dict for the configured provider only.
+    
+    The document is composed into nodes, then only top-level scalars (such as
+    storage_provider) and the selected provider's section are constructed;
+    the remaining sections are never turned into Python objects.
+    """
+    import yaml  # Deferred: only needed when a config file is actually read
+    
+    loader_cls = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    root = yaml.compose(stream, Loader=loader_cls)
+    if root is None:
+        return {}
+    if not isinstance(root, yaml.MappingNode):
+        raise ValueError("cloud_settings.yaml must contain a mapping")
+    
+    constructor = yaml.SafeLoader("")
+    sections = {}
+    config = {}
+    for key_node, value_node in root.value:
+        if isinstance(value_node, yaml.ScalarNode):
+            config[key_node.value] = constructor.construct_document(value_node)
+        else:
+            sections[key_node.value] = value_node
+    
+    section_name = PROVIDER_SECTIONS.get(config.get('storage_provider', 'local'))
+    if section_name in sections:
+        config[section_name] = constructor.construct_document(sections[section_name])
+    return config
+
 def load_cloud_config():
-    """Load cloud configuration from config/cloud_settings.yaml."""
+    """Load cloud configuration from config/cloud_settings.yaml.
+    
+    Only the active provider's section is materialized. The result is cached
+    next to the YAML as JSON and reused while the cache is at least as new as
+    the YAML file.
+    """
     config_path = Path("config/cloud_settings.yaml")
+    cache_path = config_path.with_name(".cloud_settings.cache.json")
     
-    if not config_path.exists():
+    try:
+        yaml_mtime = config_path.stat().st_mtime_ns
+    except FileNotFoundError:
         print("❌ config/cloud_settings.yaml not found")
         print("Please create the cloud configuration file first.")
         return None
     
+    try:
+        if cache_path.stat().st_mtime_ns >= yaml_mtime:
+            with open(cache_path, 'r') as f:
+                config = json.load(f)
+            print("✅ Cloud configuration loaded successfully (cached)")
+            return config
+    except (OSError, ValueError):
+        pass  # Missing or unreadable cache; fall back to parsing the YAML
+    
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = _load_provider_config(f)
         print("✅ Cloud configuration loaded successfully")
-        return config
     except Exception as e:
         print(f"❌ Error loading cloud configuration: {e}")
         return None
+    
+    try:
+        tmp_path = cache_path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(config, f, default=str)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Caching is best-effort
+    
+    return config
+
+def _backend_cache_key(config):
+    """Identify a backend by provider and the bucket/account it targets."""
+    storage_provider = config.get('storage_provider', 'local')
+    section = config.get(PROVIDER_SECTIONS.get(storage_provider, storage_provider), {}) or {}
+    return (
+        storage_provider,
+        section.get('bucket_name') or section.get('container_name') or '',
+        section.get('account_name') or '',
+        section.get('region') or ''
+    )
 
 def create_storage_backend_from_config(config):
-    """Create storage backend based on configuration."""
+    """Create storage backend based on configuration.
+    
+    Backends are memoized per provider/bucket for BACKEND_CACHE_TTL_SECONDS
+    (just under the 60-minute STS credential lifetime). If rebuilding an
+    expired backend fails, the previous one is returned instead.
+    """
+    key = _backend_cache_key(config)
+    now = time.monotonic()
+    cached = _backend_cache.get(key)
+    if cached is not None and now - cached[0] < BACKEND_CACHE_TTL_SECONDS:
+        return cached[1]
+    
+    # Empty strings count as unset so they never shadow real credentials
+    env = {name: os.environ.get(name) or None for name in CREDENTIAL_ENV_VARS}
+    backend = _build_storage_backend(config, env)
+    if backend is not None:
+        _backend_cache[key] = (now, backend)
+        return backend
+    
+    if cached is not None:
+        print(f"⚠️  Could not refresh {key[0].upper()} backend; reusing the previous one")
+        return cached[1]
+    return None
+
+def _create_backend(label, target, storage_type, **kwargs):
+    """Create a backend via create_storage_backend, reporting the outcome."""
+    try:
+        backend = create_storage_backend(storage_type=storage_type, **kwargs)
+        print(f"✅ {label} storage backend created for {target}")
+        return backend
+    except Exception as e:
+        print(f"❌ Error creating {label} backend: {e}")
+        return None
+
+def _make_local(config, env):
+    print("✅ Using local filesystem storage (default)")
+    return None  # DataManager will use local storage by default
+
+def _make_s3(config, env):
+    aws_config = config.get('aws', {})
+    
+    # Leave credentials to boto3's default chain (env vars, ~/.aws,
+    # instance/task role); keys from the config only apply when the
+    # environment has none and both values are actually set.
+    aws_access_key = aws_secret_key = aws_session_token = None
+    if (not env.get('AWS_ACCESS_KEY_ID') and aws_config.get('access_key_id')
+            and aws_config.get('secret_access_key')):
+        aws_access_key = aws_config['access_key_id']
+        aws_secret_key = aws_config['secret_access_key']
+        aws_session_token = aws_config.get('session_token') or None
+    
+    aws_region = None
+    if not env.get('AWS_DEFAULT_REGION') and not env.get('AWS_REGION'):
+        aws_region = aws_config.get('region') or 'us-east-1'
+    
+    bucket_name = aws_config.get('bucket_name')
+    if not bucket_name or bucket_name == 'your-s3-bucket-name':
+        print("❌ Please configure a valid S3 bucket name in config/cloud_settings.yaml")
+        return None
+    
+    return _create_backend(
+        "S3", f"bucket: {bucket_name}", "s3",
+        bucket_name=bucket_name,
+        aws_access_key_id=aws_access_key,
+        aws_secret_access_key=aws_secret_key,
+        aws_session_token=aws_session_token,
+        region_name=aws_region,
+        transfer_config=aws_config.get('transfer')
+    )
+
+def _make_gcs(config, env):
+    gcs_config = config.get('gcs', {})
+    
+    # Application Default Credentials handle GOOGLE_APPLICATION_CREDENTIALS,
+    # gcloud and the metadata server; the config file is only a fallback.
+    credentials_file = None
+    if not env.get('GOOGLE_APPLICATION_CREDENTIALS'):
+        credentials_file = gcs_config.get('credentials_file') or None
+    
+    bucket_name = gcs_config.get('bucket_name')
+    if not bucket_name or bucket_name == 'your-gcs-bucket-name':
+        print("❌ Please configure a valid GCS bucket name in config/cloud_settings.yaml")
+        return None
+    
+    return _create_backend(
+        "GCS", f"bucket: {bucket_name}", "gcs",
+        bucket_name=bucket_name,
+        credentials_file=credentials_file
+    )
+
+def _make_azure(config, env):
+    azure_config = config.get('azure', {})
+    
+    # Check for environment variable first
+    connection_string = env.get('AZURE_STORAGE_CONNECTION_STRING') or azure_config.get('connection_string')
+    
+    if not connection_string:
+        print("❌ Azure connection string not found")
+        print("Please set AZURE_STORAGE_CONNECTION_STRING environment variable or configure connection_string in config")
+        return None
+    
+    account_name = azure_config.get('account_name')
+    container_name = azure_config.get('container_name')
+    
+    if not account_name or not container_name:
+        print("❌ Please configure account_name and container_name in config/cloud_settings.yaml")
+        return None
+    
+    return _create_backend(
+        "Azure", f"container: {container_name}", "azure",
+        account_name=account_name,
+        container_name=container_name,
+        connection_string=connection_string
+    )
+
+def _make_unsupported(config, env):
+    print(f"❌ Unsupported storage provider: {config.get('storage_provider')}")
+    return None
+
+_PROVIDER_FACTORIES = {
+    'local': _make_local,
+    's3': _make_s3,
+    'gcs': _make_gcs,
+    'azure': _make_azure,
+}
+
+def _build_storage_backend(config, env):
+    """Build a storage backend from configuration and credential env vars."""
     storage_provider = config.get('storage_provider', 'local')
     
     print(f"\n🔧 Creating {storage_provider.upper()} storage backend...")
+    return _PROVIDER_FACTORIES.get(storage_provider, _make_unsupported)(config, env)
+
+class Printer:
+    """Collect print-style output and write it to stdout in one call."""
     
-    if storage_provider == 'local':
-        print("✅ Using local filesystem storage (default)")
-        return None  # DataManager will use local storage by default
+    def __init__(self):
+        self.buf = []
     
-    elif storage_provider == 's3':
-        aws_config = config.get('aws', {})
-        
-        # Check for environment variables first
-        aws_access_key = os.environ.get('AWS_ACCESS_KEY_ID') or aws_config.get('access_key_id')
-        aws_secret_key = os.environ.get('AWS_SECRET_ACCESS_KEY') or aws_config.get('secret_access_key')
-        aws_region = os.environ.get('AWS_DEFAULT_REGION') or aws_config.get('region', 'us-east-1')
-        
-        if not aws_access_key or not aws_secret_key:
-            print("❌ AWS credentials not found in environment or config")
-            print("Please set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY environment variables")
-            return None
-        
-        bucket_name = aws_config.get('bucket_name')
-        if not bucket_name or bucket_name == 'your-s3-bucket-name':
-            print("❌ Please configure a valid S3 bucket name in config/cloud_settings.yaml")
-            return None
-        
-        try:
-            backend = create_storage_backend(
-                storage_type="s3",
-                bucket_name=bucket_name,
-                aws_access_key_id=aws_access_key,
-                aws_secret_access_key=aws_secret_key,
-                region_name=aws_region
-            )
-            print(f"✅ S3 storage backend created for bucket: {bucket_name}")
-            return backend
-        except Exception as e:
-            print(f"❌ Error creating S3 backend: {e}")
-            return None
-    
-    elif storage_provider == 'gcs':
-        gcs_config = config.get('gcs', {})
-        
-        # Check for environment variable first
-        credentials_file = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS') or gcs_config.get('credentials_file')
-        
-        if not credentials_file:
-            print("❌ Google Cloud credentials not found")
-            print("Please set GOOGLE_APPLICATION_CREDENTIALS environment variable or configure credentials_file in config")
-            return None
-        
-        bucket_name = gcs_config.get('bucket_name')
-        if not bucket_name or bucket_name == 'your-gcs-bucket-name':
-            print("❌ Please configure a valid GCS bucket name in config/cloud_settings.yaml")
-            return None
-        
-        try:
-            backend = create_storage_backend(
-                storage_type="gcs",
-                bucket_name=bucket_name
-            )
-            print(f"✅ GCS storage backend created for bucket: {bucket_name}")
-            return backend
-        except Exception as e:
-            print(f"❌ Error creating GCS backend: {e}")
-            return None
-    
-    elif storage_provider == 'azure':
-        azure_config = config.get('azure', {})
-        
-        # Check for environment variable first
-        connection_string = os.environ.get('AZURE_STORAGE_CONNECTION_STRING') or azure_config.get('connection_string')
-        
-        if not connection_string:
-            print("❌ Azure connection string not found")
-            print("Please set AZURE_STORAGE_CONNECTION_STRING environment variable or configure connection_string in config")
-            return None
-        
-        account_name = azure_config.get('account_name')
-        container_name = azure_config.get('container_name')
-        
-        if not account_name or not container_name:
-            print("❌ Please configure account_name and container_name in config/cloud_settings.yaml")
-            return None
-        
-        try:
-            backend = create_storage_backend(
-                storage_type="azure",
-                account_name=account_name,
-                container_name=container_name,
-                connection_string=connection_string
-            )
-            print(f"✅ Azure storage backend created for container: {container_name}")
-            return backend
-        except Exception as e:
-            print(f"❌ Error creating Azure backend: {e}")
-            return None
-    
-    else:
-        print(f"❌ Unsupported storage provider: {storage_provider}")
-        return None
+    def __call__(self, *args):
+        self.buf.append(' '.join(map(str, args)))
+    
+    def flush(self):
+        if self.buf:
+            sys.stdout.write('\n'.join(self.buf) + '\n')
+            sys.stdout.flush()
+            self.buf.clear()
 
 def test_data_manager_with_cloud_storage():
     """Test DataManager with cloud storage backend."""
-    print("\n" + "="*60)
-    print("CLOUD STORAGE CONFIGURATION EXAMPLE")
-    print("="*60)
+    p = Printer()
+    p("\n" + "="*60)
+    p("CLOUD STORAGE CONFIGURATION EXAMPLE")
+    p("="*60)
+    p.flush()  # Config loading reports its own progress
     
     # Load cloud configuration
     config = load_cloud_config()
@@ -161,71 +295,68 @@ def test_data_manager_with_cloud_storage():
             storage_backend=storage_backend
         )
         
-        print(f"\n✅ DataManager created successfully")
-        print(f"   Storage type: {config.get('storage_provider', 'local')}")
-        print(f"   Base directory: cloud-storage-test")
-        print(f"   Test mode: True")
+        p(f"\n✅ DataManager created successfully")
+        p(f"   Storage type: {config.get('storage_provider', 'local')}")
+        p(f"   Base directory: cloud-storage-test")
+        p(f"   Test mode: True")
         
         # Test basic operations
-        print("\n🧪 Testing basic operations...")
+        p("\n🧪 Testing basic operations...")
         
-        # Test directory creation using storage backend
+        # Test file operations; object stores create the directory on write
         test_dir = "test-directory"
-        data_manager.storage.mkdir(test_dir, parents=True, exist_ok=True)
-        print(f"   ✅ Created directory: {test_dir}")
-        
-        # Test file operations
         test_file = f"{test_dir}/test-data.json"
         test_data = {"message": "Hello from cloud storage!", "timestamp": "2025-08-01"}
         
         data_manager.save_json(test_data, test_file)
-        print(f"   ✅ Saved test data to: {test_file}")
+        p(f"   ✅ Saved test data to: {test_file}")
         
+        # A successful save guarantees the file exists, so only read it back
         loaded_data = data_manager.load_json(test_file)
-        print(f"   ✅ Loaded test data: {loaded_data}")
-        
-        # Test file existence
-        exists = data_manager.storage.exists(test_file)
-        print(f"   ✅ File exists check: {exists}")
+        p(f"   ✅ Loaded test data: {loaded_data}")
         
-        # Cleanup
-        data_manager.storage.delete_file(test_file)
-        print(f"   ✅ Deleted test file: {test_file}")
+        # Cleanup: remove the test file and directory in one bulk call
+        data_manager.storage.delete_prefix(test_dir)
+        p(f"   ✅ Deleted test directory and contents: {test_dir}")
         
-        # Clean up test directory
-        data_manager.storage.delete_directory(test_dir)
-        print(f"   ✅ Deleted test directory: {test_dir}")
-        
-        print("\n🎉 Cloud storage test completed successfully!")
+        p("\n🎉 Cloud storage test completed successfully!")
         
     except Exception as e:
-        print(f"\n❌ Error testing DataManager: {e}")
+        p(f"\n❌ Error testing DataManager: {e}")
+    finally:
+        p.flush()
+
+_HELP_TEXT = """
+============================================================
+CLOUD STORAGE CONFIGURATION HELP
+============================================================
+
+📋 To configure cloud storage:
+1. Edit config/cloud_settings.yaml
+2. Set storage_provider to 's3', 'gcs', or 'azure'
+3. Configure the appropriate section (aws, gcs, or azure)
+4. Set environment variables for credentials
+
+🔑 Required Environment Variables:
+AWS S3:
+  export AWS_ACCESS_KEY_ID='your-access-key'
+  export AWS_SECRET_ACCESS_KEY='your-secret-key'
+  export AWS_DEFAULT_REGION='us-east-1'
+
+Google Cloud Storage:
+  export GOOGLE_APPLICATION_CREDENTIALS='/path/to/service-account-key.json'
+
+Azure Blob Storage:
+  export AZURE_STORAGE_CONNECTION_STRING='your-connection-string'
+
+📖 For detailed documentation, see docs/CLOUD_STORAGE.md
+"""
 
 def show_configuration_help():
-    """Show help for configuring cloud storage."""
-    print("\n" + "="*60)
-    print("CLOUD STORAGE CONFIGURATION HELP")
-    print("="*60)
-    
-    print("\n📋 To configure cloud storage:")
-    print("1. Edit config/cloud_settings.yaml")
-    print("2. Set storage_provider to 's3', 'gcs', or 'azure'")
-    print("3. Configure the appropriate section (aws, gcs, or azure)")
-    print("4. Set environment variables for credentials")
-    
-    print("\n🔑 Required Environment Variables:")
-    print("AWS S3:")
-    print("  export AWS_ACCESS_KEY_ID='your-access-key'")
-    print("  export AWS_SECRET_ACCESS_KEY='your-secret-key'")
-    print("  export AWS_DEFAULT_REGION='us-east-1'")
-    
-    print("\nGoogle Cloud Storage:")
-    print("  export GOOGLE_APPLICATION_CREDENTIALS='/path/to/service-account-key.json'")
-    
-    print("\nAzure Blob Storage:")
-    print("  export AZURE_STORAGE_CONNECTION_STRING='your-connection-string'")
-    
-    print("\n📖 For detailed documentation, see docs/CLOUD_STORAGE.md")
+    """Show help for configuring cloud storage (skipped when QUIET is set)."""
+    if os.environ.get('QUIET'):
+        return
+    sys.stdout.write(_HELP_TEXT)
 
 if __name__ == "__main__":
     # Show configuration help
@@ -8,132 +8,99 @@ Example demonstrating how to use the extended DataManager with different storage
 import os
 import sys
 from datetime import datetime
-import pandas as pd
+from functools import lru_cache
 
 # Add the pipeline directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'pipeline'))
 
 from utils.common import DataManager, create_storage_backend
 
-def example_local_storage():
-    """Example using local filesystem storage (default behavior)."""
-    print("=== Local Storage Example ===")
-    
-    # Create DataManager with local storage (default)
-    data_manager = DataManager(base_dir="data", test_mode=True)
+def _local_backend():
+    return None  # DataManager uses local storage by default
+
+def _s3_backend():
+    return create_storage_backend(
+        storage_type="s3",
+        bucket_name="your-bucket-name",
+        # aws_access_key_id="your-access-key",  # Optional if using AWS credentials
+        # aws_secret_access_key="your-secret-key",  # Optional if using AWS credentials
+        # region_name="us-east-1"  # Optional
+    )
+
+def _gcs_backend():
+    return create_storage_backend(
+        storage_type="gcs",
+        bucket_name="your-gcs-bucket-name",
+        # project_id="your-project-id"  # Optional if using default project
+    )
+
+_BACKEND_FACTORIES = {
+    "local": _local_backend,
+    "s3": _s3_backend,
+    "gcs": _gcs_backend,
+}
+
+# (name, base directory, backend key, install hint)
+EXAMPLES = [
+    ("Local", "data", "local", None),
+    ("S3", "project-three-data", "s3", "pip install boto3"),
+    ("GCS", "project-three-data", "gcs", "pip install google-cloud-storage"),
+]
+
+@lru_cache(maxsize=4)
+def _get_manager(base_dir, backend_key):
+    """Return a DataManager shared by every example using this base dir and backend."""
+    return DataManager(
+        base_dir=base_dir,
+        test_mode=True,
+        storage_backend=_BACKEND_FACTORIES[backend_key]()
+    )
+
+def _sample_data():
+    """Build the sample DataFrame shared by the storage examples."""
+    import pandas as pd  # Deferred so importing this module stays lightweight
     
-    # Create sample data
-    sample_data = pd.DataFrame({
+    return pd.DataFrame({
         'ticker': ['AAPL', 'GOOGL', 'MSFT'],
         'price': [150.0, 2800.0, 300.0],
         'volume': [1000000, 500000, 750000]
     })
-    
-    # Save data
-    data_manager.save_dataframe(sample_data, "data/test/raw/dt=2024-01-01/sample.parquet")
-    
-    # Load data
-    loaded_data = data_manager.load_dataframe("data/test/raw/dt=2024-01-01/sample.parquet")
-    print(f"Loaded data shape: {loaded_data.shape}")
-    
-    # Check storage info
-    print(f"Storage info: {data_manager.get_storage_info()}")
-    print()
 
-def example_s3_storage():
-    """Example using AWS S3 storage (requires boto3 and AWS credentials)."""
-    print("=== S3 Storage Example ===")
+def _run_example(name, base_dir, backend_key, install_hint, sample_data):
+    """Save and load sample data through one storage backend."""
+    print(f"=== {name} Storage Example ===")
     
     try:
-        # Create S3 storage backend
-        s3_backend = create_storage_backend(
-            storage_type="s3",
-            bucket_name="your-bucket-name",
-            # aws_access_key_id="your-access-key",  # Optional if using AWS credentials
-            # aws_secret_access_key="your-secret-key",  # Optional if using AWS credentials
-            # region_name="us-east-1"  # Optional
-        )
+        data_manager = _get_manager(base_dir, backend_key)
+        path = f"{base_dir}/test/raw/dt=2024-01-01/sample.parquet"
         
-        # Create DataManager with S3 backend
-        data_manager = DataManager(
-            base_dir="project-three-data",
-            test_mode=True,
-            storage_backend=s3_backend
-        )
+        # Save and load data
+        data_manager.save_dataframe(sample_data, path)
+        loaded_data = data_manager.load_dataframe(path)
+        print(f"Loaded data from {name} shape: {loaded_data.shape}")
         
-        # Create sample data
-        sample_data = pd.DataFrame({
-            'ticker': ['TSLA', 'AMZN', 'NVDA'],
-            'price': [250.0, 3300.0, 450.0],
-            'volume': [2000000, 800000, 1200000]
-        })
-        
-        # Save data to S3
-        data_manager.save_dataframe(sample_data, "project-three-data/test/raw/dt=2024-01-01/sample.parquet")
-        
-        # Load data from S3
-        loaded_data = data_manager.load_dataframe("project-three-data/test/raw/dt=2024-01-01/sample.parquet")
-        print(f"Loaded data from S3 shape: {loaded_data.shape}")
+        # Load only the columns needed; other column chunks are never decoded
+        prices = data_manager.load_dataframe(path, columns=['ticker', 'price'])
+        print(f"Loaded columns: {list(prices.columns)}")
         
         # Check storage info
         print(f"Storage info: {data_manager.get_storage_info()}")
         
     except ImportError as e:
-        print(f"S3 storage not available: {e}")
-        print("Install boto3: pip install boto3")
+        print(f"{name} storage not available: {e}")
+        print(f"Install with: {install_hint}")
     except Exception as e:
-        print(f"Error with S3 storage: {e}")
-    print()
-
-def example_gcs_storage():
-    """Example using Google Cloud Storage (requires google-cloud-storage and GCP credentials)."""
-    print("=== Google Cloud Storage Example ===")
-    
-    try:
-        # Create GCS storage backend
-        gcs_backend = create_storage_backend(
-            storage_type="gcs",
-            bucket_name="your-gcs-bucket-name",
-            # project_id="your-project-id"  # Optional if using default project
-        )
-        
-        # Create DataManager with GCS backend
-        data_manager = DataManager(
-            base_dir="project-three-data",
-            test_mode=True,
-            storage_backend=gcs_backend
-        )
-        
-        # Create sample data
-        sample_data = pd.DataFrame({
-            'ticker': ['META', 'NFLX', 'ADBE'],
-            'price': [350.0, 450.0, 550.0],
-            'volume': [1500000, 900000, 600000]
-        })
-        
-        # Save data to GCS
-        data_manager.save_dataframe(sample_data, "project-three-data/test/raw/dt=2024-01-01/sample.parquet")
-        
-        # Load data from GCS
-        loaded_data = data_manager.load_dataframe("project-three-data/test/raw/dt=2024-01-01/sample.parquet")
-        print(f"Loaded data from GCS shape: {loaded_data.shape}")
-        
-        # Check storage info
-        print(f"Storage info: {data_manager.get_storage_info()}")
-        
-    except ImportError as e:
-        print(f"GCS storage not available: {e}")
-        print("Install google-cloud-storage: pip install google-cloud-storage")
-    except Exception as e:
-        print(f"Error with GCS storage: {e}")
+        print(f"Error with {name} storage: {e}")
     print()
 
 def example_migration():
     """Example of migrating data between storage backends."""
+    import pandas as pd
+    
     print("=== Storage Migration Example ===")
     
-    # Create local DataManager
-    local_manager = DataManager(base_dir="data", test_mode=True)
+    # Reuse the local DataManager from the local storage example
+    local_manager = _get_manager("data", "local")
     
     # Create sample data locally
     sample_data = pd.DataFrame({
@@ -182,9 +149,9 @@ def main():
     print("=" * 50)
     
     # Run examples
-    example_local_storage()
-    example_s3_storage()
-    example_gcs_storage()
+    sample_data = _sample_data()
+    for name, base_dir, backend_key, install_hint in EXAMPLES:
+        _run_example(name, base_dir, backend_key, install_hint, sample_data)
     example_migration()
     
     print("All examples completed!")
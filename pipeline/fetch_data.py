@@ -20,27 +20,176 @@ Features:
 """
 
 import argparse
-import json
+import asyncio
+import concurrent.futures
+import importlib.util
 import logging
+import shutil
 import sys
+import threading
 import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-import yfinance as yf
+
+# Optional pyarrow support for faster ticker list reads and partitioned parquet writes
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# yfinance and the optional aiohttp (concurrent chart API requests) are
+# imported on first use; together they take a large share of the startup
+# time of --help and short test runs
+AIOHTTP_AVAILABLE = importlib.util.find_spec("aiohttp") is not None
+# Optional uvloop event loop for the chart request thread (not on Windows)
+UVLOOP_AVAILABLE = sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None
+
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
+# Days of OHLCV data stored per ticker in each raw partition
+PARTITION_WINDOW_DAYS = 30
+# Historical saves queued on the I/O pool before fetching waits for one
+MAX_PENDING_HISTORY_SAVES = 4
+
+YAHOO_REQUEST_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; project-three pipeline)"}
 
 # Import from utils directory
-from utils.common import create_partition_paths, save_metadata_to_file, cleanup_old_partitions, handle_rate_limit, load_config, DataManager, create_storage_backend
+from utils.common import create_partition_paths, save_metadata_to_file, cleanup_old_partitions, handle_rate_limit, compute_rate_limit_cooldown, load_config, DataManager, create_storage_backend, create_http_session, json_dumps_bytes, json_loads, parquet_write_options, AdaptiveConcurrency, raw_partition_has_data, load_raw_partition, raw_partition_parts, load_raw_partition_parts, RAW_PARTITION_FILE, RAW_PARTITION_PARTS_DIR, PARTITION_SUCCESS_MARKER
+from utils.rate_limit import TokenBucket
+from utils.logger import queued_logging
 from utils.progress import get_progress_tracker
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+
+@lru_cache(maxsize=256)
+def _read_ohlcv_cache_file(path: str, mtime_ns: int) -> pd.DataFrame:
+    """Read a cached OHLCV parquet file; keyed by mtime so rewrites are re-read."""
+    df = pd.read_parquet(path)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def _read_ohlcv_cache(cache_path: Path) -> Optional[pd.DataFrame]:
+    """Return the cached OHLCV frame for a ticker, or None if absent/unreadable."""
+    try:
+        return _read_ohlcv_cache_file(str(cache_path), cache_path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Ignoring unreadable OHLCV cache {cache_path}: {e}")
+        return None
+
+class PartitionWriter:
+    """
+    Write batches of ticker rows into one partition parquet file.
+    
+    Each batch is saved as a finished part file in the partition's
+    RAW_PARTITION_PARTS_DIR as soon as it is written, so an interrupted run
+    keeps every completed batch and the next run resumes after them.
+    close() combines the parts, in order, into the partition file under a
+    temporary name and moves it into place, so readers never see a
+    partial partition.
+    """
+    
+    def __init__(self, path: Path, parquet_options: Optional[Dict] = None, resume: bool = False):
+        self.path = path
+        self._tmp_path = path.with_name(path.name + ".tmp")
+        self._parts_dir = path.with_name(RAW_PARTITION_PARTS_DIR)
+        self._parquet_options = parquet_options or {"compression": "zstd"}
+        self._schema = None
+        if not resume:
+            # Batches left by an earlier run are not part of this one
+            shutil.rmtree(self._parts_dir, ignore_errors=True)
+        self._parts = raw_partition_parts(path.parent)
+        if self._parts and PYARROW_AVAILABLE:
+            self._schema = pq.read_schema(str(self._parts[0]))
+    
+    def write(self, frame: pd.DataFrame) -> None:
+        """Save a frame as the next part file (raises if it does not fit the schema)."""
+        if 'volume' in frame.columns and frame['volume'].dtype.kind == 'f':
+            # Keep volume int64 across batches even when a batch has gaps
+            frame = frame.assign(volume=frame['volume'].round().astype('Int64'))
+        part = self._parts_dir / f"part-{len(self._parts):05d}.parquet"
+        tmp_part = part.with_name(part.name + ".tmp")
+        self._parts_dir.mkdir(parents=True, exist_ok=True)
+        if PYARROW_AVAILABLE:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._schema is None:
+                schema = table.schema
+                index = schema.get_field_index('symbol')
+                if index >= 0:
+                    # Fixed index width so every batch's dictionary fits the schema
+                    schema = schema.set(index, pa.field('symbol', pa.dictionary(pa.int32(), pa.string())))
+                self._schema = schema
+            table = table.select(self._schema.names).cast(self._schema)
+            pq.write_table(table, str(tmp_part), **self._parquet_options)
+        else:
+            frame.to_parquet(tmp_part, index=False, **self._parquet_options)
+        # A part only appears under its final name once it is complete
+        tmp_part.replace(part)
+        self._parts.append(part)
+    
+    def close(self) -> bool:
+        """Combine the parts into the partition file; returns False if nothing was written."""
+        if not self._parts:
+            return False
+        if PYARROW_AVAILABLE:
+            # Copied part by part as row groups, one part in memory at a time
+            with pq.ParquetWriter(str(self._tmp_path), self._schema, **self._parquet_options) as writer:
+                for part in self._parts:
+                    writer.write_table(pq.read_table(str(part)).cast(self._schema))
+        else:
+            combined = pd.concat([pd.read_parquet(part) for part in self._parts], ignore_index=True)
+            combined.to_parquet(self._tmp_path, index=False, **self._parquet_options)
+        self._tmp_path.replace(self.path)
+        shutil.rmtree(self._parts_dir, ignore_errors=True)
+        self._parts = []
+        return True
+    
+    def abort(self) -> None:
+        """Discard a partially combined file; finished parts are kept for a resume."""
+        self._tmp_path.unlink(missing_ok=True)
+
+
 class OHLCVFetcher:
     def __init__(self, config_path: str = "config/settings.yaml", storage_provider: str = "local", storage_config_path: str = None):
         self.config = load_config(config_path, "ohlcv")
         self.logger = logging.getLogger(__name__)
+        self._http_session = None
+        self._yf_session = None
+        self._yf_session_supported = True
+        # Per-thread yfinance Ticker objects, reused across retries and batches
+        self._tls = threading.local()
+        # Background event loop and aiohttp session for chart API requests,
+        # kept for the whole run so connections stay warm, and the scheduled
+        # requests (with the days requested)
+        self._chart_loop = None
+        self._chart_thread = None
+        self._chart_session = None
+        self._chart_limiter: Optional[AdaptiveConcurrency] = None
+        self._chart_futures: Dict[str, Tuple[int, concurrent.futures.Future]] = {}
+        self._parquet_options = parquet_write_options(self.config)
+        self._bucket = TokenBucket(rate=self.config.get("requests_per_second", 5), capacity=10)
+        # Most recent earlier raw partition, used to seed tickers missing
+        # from the OHLCV cache; its data is loaded on first use
+        self._previous_partition_path: Optional[Path] = None
+        self._previous_partition_data: Optional[Dict[str, pd.DataFrame]] = None
+        # Latest ticker file per (ticker directory, directory mtime)
+        self._latest_ticker_files: Dict[Tuple[str, int], Path] = {}
+        
+        # Batched yfinance downloads: tickers of the current batch not yet
+        # requested, and per-ticker frames (with the days fetched) from the
+        # last batch download
+        self._yf_pending: List[str] = []
+        self._yf_prefetched: Dict[str, Tuple[int, pd.DataFrame]] = {}
         
         # Initialize storage backend and DataManager
         self.storage_provider = storage_provider
@@ -96,6 +245,57 @@ class OHLCVFetcher:
                 self.mode = 'prod'
         self.logger.info(f"[PIPELINE MODE] Running in {self.mode.upper()} mode.")
 
+    @property
+    def http_session(self):
+        """Shared HTTP session, created on first use, for API requests."""
+        if self._http_session is None:
+            self._http_session = create_http_session(
+                retries=self.config.get("api_retry_attempts", 3),
+                pool_connections=64,
+                pool_maxsize=64
+            )
+        return self._http_session
+
+    @property
+    def yfinance_session(self):
+        """Shared keep-alive session for yfinance, retrying 429 and 5xx responses."""
+        if self._yf_session is None:
+            self._yf_session = create_http_session(
+                retries=self.config.get("api_retry_attempts", 3),
+                backoff_factor=0.3,
+                pool_connections=64,
+                pool_maxsize=64,
+                status_forcelist=(429, 500, 502, 503, 504),
+                headers=YAHOO_REQUEST_HEADERS
+            )
+        return self._yf_session
+
+    def _yf_ticker(self, ticker: str):
+        """
+        Return this thread's yfinance Ticker for a symbol, reusing the shared session.
+
+        Recent yfinance releases only accept curl_cffi sessions; when the
+        requests session is rejected, yfinance's own session is used instead.
+        """
+        cache = getattr(self._tls, 'tickers', None)
+        if cache is None:
+            cache = self._tls.tickers = {}
+        stock = cache.get(ticker)
+        if stock is not None:
+            return stock
+        
+        import yfinance as yf
+        if self._yf_session_supported:
+            try:
+                stock = yf.Ticker(ticker, session=self.yfinance_session)
+            except Exception as e:
+                self._yf_session_supported = False
+                self.logger.debug(f"yfinance rejected shared session, using its default: {e}")
+        if stock is None:
+            stock = yf.Ticker(ticker)
+        cache[ticker] = stock
+        return stock
+
     def get_latest_ticker_file(self, test_mode: bool = False) -> Optional[Path]:
         """
         Get the latest ticker file from the most recent partition.
@@ -111,23 +311,35 @@ class OHLCVFetcher:
         else:
             ticker_base_path = Path(self.config.get("base_data_path", "data/")) / self.config.get("ticker_data_path", "tickers")
         
-        if not ticker_base_path.exists():
+        try:
+            # Adding a partition changes the directory's mtime, which
+            # invalidates the memoized result
+            cache_key = (str(ticker_base_path), ticker_base_path.stat().st_mtime_ns)
+        except FileNotFoundError:
             self.logger.error(f"Ticker directory not found: {ticker_base_path}")
             return None
         
-        # Find all dt=* directories and get the latest one
-        partitions = [d for d in ticker_base_path.iterdir() if d.is_dir() and d.name.startswith('dt=')]
-        if not partitions:
+        cached = self._latest_ticker_files.get(cache_key)
+        if cached is not None and cached.exists():
+            return cached
+        
+        # dt=YYYY-MM-DD names sort chronologically; take the max in one pass
+        latest_partition = max(
+            (d for d in ticker_base_path.iterdir() if d.name.startswith('dt=') and d.is_dir()),
+            key=lambda d: d.name,
+            default=None
+        )
+        if latest_partition is None:
             self.logger.error(f"No ticker partitions found in {ticker_base_path}")
             return None
         
-        latest_partition = max(partitions, key=lambda x: x.name)
         ticker_file = latest_partition / "tickers.csv"
         
         if not ticker_file.exists():
             self.logger.error(f"Ticker file not found: {ticker_file}")
             return None
         
+        self._latest_ticker_files[cache_key] = ticker_file
         self.logger.info(f"Found latest ticker file: {ticker_file}")
         return ticker_file
 
@@ -142,8 +354,23 @@ class OHLCVFetcher:
             List of ticker symbols
         """
         try:
-            df = pd.read_csv(ticker_file)
-            tickers = df['symbol'].tolist()
+            if PYARROW_AVAILABLE:
+                # Multithreaded C++ parser; symbols are kept as strings
+                table = pacsv.read_csv(
+                    ticker_file,
+                    read_options=pacsv.ReadOptions(use_threads=True, block_size=1 << 20),
+                    convert_options=pacsv.ConvertOptions(
+                        include_columns=['symbol'],
+                        column_types={'symbol': pa.string()}
+                    )
+                )
+                tickers = table.column('symbol').to_pylist()
+            else:
+                # C parser over a memory-mapped file; "NA"-like symbols stay strings
+                tickers = pd.read_csv(
+                    ticker_file, memory_map=True, engine='c', usecols=['symbol'],
+                    dtype={'symbol': str}, keep_default_na=False
+                )['symbol'].to_numpy(dtype=object).tolist()
             self.logger.info(f"Loaded {len(tickers)} tickers from {ticker_file}")
             return tickers
         except Exception as e:
@@ -161,38 +388,491 @@ class OHLCVFetcher:
         Returns:
             DataFrame with OHLCV data, or None if failed
         """
+        handled, prefetched = self._take_prefetched(ticker, days)
+        if handled:
+            # A failed streamed request falls back to Alpha Vantage rather
+            # than sending the same chart request again
+            return prefetched
+        
+        data = self.fetch_ohlcv_chart(ticker, days)
+        if data is not None:
+            return data
+        
         try:
             self.logger.debug(f"Fetching {ticker} data from yfinance ({days} days)")
-            stock = yf.Ticker(ticker)
-            data = stock.history(period=f"{days}d")
+            self._bucket.acquire()
+            stock = self._yf_ticker(ticker)
+            history = stock.history(period=f"{days}d")
             
-            if data.empty:
+            if history.empty:
                 self.logger.warning(f"No data returned for {ticker}")
                 return None
             
-            # Reset index to make date a column
-            data = data.reset_index()
+            data = self._frame_from_yfinance_history(ticker, history)
+            if data is not None:
+                self.logger.debug(f"Successfully fetched {len(data)} rows for {ticker}")
+            return data
             
-            # Rename columns to lowercase
-            data.columns = [col.lower() for col in data.columns]
+        except Exception as e:
+            self._throttle_on_rate_limit(e)
+            self.logger.error(f"Error fetching {ticker} from yfinance: {e}")
+            return None
+
+    def _frame_from_yfinance_history(self, ticker: str, history: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Convert a yfinance history frame to the historical data schema."""
+        # Ensure required columns exist
+        required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+        missing = [col.lower() for col in required_columns if col not in history.columns]
+        if missing:
+            self.logger.warning(f"Missing columns for {ticker}: {missing}")
+            return None
+        
+        # Build the output frame with its final column names in one pass
+        # (no reset_index copy or rename), using the historical data schema
+        return pd.DataFrame({
+            'date': history.index,
+            'open': history['Open'].to_numpy(),
+            'high': history['High'].to_numpy(),
+            'low': history['Low'].to_numpy(),
+            'close': history['Close'].to_numpy(),
+            'volume': history['Volume'].to_numpy(),
+            'dividends': history['Dividends'].to_numpy() if 'Dividends' in history.columns else 0.0,
+            'stock_splits': history['Stock Splits'].to_numpy() if 'Stock Splits' in history.columns else 0.0
+        })
+
+    def fetch_ohlcv_yfinance_batch(self, tickers: List[str], days: int) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLCV data for several tickers with one yfinance download.
+        
+        Args:
+            tickers: Ticker symbols
+            days: Number of days to fetch
             
-            # Ensure required columns exist
-            required_columns = ['date', 'open', 'high', 'low', 'close', 'volume']
-            if not all(col in data.columns for col in required_columns):
-                missing = [col for col in required_columns if col not in data.columns]
-                self.logger.warning(f"Missing columns for {ticker}: {missing}")
-                return None
+        Returns:
+            Dictionary of ticker -> DataFrame for tickers that returned data
+        """
+        results = {}
+        if not tickers:
+            return results
+        
+        try:
+            import yfinance as yf
+            self.logger.debug(f"Fetching {len(tickers)} tickers from yfinance in one batch ({days} days)")
+            self._bucket.acquire()
+            data = yf.download(
+                tickers=" ".join(tickers),
+                period=f"{days}d",
+                group_by='ticker',
+                auto_adjust=True,
+                actions=True,
+                threads=True,
+                progress=False
+            )
+        except Exception as e:
+            self._throttle_on_rate_limit(e)
+            self.logger.error(f"Error fetching batch from yfinance: {e}")
+            return results
+        
+        if data is None or data.empty:
+            return results
+        
+        grouped = isinstance(data.columns, pd.MultiIndex)
+        for ticker in tickers:
+            if grouped:
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                history = data[ticker]
+            elif len(tickers) == 1:
+                history = data
+            else:
+                continue
             
-            # Convert date to datetime if needed
-            data['date'] = pd.to_datetime(data['date'])
+            # Rows only present for other tickers in the batch are all-NaN here
+            history = history.dropna(subset=[c for c in ('Open', 'High', 'Low', 'Close') if c in history.columns], how='all')
+            if history.empty:
+                continue
+            if 'Volume' in history.columns and not history['Volume'].isna().any():
+                history = history.astype({'Volume': 'int64'})
             
-            self.logger.debug(f"Successfully fetched {len(data)} rows for {ticker}")
-            return data
+            frame = self._frame_from_yfinance_history(ticker, history)
+            if frame is not None:
+                results[ticker] = frame
+        
+        self.logger.debug(f"Batch download returned data for {len(results)}/{len(tickers)} tickers")
+        return results
+
+    def _frame_from_chart(self, ticker: str, payload: Dict) -> Optional[pd.DataFrame]:
+        """
+        Convert a Yahoo chart API response to the historical data schema.
+        
+        Prices are adjusted with adjclose, matching Ticker.history's default
+        auto_adjust=True.
+        """
+        results = (payload.get("chart") or {}).get("result") or []
+        if not results:
+            return None
+        result = results[0]
+        timestamps = result.get("timestamp")
+        indicators = result.get("indicators") or {}
+        quote = (indicators.get("quote") or [{}])[0]
+        if not timestamps or not quote:
+            return None
+        
+        n = len(timestamps)
+        
+        def column(values):
+            if values is None or len(values) != n:
+                return np.full(n, np.nan)
+            if PYARROW_AVAILABLE:
+                # Typed Arrow conversion: nulls become NaN without per-item checks
+                return pa.array(values, type=pa.float64()).to_numpy(zero_copy_only=False)
+            return np.array(values, dtype=float)
+        
+        open_, high, low, close = (column(quote.get(name)) for name in ("open", "high", "low", "close"))
+        volume = column(quote.get("volume"))
+        adjclose = (indicators.get("adjclose") or [{}])[0].get("adjclose")
+        if adjclose is not None:
+            adjusted_close = column(adjclose)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = adjusted_close / close
+            open_, high, low, close = open_ * ratio, high * ratio, low * ratio, adjusted_close
+        
+        dates = pd.to_datetime(np.asarray(timestamps, dtype=np.int64), unit="s", utc=True)
+        timezone_name = (result.get("meta") or {}).get("exchangeTimezoneName")
+        if timezone_name:
+            dates = dates.tz_convert(timezone_name)
+        dates = dates.normalize()
+        
+        def event_column(events, value):
+            if not events:
+                return np.zeros(n)
+            event_dates = pd.to_datetime([int(e["date"]) for e in events.values()], unit="s", utc=True)
+            if timezone_name:
+                event_dates = event_dates.tz_convert(timezone_name)
+            series = pd.Series([value(e) for e in events.values()], index=event_dates.normalize())
+            series = series[~series.index.duplicated()]
+            return series.reindex(dates).fillna(0.0).to_numpy()
+        
+        events = result.get("events") or {}
+        dividends = event_column(events.get("dividends"), lambda e: float(e.get("amount", 0.0)))
+        splits = event_column(events.get("splits"),
+                              lambda e: float(e.get("numerator", 1)) / float(e.get("denominator", 1) or 1))
+        
+        # Build the output frame directly in the historical data schema,
+        # dropping bars without a close
+        keep = ~np.isnan(close)
+        if not keep.any():
+            return None
+        volume = volume[keep]
+        if not np.isnan(volume).any():
+            volume = volume.astype(np.int64)
+        return pd.DataFrame({
+            'date': dates[keep],
+            'open': open_[keep],
+            'high': high[keep],
+            'low': low[keep],
+            'close': close[keep],
+            'volume': volume,
+            'dividends': dividends[keep],
+            'stock_splits': splits[keep]
+        })
+
+    def fetch_ohlcv_chart(self, ticker: str, days: int) -> Optional[pd.DataFrame]:
+        """
+        Fetch OHLCV data for one ticker straight from the Yahoo chart API.
+        
+        Skips Ticker.history's object setup and frame post-processing; the
+        frame is built from the response arrays. Returns None on any failure
+        so callers can fall back to Ticker.history.
+        
+        Args:
+            ticker: Ticker symbol
+            days: Number of days to fetch
             
+        Returns:
+            DataFrame with OHLCV data, or None if failed
+        """
+        try:
+            self._bucket.acquire()
+            params = {"range": f"{days}d", "interval": "1d", "events": "div,splits"}
+            response = self.yfinance_session.get(YAHOO_CHART_URL.format(ticker=ticker), params=params, timeout=30)
+            if response.status_code == 429:
+                self._bucket.throttle()
+            if response.status_code != 200:
+                self.logger.debug(f"Chart API returned HTTP {response.status_code} for {ticker}")
+                return None
+            return self._parse_chart_response(ticker, response.content)
         except Exception as e:
-            self.logger.error(f"Error fetching {ticker} from yfinance: {e}")
+            self.logger.debug(f"Chart API request failed for {ticker}: {e}")
             return None
 
+    def _parse_chart_response(self, ticker: str, body: bytes) -> Optional[pd.DataFrame]:
+        try:
+            return self._frame_from_chart(ticker, json_loads(body))
+        except Exception as e:
+            self.logger.debug(f"Could not parse chart API response for {ticker}: {e}")
+            return None
+
+    async def _fetch_chart_async(self, session, limiter: AdaptiveConcurrency, ticker: str, days: int) -> Tuple[str, Optional[pd.DataFrame]]:
+        loop = asyncio.get_running_loop()
+        params = {"range": f"{days}d", "interval": "1d", "events": "div,splits"}
+        max_attempts = self.config.get("api_retry_attempts", 3)
+        body = None
+        async with limiter.slot():
+            for attempt in range(max_attempts):
+                # Waiting for a token or a backoff must not block the loop,
+                # which keeps serving the other in-flight requests
+                await self._bucket.acquire_async()
+                try:
+                    async with session.get(YAHOO_CHART_URL.format(ticker=ticker), params=params) as response:
+                        if response.status == 200:
+                            body = await response.read()
+                            limiter.on_success()
+                            break
+                        retry_after = response.headers.get("Retry-After")
+                        if response.status == 429:
+                            self._bucket.throttle()
+                            limiter.on_overload()
+                        elif response.status < 500:
+                            self.logger.debug(f"Chart API returned HTTP {response.status} for {ticker}")
+                            return ticker, None
+                except Exception as e:
+                    self.logger.debug(f"Chart API request failed for {ticker}: {e}")
+                    return ticker, None
+                
+                self.logger.debug(f"Chart API returned HTTP {response.status} for {ticker} (attempt {attempt + 1}/{max_attempts})")
+                if attempt + 1 < max_attempts:
+                    if retry_after and retry_after.isdigit():
+                        await asyncio.sleep(int(retry_after))
+                    else:
+                        await asyncio.sleep(compute_rate_limit_cooldown(attempt, self.config))
+        
+        if body is None:
+            return ticker, None
+        
+        # JSON decoding and frame building are CPU work; keep them off the
+        # event loop so other responses keep being read
+        return ticker, await loop.run_in_executor(None, self._parse_chart_response, ticker, body)
+
+    async def _open_chart_session(self) -> None:
+        import aiohttp
+        concurrency = self.config.get("async_max_concurrency", 50)
+        # Every request goes to the same host: resolve it once and keep the
+        # answer for the whole run rather than per new connection
+        connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency,
+                                         use_dns_cache=True, ttl_dns_cache=600)
+        timeout = aiohttp.ClientTimeout(total=30)
+        self._chart_session = aiohttp.ClientSession(connector=connector, timeout=timeout, headers=YAHOO_REQUEST_HEADERS)
+        if self._chart_limiter is None:
+            self._chart_limiter = AdaptiveConcurrency(
+                initial=self.config.get("async_initial_concurrency", 10),
+                min_concurrency=1,
+                max_concurrency=concurrency
+            )
+
+    async def _close_chart_tasks(self) -> None:
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._chart_session is not None:
+            await self._chart_session.close()
+
+    def _submit_chart_fetch(self, ticker: str, days: int) -> concurrent.futures.Future:
+        """
+        Schedule a chart API request on the background event loop.
+        
+        The loop runs in a daemon thread for the fetcher's lifetime, so
+        requests proceed while the caller processes earlier results.
+        """
+        if self._chart_loop is None:
+            if UVLOOP_AVAILABLE:
+                import uvloop
+                loop = uvloop.new_event_loop()
+            else:
+                loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="chart-fetch", daemon=True)
+            thread.start()
+            self._chart_loop, self._chart_thread = loop, thread
+            asyncio.run_coroutine_threadsafe(self._open_chart_session(), loop).result()
+        return asyncio.run_coroutine_threadsafe(
+            self._fetch_chart_async(self._chart_session, self._chart_limiter, ticker, days), self._chart_loop
+        )
+
+    def close_chart_session(self) -> None:
+        """Cancel outstanding chart requests and stop the background event loop."""
+        self._chart_futures = {}
+        loop = self._chart_loop
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_chart_tasks(), loop).result(timeout=30)
+        except Exception as e:
+            self.logger.debug(f"Error closing chart API session: {e}")
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            self._chart_thread.join(timeout=30)
+            loop.close()
+            self._chart_loop = None
+            self._chart_thread = None
+            self._chart_session = None
+
+    def fetch_ohlcv_chart_batch(self, tickers: List[str], days: int) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLCV data for several tickers concurrently from the Yahoo chart API.
+        
+        Requests share one aiohttp connection pool and are capped by
+        async_max_concurrency. The event loop and session persist until
+        close_chart_session(). Tickers that fail are left out of the result
+        so callers can fall back to yfinance.
+        
+        Args:
+            tickers: Ticker symbols
+            days: Number of days to fetch
+            
+        Returns:
+            Dictionary of ticker -> DataFrame for tickers that returned data
+        """
+        if not tickers or not AIOHTTP_AVAILABLE:
+            return {}
+        results = {}
+        try:
+            futures = [self._submit_chart_fetch(ticker, days) for ticker in tickers]
+            for future in futures:
+                ticker, df = future.result()
+                if df is not None:
+                    results[ticker] = df
+        except Exception as e:
+            self.logger.warning(f"Concurrent chart fetch failed, falling back to yfinance: {e}")
+            return results
+        self.logger.debug(f"Chart API returned data for {len(results)}/{len(tickers)} tickers")
+        return results
+
+    def _start_chart_stream(self, plan: Dict[str, int]) -> None:
+        """
+        Schedule streamed chart API requests for the run's tickers.
+        
+        plan maps each ticker that needs a source fetch to the days it will
+        request (see _chart_fetch_plan). All requests are scheduled up front,
+        so slow tickers only delay their own processing rather than a whole
+        batch.
+        """
+        self._chart_futures = {}
+        self._chart_limiter = None
+        try:
+            for ticker, days in plan.items():
+                self._chart_futures[ticker] = (days, self._submit_chart_fetch(ticker, days))
+        except Exception as e:
+            self.logger.warning(f"Could not start chart API requests, falling back to yfinance: {e}")
+
+    def _chart_fetch_plan(self, tickers: List[str], incremental_mode: bool) -> Dict[str, int]:
+        """Map each ticker that needs a source fetch this run to the days it will request."""
+        plan = {}
+        for ticker in tickers:
+            try:
+                days = self._planned_fetch_days(ticker, incremental_mode)
+            except Exception as e:
+                # Fetched on its own when processed
+                self.logger.debug(f"Could not plan chart request for {ticker}: {e}")
+                continue
+            if days is not None:
+                plan[ticker] = days
+        return plan
+
+    def _planned_fetch_days(self, ticker: str, incremental_mode: bool) -> Optional[int]:
+        """
+        Return the days _ticker_output_data will request from the data
+        sources for ticker, or None if its history or cache is up to date.
+        """
+        days = PARTITION_WINDOW_DAYS
+        if incremental_mode:
+            latest_date = self.get_latest_date(ticker)
+            if latest_date is not None:
+                days = self._incremental_fetch_days(latest_date)
+                if days is None:
+                    return None
+        if not self.config.get("ohlcv_cache_enabled", True):
+            return days
+        return self._ohlcv_cache_plan(ticker, days)[2]
+
+    def _chart_stream_order(self, tickers: List[str]) -> Iterator[str]:
+        """
+        Yield tickers for processing, streamed ones in completion order.
+        
+        Tickers without a scheduled chart request (up to date or served from
+        cache) come first, in list order; the rest follow as their requests
+        finish, so a slow ticker does not hold up results that have already
+        arrived.
+        """
+        by_future = {self._chart_futures[t][1]: t for t in tickers if t in self._chart_futures}
+        streamed = set(by_future.values())
+        for ticker in tickers:
+            if ticker not in streamed:
+                yield ticker
+        for future in concurrent.futures.as_completed(by_future):
+            yield by_future[future]
+
+    def _start_yfinance_batch(self, tickers: List[str]) -> None:
+        """Register the next batch of tickers for a shared yfinance download."""
+        self._yf_pending = list(tickers)
+        self._yf_prefetched = {}
+
+    def _take_prefetched(self, ticker: str, days: int) -> Tuple[bool, Optional[pd.DataFrame]]:
+        """
+        Return prefetched data for ticker from its streamed chart request, or
+        from the pending yfinance batch download, which the batch's first
+        request starts.
+        
+        Returns (handled, data). handled is True when a streamed chart request
+        covered the ticker, so data is its result even if that is None: a
+        failed request is not sent again. Otherwise data is the batch result,
+        or None (per-ticker fetch) when the ticker was not prefetched, had no
+        data, or needs more days.
+        """
+        streamed = self._chart_futures.pop(ticker, None)
+        if streamed is not None:
+            streamed_days, future = streamed
+            try:
+                _, df = future.result()
+            except Exception as e:
+                self.logger.debug(f"Chart API request failed for {ticker}: {e}")
+                df = None
+            if streamed_days >= days:
+                return True, df
+        
+        if ticker in self._yf_pending:
+            remaining = self._yf_pending[self._yf_pending.index(ticker):]
+            batch_results = self.fetch_ohlcv_yfinance_batch(remaining, days)
+            self._yf_prefetched.update((t, (days, df)) for t, df in batch_results.items())
+            self._yf_pending = []
+        
+        cached = self._yf_prefetched.pop(ticker, None)
+        if cached is not None and cached[0] >= days:
+            return True, cached[1]
+        return False, None
+
+    def _throttle_on_rate_limit(self, error: Exception) -> None:
+        """Slow the request rate when yfinance reports a 429 / rate-limit error."""
+        message = str(error).lower()
+        if "too many requests" in message or "rate limit" in message or "429" in message:
+            self._bucket.throttle()
+
+    @staticmethod
+    def _alpha_vantage_rate_limit_message(data: Dict) -> Optional[str]:
+        """
+        Return the throttling message from an Alpha Vantage response, if any.
+        
+        Older responses report throttling under "Note"; the current free tier
+        uses "Information" instead.
+        """
+        for key in ("Note", "Information"):
+            message = data.get(key)
+            if isinstance(message, str):
+                lowered = message.lower()
+                if "call frequency" in lowered or "rate limit" in lowered:
+                    return message
+        return None
+
     def fetch_ohlcv_alpha_vantage(self, ticker: str, days: int) -> Optional[pd.DataFrame]:
         """
         Fetch OHLCV data using Alpha Vantage API.
@@ -210,8 +890,6 @@ class OHLCVFetcher:
             return None
         
         try:
-            import requests
-            
             url = "https://www.alphavantage.co/query"
             params = {
                 "function": "TIME_SERIES_DAILY",
@@ -221,43 +899,78 @@ class OHLCVFetcher:
             }
             
             self.logger.debug(f"Fetching {ticker} data from Alpha Vantage")
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
+            max_attempts = self.config.get("api_retry_attempts", 3)
+            data = None
+            for attempt in range(max_attempts):
+                self._bucket.acquire()
+                response = self.http_session.get(url, params=params, timeout=30)
+                
+                if response.status_code == 429:
+                    self._bucket.throttle()
+                    retry_after = response.headers.get("Retry-After")
+                    self.logger.warning(f"Alpha Vantage HTTP 429 for {ticker} (attempt {attempt + 1}/{max_attempts})")
+                    if attempt + 1 < max_attempts:
+                        if retry_after and retry_after.isdigit():
+                            time.sleep(int(retry_after))
+                        else:
+                            handle_rate_limit(attempt, self.config)
+                    continue
+                
+                response.raise_for_status()
+                data = json_loads(response.content)
+                
+                rate_limit_message = self._alpha_vantage_rate_limit_message(data)
+                if rate_limit_message is None:
+                    break
+                
+                self._bucket.throttle()
+                self.logger.warning(f"Alpha Vantage rate limit for {ticker} (attempt {attempt + 1}/{max_attempts}): {rate_limit_message}")
+                data = None
+                if attempt + 1 < max_attempts:
+                    handle_rate_limit(attempt, self.config)
             
-            data = response.json()
+            if data is None:
+                self.logger.error(f"Alpha Vantage rate limit persisted for {ticker} after {max_attempts} attempts")
+                return None
             
             if "Error Message" in data:
                 self.logger.error(f"Alpha Vantage error for {ticker}: {data['Error Message']}")
                 return None
             
-            if "Note" in data:
-                self.logger.warning(f"Alpha Vantage rate limit for {ticker}: {data['Note']}")
-                return None
-            
             time_series = data.get("Time Series (Daily)")
             if not time_series:
                 self.logger.warning(f"No time series data for {ticker}")
                 return None
             
-            # Convert to DataFrame
-            records = []
-            for date, values in time_series.items():
-                records.append({
-                    'date': date,
-                    'open': float(values['1. open']),
-                    'high': float(values['2. high']),
-                    'low': float(values['3. low']),
-                    'close': float(values['4. close']),
-                    'volume': int(values['5. volume'])
-                })
-            
-            df = pd.DataFrame(records)
-            df['date'] = pd.to_datetime(df['date'])
-            df = df.sort_values('date').reset_index(drop=True)
-            
-            # Limit to requested days
-            if len(df) > days:
-                df = df.tail(days)
+            # ISO date keys sort chronologically: keep only the newest `days`
+            # entries, oldest first, so no frame-level sort or tail is needed
+            keys = sorted(time_series)[-days:]
+            
+            # Convert to DataFrame via pre-sized columnar buffers
+            n = len(keys)
+            opens = np.empty(n, dtype=np.float64)
+            highs = np.empty(n, dtype=np.float64)
+            lows = np.empty(n, dtype=np.float64)
+            closes = np.empty(n, dtype=np.float64)
+            volumes = np.empty(n, dtype=np.int64)
+            for i, date in enumerate(keys):
+                values = time_series[date]
+                opens[i] = float(values['1. open'])
+                highs[i] = float(values['2. high'])
+                lows[i] = float(values['3. low'])
+                closes[i] = float(values['4. close'])
+                volumes[i] = int(values['5. volume'])
+            
+            df = pd.DataFrame({
+                'date': np.array(keys, dtype='datetime64[D]').astype('datetime64[ns]'),
+                'open': opens,
+                'high': highs,
+                'low': lows,
+                'close': closes,
+                'volume': volumes,
+                'dividends': 0.0,
+                'stock_splits': 0.0  # No split, as in the yfinance and chart API frames
+            })
             
             self.logger.debug(f"Successfully fetched {len(df)} rows for {ticker}")
             return df
@@ -266,7 +979,121 @@ class OHLCVFetcher:
             self.logger.error(f"Error fetching {ticker} from Alpha Vantage: {e}")
             return None
 
+    def get_ohlcv_cache_path(self, ticker: str) -> Path:
+        """Path of the on-disk API response cache for a ticker."""
+        cache_dir = Path(self.config.get("base_data_path", "data/")) / self.config.get("ohlcv_cache_path", "cache/ohlcv")
+        return cache_dir / f"{ticker}.parquet"
+
+    def _save_ohlcv_cache(self, cache_path: Path, df: pd.DataFrame) -> None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".parquet.tmp")
+            df.to_parquet(tmp_path, index=False, **self._parquet_options)
+            tmp_path.replace(cache_path)
+        except Exception as e:
+            self.logger.warning(f"Could not update OHLCV cache {cache_path}: {e}")
+
     def fetch_ohlcv_data(self, ticker: str, days: int) -> Optional[pd.DataFrame]:
+        """
+        Fetch OHLCV data, reusing cached API responses where possible.
+        
+        Rows from previous fetches are kept in a per-ticker parquet cache;
+        only the dates missing from it are requested from the data sources.
+        
+        Args:
+            ticker: Ticker symbol
+            days: Number of days to fetch
+            
+        Returns:
+            DataFrame with OHLCV data, or None if failed
+        """
+        if not self.config.get("ohlcv_cache_enabled", True):
+            return self._fetch_ohlcv_from_sources(ticker, days)
+        
+        cached, requested_start, fetch_days = self._ohlcv_cache_plan(ticker, days)
+        if fetch_days is None:
+            self.logger.debug(f"Using cached OHLCV data for {ticker}")
+            return cached[cached['date'] >= requested_start].reset_index(drop=True)
+        
+        new_data = self._fetch_ohlcv_from_sources(ticker, fetch_days)
+        if new_data is None:
+            return None
+        
+        if new_data['date'].dt.tz is not None:
+            new_data = new_data.copy()
+            new_data['date'] = new_data['date'].dt.tz_localize(None)
+        
+        if cached is not None and not cached.empty:
+            combined = pd.concat([cached, new_data], ignore_index=True)
+            combined = combined.drop_duplicates(subset=['date'], keep='last')
+            combined = combined.sort_values('date').reset_index(drop=True)
+        else:
+            combined = new_data
+        self._save_ohlcv_cache(self.get_ohlcv_cache_path(ticker), combined)
+        
+        return combined[combined['date'] >= requested_start].reset_index(drop=True)
+
+    def _ohlcv_cache_plan(self, ticker: str, days: int) -> Tuple[Optional[pd.DataFrame], pd.Timestamp, Optional[int]]:
+        """
+        Work out how much of a days-long window the OHLCV cache covers.
+        
+        Returns the cached rows (from the cache or the previous partition),
+        the window's start, and the days to fetch from the data sources, which
+        is None when the cache is recent enough to serve the window.
+        """
+        cached = _read_ohlcv_cache(self.get_ohlcv_cache_path(ticker))
+        if cached is None:
+            cached = self._previous_partition_frame(ticker)
+        requested_start = pd.Timestamp(datetime.now().date() - timedelta(days=days))
+        
+        fetch_days = days
+        # A few days of slack: the first trading day can fall after the
+        # calendar start of the requested window
+        covered_start = requested_start + pd.Timedelta(days=5)
+        if cached is not None and not cached.empty and cached['date'].min() <= covered_start:
+            days_since_update = (pd.Timestamp(datetime.now()) - cached['date'].max()).days
+            if days_since_update <= 1:
+                return cached, requested_start, None
+            fetch_days = min(days, days_since_update + 5)  # Add buffer
+        return cached, requested_start, fetch_days
+
+    def _set_previous_partition(self, data_path: Path) -> None:
+        """Remember the newest raw partition older than data_path (dt= names sort by date)."""
+        self._previous_partition_data = None
+        self._previous_partition_path = None
+        base_path = data_path.parent
+        if base_path.exists():
+            self._previous_partition_path = max(
+                (d for d in base_path.iterdir()
+                 if d.name.startswith('dt=') and d.name < data_path.name and raw_partition_has_data(d)),
+                key=lambda d: d.name,
+                default=None
+            )
+
+    def _previous_partition_frame(self, ticker: str) -> Optional[pd.DataFrame]:
+        """
+        Return the ticker's rows from the previous raw partition, if any.
+        
+        Lets tickers without an OHLCV cache entry fetch only the dates after
+        the previous run instead of the full window.
+        """
+        if self._previous_partition_path is None:
+            return None
+        if self._previous_partition_data is None:
+            try:
+                self._previous_partition_data = load_raw_partition(self._previous_partition_path)
+            except Exception as e:
+                self.logger.warning(f"Could not read previous partition {self._previous_partition_path}: {e}")
+                self._previous_partition_data = {}
+        df = self._previous_partition_data.get(ticker)
+        if df is None or df.empty or 'date' not in df.columns:
+            return None
+        df = df.assign(date=pd.to_datetime(df['date']))
+        if df['date'].dt.tz is not None:
+            df['date'] = df['date'].dt.tz_localize(None)
+        return df
+
+    def _fetch_ohlcv_from_sources(self, ticker: str, days: int) -> Optional[pd.DataFrame]:
         """
         Fetch OHLCV data from available sources.
         
@@ -343,9 +1170,18 @@ class OHLCVFetcher:
         Returns:
             Latest date, or None if no data found
         """
-        historical_df = self.load_historical_data(ticker)
-        if historical_df is not None and not historical_df.empty:
-            return historical_df['date'].max()
+        # History is partitioned by year, so the newest non-empty year
+        # partition holds the latest date; only its date column is read
+        ticker_dir = self.get_historical_data_path(ticker)
+        year_files = sorted(ticker_dir.glob("year=*/data.parquet"), key=lambda path: int(path.parent.name[5:]))
+        for data_file in reversed(year_files):
+            try:
+                dates = pd.read_parquet(data_file, columns=['date'])['date']
+            except Exception as e:
+                self.logger.error(f"Error loading historical data for {ticker}: {e}")
+                return None
+            if not dates.empty:
+                return pd.to_datetime(dates).max()
         return None
 
     def check_historical_completeness(self, ticker: str) -> Tuple[bool, int]:
@@ -369,7 +1205,17 @@ class OHLCVFetcher:
         
         return days_missing == 0, days_missing
 
-    def fetch_incremental_data(self, ticker: str, days_back: int = 30) -> Optional[pd.DataFrame]:
+    @staticmethod
+    def _incremental_fetch_days(latest_date: datetime, now: Optional[datetime] = None) -> Optional[int]:
+        """Days to fetch to extend history ending at latest_date, or None if it is up to date."""
+        if latest_date.tzinfo is not None:
+            latest_date = latest_date.replace(tzinfo=None)
+        days_since_update = ((now or datetime.now()) - latest_date).days
+        if days_since_update <= 1:
+            return None
+        return days_since_update + 5  # Add buffer
+
+    def fetch_incremental_data(self, ticker: str, days_back: int = PARTITION_WINDOW_DAYS) -> Optional[pd.DataFrame]:
         """
         Fetch incremental data for a ticker (only new data since last update).
         
@@ -393,15 +1239,14 @@ class OHLCVFetcher:
         if latest_date.tzinfo is not None:
             latest_date = latest_date.replace(tzinfo=None)
         
-        days_since_update = (now - latest_date).days
-        
-        if days_since_update <= 1:
+        fetch_days = self._incremental_fetch_days(latest_date, now)
+        if fetch_days is None:
             self.logger.debug(f"{ticker} data is up to date (last update: {latest_date})")
             return None
         
         # Fetch data since last update
         self.logger.info(f"Fetching incremental data for {ticker} (last update: {latest_date})")
-        new_data = self.fetch_ohlcv_data(ticker, days_since_update + 5)  # Add buffer
+        new_data = self.fetch_ohlcv_data(ticker, fetch_days)
         
         if new_data is not None:
             # Filter to only new data
@@ -455,6 +1300,22 @@ class OHLCVFetcher:
         self.logger.info(f"Merged data for {ticker}: {len(historical_df)} historical + {len(new_data)} new = {len(combined_df)} total")
         return combined_df
 
+    @staticmethod
+    def _downcast_for_storage(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return a copy of df with compact numeric dtypes for parquet storage.
+        
+        Prices and corporate-action columns fit comfortably in float32; volume
+        is stored as int64 when it has no missing values.
+        """
+        df = df.copy()
+        float_columns = [col for col in ('open', 'high', 'low', 'close', 'dividends', 'stock_splits') if col in df.columns]
+        if float_columns:
+            df[float_columns] = df[float_columns].astype(np.float32)
+        if 'volume' in df.columns and not df['volume'].isna().any():
+            df['volume'] = df['volume'].astype(np.int64)
+        return df
+
     def save_historical_data(self, ticker: str, df: pd.DataFrame) -> bool:
         """
         Save historical data for a ticker to partitioned storage.
@@ -469,17 +1330,26 @@ class OHLCVFetcher:
         try:
             historical_path = Path(self.config.get("historical_data_path", "data/raw/historical"))
             ticker_dir = historical_path / f"ticker={ticker}"
+            df = self._downcast_for_storage(df).sort_values('date')
+            years = df['date'].dt.year.to_numpy()
             
-            # Group by year and save each year to its own partition
-            df['year'] = df['date'].dt.year
-            
-            for year, year_data in df.groupby('year'):
-                year_dir = ticker_dir / f"year={year}"
+            # Create every year partition directory up front in one sorted pass
+            year_dirs = {year: ticker_dir / f"year={year}" for year in np.unique(years).tolist()}
+            for year_dir in year_dirs.values():
                 year_dir.mkdir(parents=True, exist_ok=True)
+            
+            if PYARROW_AVAILABLE:
+                # Convert to Arrow once and write zero-copy per-year slices
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                boundaries = [0, *(np.flatnonzero(np.diff(years)) + 1).tolist(), len(years)]
                 
-                data_file = year_dir / "data.parquet"
-                year_data = year_data.drop(columns=['year'])
-                year_data.to_parquet(data_file, index=False)
+                for start, end in zip(boundaries[:-1], boundaries[1:]):
+                    pq.write_table(table.slice(start, end - start), year_dirs[years[start].item()] / "data.parquet",
+                                   use_dictionary=True, write_statistics=True, **self._parquet_options)
+            else:
+                # Group by year and save each year to its own partition
+                for year, year_data in df.groupby(years):
+                    year_data.to_parquet(year_dirs[year] / "data.parquet", index=False, **self._parquet_options)
             
             self.logger.debug(f"Saved historical data for {ticker} ({len(df)} rows)")
             return True
@@ -490,7 +1360,7 @@ class OHLCVFetcher:
 
     def save_ticker_data(self, ticker: str, data: pd.DataFrame, data_path: Path, dry_run: bool = False) -> bool:
         """
-        Save ticker data to CSV file.
+        Save ticker data to a compressed parquet file (zstd by default).
         
         Args:
             ticker: Ticker symbol
@@ -501,20 +1371,155 @@ class OHLCVFetcher:
         Returns:
             True if saved successfully, False otherwise
         """
-        csv_path = data_path / f"{ticker}.csv"
+        parquet_path = data_path / f"{ticker}.parquet"
         
         if dry_run:
-            self.logger.info(f"[DRY RUN] Would save {len(data)} rows for {ticker} to {csv_path}")
+            self.logger.info(f"[DRY RUN] Would save {len(data)} rows for {ticker} to {parquet_path}")
             return True
         
         try:
-            data.to_csv(csv_path, index=False)
-            self.logger.info(f"Saved {len(data)} rows for {ticker} to {csv_path}")
+            self._downcast_for_storage(data).to_parquet(parquet_path, index=False, **self._parquet_options)
+            self.logger.info(f"Saved {len(data)} rows for {ticker} to {parquet_path}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to save data for {ticker}: {e}")
             return False
 
+    def _partition_frame(self, data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Combine ticker frames into one storage frame with a categorical symbol column."""
+        frames = []
+        for ticker, df in data.items():
+            df = df.assign(symbol=ticker)
+            dates = pd.to_datetime(df['date'])
+            if dates.dt.tz is not None:
+                dates = dates.dt.tz_localize(None)
+            frames.append(df.assign(date=dates))
+        
+        combined = pd.concat(frames, ignore_index=True)
+        combined['symbol'] = combined['symbol'].astype('category')
+        return self._downcast_for_storage(combined)
+
+    def write_partition_batch(self, writer: PartitionWriter, data: Dict[str, pd.DataFrame]) -> bool:
+        """
+        Append one batch of tickers' data to an open partition writer.
+        
+        Args:
+            writer: Writer for the partition file
+            data: Dictionary of ticker -> DataFrame with OHLCV data
+            
+        Returns:
+            True if written successfully, False otherwise
+        """
+        try:
+            writer.write(self._partition_frame(data))
+            self.logger.info("Wrote %d rows for %d tickers to %s", sum(len(df) for df in data.values()), len(data), writer.path)
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to write batch to {writer.path}: {e}")
+            return False
+
+    @staticmethod
+    def _error_entry(ticker: str, message: str, timestamp: Optional[str] = None) -> Dict:
+        """Build an error log entry for a failed ticker, stamped now unless timestamp is given."""
+        return {
+            "ticker": ticker,
+            "error": message,
+            "timestamp": timestamp or datetime.now().isoformat()
+        }
+
+    @classmethod
+    def _record_partition_save(cls, saved: bool, data: Dict[str, pd.DataFrame], successful_tickers: List[str],
+                               failed_tickers: List[str], errors: List[Dict]) -> int:
+        """Record the outcome of saving a set of tickers; returns the rows saved."""
+        if saved:
+            successful_tickers.extend(data)
+            return sum(len(df) for df in data.values())
+        failed_tickers.extend(data)
+        # The whole batch failed at once, so its entries share one timestamp
+        timestamp = datetime.now().isoformat()
+        errors.extend(cls._error_entry(ticker, "Failed to save data", timestamp) for ticker in data)
+        return 0
+
+    def _collect_partition_write(self, pending: Optional[Tuple[concurrent.futures.Future, Dict[str, pd.DataFrame]]],
+                                 successful_tickers: List[str], failed_tickers: List[str], errors: List[Dict]) -> int:
+        """Wait for a background partition batch write and record its outcome; returns the rows saved."""
+        if pending is None:
+            return 0
+        future, data = pending
+        return self._record_partition_save(future.result(), data, successful_tickers, failed_tickers, errors)
+
+    def _collect_history_saves(self, pending: Dict[concurrent.futures.Future, str], failed_history: List[str],
+                               errors: List[Dict], limit: int = 0) -> None:
+        """Wait until at most limit background historical saves are in flight, recording failed ones."""
+        while len(pending) > limit:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                ticker = pending.pop(future)
+                try:
+                    saved = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error saving historical data for {ticker}: {e}")
+                    saved = False
+                if not saved:
+                    failed_history.append(ticker)
+                    errors.append(self._error_entry(ticker, "Failed to save historical data"))
+
+    def _ticker_output_data(self, ticker: str, incremental_mode: bool) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+        """
+        Return the rows to store in today's partition for a ticker (or None),
+        and the updated history to save for it (or None).
+        
+        In incremental mode only new data is fetched and merged into the
+        ticker's history; otherwise the full window is fetched.
+        """
+        if not incremental_mode:
+            return self.fetch_ohlcv_data(ticker, PARTITION_WINDOW_DAYS), None
+        
+        new_data = self.fetch_incremental_data(ticker)
+        if new_data is None:
+            # No new data needed, use recent historical data
+            historical_data = self.load_historical_data(ticker)
+            if historical_data is None:
+                self.logger.warning(f"No data available for {ticker}")
+                return None, None
+            return historical_data.tail(30), None
+        
+        combined_data = self.merge_with_historical(ticker, new_data)
+        if combined_data is None:
+            return new_data, None
+        # Use only recent data for output
+        return combined_data.tail(30), combined_data
+
+    def save_partition_data(self, data: Dict[str, pd.DataFrame], data_path: Path, dry_run: bool = False) -> bool:
+        """
+        Save all tickers' data to a single parquet file for the partition.
+        
+        Rows are tagged with a dictionary-encoded ``symbol`` column and
+        written to ohlcv.parquet with the configured compression (zstd by default).
+        
+        Args:
+            data: Dictionary of ticker -> DataFrame with OHLCV data
+            data_path: Partition directory to save to
+            dry_run: If True, don't actually save files
+            
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        partition_file = data_path / RAW_PARTITION_FILE
+        total_rows = sum(len(df) for df in data.values())
+        
+        if dry_run:
+            self.logger.info(f"[DRY RUN] Would save {total_rows} rows for {len(data)} tickers to {partition_file}")
+            return True
+        
+        try:
+            self._partition_frame(data).to_parquet(partition_file, index=False, **self._parquet_options)
+            self.logger.info(f"Saved {total_rows} rows for {len(data)} tickers to {partition_file}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to save partition data to {partition_file}: {e}")
+            return False
+
     def save_errors(self, errors: List[Dict], log_path: Path, dry_run: bool = False) -> str:
         """
         Save error log to JSON file.
@@ -533,8 +1538,7 @@ class OHLCVFetcher:
             self.logger.info(f"[DRY RUN] Would save error log to {errors_path}")
             return str(errors_path)
         
-        with open(errors_path, 'w') as f:
-            json.dump(errors, f, indent=2)
+        errors_path.write_bytes(json_dumps_bytes(errors))
         
         self.logger.info(f"Saved error log to {errors_path}")
         return str(errors_path)
@@ -552,11 +1556,9 @@ class OHLCVFetcher:
         """
         data_path, _ = create_partition_paths(date_str, self.config, "raw", test_mode)
         
-        if data_path.exists():
-            # Check if there are any CSV files in the partition
-            csv_files = list(data_path.glob("*.csv"))
-            return len(csv_files) > 0
-        return False
+        # One stat instead of listing the partition; only runs that saved
+        # their data completely leave the marker
+        return (data_path / PARTITION_SUCCESS_MARKER).exists()
 
     def get_historical_data_path(self, ticker: str) -> Path:
         """
@@ -630,6 +1632,30 @@ class OHLCVFetcher:
         
         # Create partition paths
         data_path, log_path = create_partition_paths(date_str, self.config, "raw", test_mode)
+        self._set_previous_partition(data_path)
+        success_marker = data_path / PARTITION_SUCCESS_MARKER
+        
+        # Resume an interrupted run instead of fetching saved tickers again:
+        # batches finished before the interruption are kept as part files,
+        # and a partition file left without a success marker is carried
+        # over and rewritten. --force refetches everything.
+        resumed_data = {}
+        resumed_parts = {}
+        if not force and not dry_run:
+            try:
+                if raw_partition_has_data(data_path):
+                    resumed_data = load_raw_partition(data_path)
+                else:
+                    resumed_parts = load_raw_partition_parts(data_path)
+            except Exception as e:
+                self.logger.warning(f"Could not read existing partition {data_path}, refetching all tickers: {e}")
+            resumed = {**resumed_data, **resumed_parts}
+            if resumed:
+                tickers = [ticker for ticker in tickers if ticker not in resumed]
+                self.logger.info(f"Resuming partition {data_path}: {len(resumed)} tickers already saved, {len(tickers)} remaining")
+        if not dry_run:
+            # A forced re-run is incomplete until it finishes saving
+            success_marker.unlink(missing_ok=True)
         
         # Process tickers with progress tracking
         show_progress = self.config.get("progress", True)
@@ -640,69 +1666,102 @@ class OHLCVFetcher:
             disable=not show_progress
         ) as progress:
             
-            successful_tickers = []
+            # Tickers in finished part files are already saved
+            successful_tickers = list(resumed_parts)
             failed_tickers = []
             errors = []
-            total_rows = 0
+            total_rows = sum(len(df) for df in resumed_parts.values())
+            # Tickers carried over from a partition file are rewritten with
+            # the first batch
+            partition_data = dict(resumed_data)
+            batch_size = max(1, int(self.config.get("batch_size", 10)))
+            incremental_mode = self.config.get("incremental_mode", True)
+            # Each finished batch is saved durably as a part file; dry runs
+            # only report what would be written at the end
+            partition_writer = None
+            if not dry_run:
+                partition_writer = PartitionWriter(data_path / RAW_PARTITION_FILE, self._parquet_options,
+                                                   resume=bool(resumed_parts))
+            # Parquet writes run on a small I/O pool so fetching continues
+            # while earlier results are serialized; one partition batch is in
+            # flight at a time to keep the writer's row groups in order
+            io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="parquet")
+            pending_write = None
+            # Incremental history saves share the pool, a few at a time
+            pending_history: Dict[concurrent.futures.Future, str] = {}
+            failed_history: List[str] = []
             
-            for ticker in tickers:
-                try:
-                    # Fetch data based on mode
-                    if self.config.get("incremental_mode", True):
-                        # Incremental mode: fetch only new data
-                        new_data = self.fetch_incremental_data(ticker)
-                        if new_data is not None:
-                            # Merge with historical data
-                            combined_data = self.merge_with_historical(ticker, new_data)
-                            if combined_data is not None:
-                                # Save historical data
-                                self.save_historical_data(ticker, combined_data)
-                                # Use only recent data for output
-                                output_data = combined_data.tail(30)
-                            else:
-                                output_data = new_data
-                        else:
-                            # No new data needed, use recent historical data
-                            historical_data = self.load_historical_data(ticker)
-                            if historical_data is not None:
-                                output_data = historical_data.tail(30)
-                            else:
-                                self.logger.warning(f"No data available for {ticker}")
-                                failed_tickers.append(ticker)
-                                progress.update(1, postfix={"current": ticker})
-                                continue
-                    else:
-                        # Full mode: fetch all data
-                        output_data = self.fetch_ohlcv_data(ticker, 30)
-                        if output_data is None:
-                            failed_tickers.append(ticker)
-                            progress.update(1, postfix={"current": ticker})
-                            continue
+            # With aiohttp, chart API requests for all tickers stream in the
+            # background (no per-batch barrier) and tickers are processed as
+            # their responses arrive; otherwise each batch is downloaded with
+            # one yfinance request
+            stream_chart = AIOHTTP_AVAILABLE and self.config.get("async_fetch_enabled", True)
+            ticker_order = tickers
+            if stream_chart:
+                self._start_chart_stream(self._chart_fetch_plan(tickers, incremental_mode))
+                ticker_order = self._chart_stream_order(tickers)
+            
+            try:
+                for index, ticker in enumerate(ticker_order):
+                    if index % batch_size == 0:
+                        if partition_writer is not None and partition_data:
+                            total_rows += self._collect_partition_write(pending_write, successful_tickers, failed_tickers, errors)
+                            pending_write = (io_pool.submit(self.write_partition_batch, partition_writer, partition_data), partition_data)
+                            partition_data = {}
+                        if not stream_chart:
+                            # Downloaded when the first of the batch's tickers
+                            # needs fetching
+                            self._start_yfinance_batch(tickers[index:index + batch_size])
+                    try:
+                        output_data, history_data = self._ticker_output_data(ticker, incremental_mode)
+                    except Exception as e:
+                        output_data = history_data = None
+                        self.logger.error(f"Error processing {ticker}: {e}")
+                        errors.append(self._error_entry(ticker, str(e)))
                     
-                    # Save ticker data
-                    if self.save_ticker_data(ticker, output_data, data_path, dry_run):
-                        successful_tickers.append(ticker)
-                        total_rows += len(output_data)
-                        self.logger.info(f"Processed {ticker}: {len(output_data)} rows")
-                    else:
+                    if history_data is not None:
+                        self._collect_history_saves(pending_history, failed_history, errors,
+                                                    limit=MAX_PENDING_HISTORY_SAVES - 1)
+                        pending_history[io_pool.submit(self.save_historical_data, ticker, history_data)] = ticker
+                
+                    if output_data is None:
                         failed_tickers.append(ticker)
-                        errors.append({
-                            "ticker": ticker,
-                            "error": "Failed to save data",
-                            "timestamp": datetime.now().isoformat()
-                        })
-                        
+                    else:
+                        # Buffer ticker data until its batch is written
+                        partition_data[ticker] = output_data
+                        self.logger.debug("Processed %s: %d rows", ticker, len(output_data))
+                    progress.update(1, postfix={"current": ticker})
+            finally:
+                # Also on an interruption: a batch already handed to the
+                # I/O pool still lands as a part file for the next run
+                self._start_yfinance_batch([])
+                self.close_chart_session()
+                io_pool.shutdown(wait=True)
+            
+            self._collect_history_saves(pending_history, failed_history, errors)
+            if failed_history:
+                self.logger.warning(f"Failed to save historical data for {len(failed_history)} tickers: {failed_history}")
+            
+            if partition_writer is not None:
+                total_rows += self._collect_partition_write(pending_write, successful_tickers, failed_tickers, errors)
+                if partition_data:
+                    saved = self.write_partition_batch(partition_writer, partition_data)
+                    total_rows += self._record_partition_save(saved, partition_data, successful_tickers, failed_tickers, errors)
+                try:
+                    if partition_writer.close():
+                        self.logger.info(f"Saved {total_rows} rows for {len(successful_tickers)} tickers to {partition_writer.path}")
                 except Exception as e:
-                    failed_tickers.append(ticker)
-                    error_msg = f"Error processing {ticker}: {e}"
-                    self.logger.error(error_msg)
-                    errors.append({
-                        "ticker": ticker,
-                        "error": str(e),
-                        "timestamp": datetime.now().isoformat()
-                    })
-                
-                progress.update(1, postfix={"current": ticker})
+                    self.logger.error(f"Failed to finish partition file {partition_writer.path}: {e}")
+                    partition_writer.abort()
+                    failed_tickers.extend(successful_tickers)
+                    timestamp = datetime.now().isoformat()
+                    errors.extend(self._error_entry(ticker, "Failed to save data", timestamp) for ticker in successful_tickers)
+                    successful_tickers = []
+                    total_rows = 0
+            elif partition_data:
+                # Save all tickers' data as one partition file
+                saved = self.save_partition_data(partition_data, data_path, dry_run)
+                total_rows += self._record_partition_save(saved, partition_data, successful_tickers, failed_tickers, errors)
             
             # Save error log if there are errors
             if errors:
@@ -711,15 +1770,26 @@ class OHLCVFetcher:
             # Calculate runtime
             runtime = time.time() - start_time
             
-            # Prepare metadata
+            # Concurrency stats of the streamed chart requests, if any ran
+            limiter = self._chart_limiter
+            concurrency_stats = {} if limiter is None else {
+                "concurrency_initial": limiter.initial,
+                "concurrency_final": limiter.limit,
+                "concurrency_resizes": limiter.resizes
+            }
+            
+            # Prepare metadata; tickers whose history failed to save are still
+            # in today's partition but are refetched by the next run
+            complete = not failed_tickers and not failed_history
+            now = datetime.now()
             metadata = {
-                "run_date": datetime.now().strftime('%Y-%m-%d'),
-                "processing_date": datetime.now().isoformat(),
-                "tickers_processed": len(tickers),
+                "run_date": now.strftime('%Y-%m-%d'),
+                "processing_date": now.isoformat(),
+                "tickers_processed": len(tickers) + len(resumed_data) + len(resumed_parts),
                 "tickers_successful": len(successful_tickers),
                 "tickers_failed": len(failed_tickers),
                 "total_rows": total_rows,
-                "status": "success" if len(failed_tickers) == 0 else "partial_success",
+                "status": "success" if complete else "partial_success",
                 "runtime_seconds": runtime,
                 "runtime_minutes": runtime / 60,
                 "error_message": None if len(failed_tickers) == 0 else f"Failed to process {len(failed_tickers)} tickers",
@@ -728,14 +1798,19 @@ class OHLCVFetcher:
                 "test_mode": test_mode,
                 "dry_run": dry_run,
                 "force": force,
-                "incremental_mode": self.config.get("incremental_mode", True),
+                "incremental_mode": incremental_mode,
                 "failed_tickers": failed_tickers,
-                "successful_tickers": successful_tickers
+                "successful_tickers": successful_tickers,
+                "failed_history_tickers": failed_history,
+                **concurrency_stats
             }
             
             # Save metadata
             save_metadata_to_file(metadata, log_path, dry_run)
             
+            if not dry_run and successful_tickers:
+                success_marker.touch()
+            
             # Log summary
             self.logger.info(f"OHLCV fetching completed in {runtime:.2f} seconds")
             self.logger.info(f"Processed {len(successful_tickers)} tickers, {total_rows} total rows")
@@ -782,27 +1857,28 @@ def main():
         fetcher.config['test_mode'] = True
         print("[TEST MODE] Processing limited tickers for testing.")
     
-    try:
-        result = fetcher.run(
-            force=args.force,
-            test=args.test,
-            dry_run=args.dry_run,
-            full_test=args.full_test
-        )
+    with queued_logging():
+        try:
+            result = fetcher.run(
+                force=args.force,
+                test=args.test,
+                dry_run=args.dry_run,
+                full_test=args.full_test
+            )
         
-        if result["status"] == "success":
-            print("OHLCV fetching completed successfully!")
-            sys.exit(0)
-        elif result["status"] == "skipped":
-            print("OHLCV fetching skipped (partition already exists)")
-            sys.exit(0)
-        else:
-            print("OHLCV fetching failed!")
-            sys.exit(1)
+            if result["status"] == "success":
+                print("OHLCV fetching completed successfully!")
+                sys.exit(0)
+            elif result["status"] == "skipped":
+                print("OHLCV fetching skipped (partition already exists)")
+                sys.exit(0)
+            else:
+                print("OHLCV fetching failed!")
+                sys.exit(1)
             
-    except Exception as e:
-        print(f"OHLCV fetching failed with error: {e}")
-        sys.exit(1)
+        except Exception as e:
+            print(f"OHLCV fetching failed with error: {e}")
+            sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -18,27 +18,39 @@ Features:
 """
 
 import argparse
-import json
+import csv
+import io
 import logging
+import re
 import sys
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import AbstractSet, Any, Dict, FrozenSet, List, Optional, Tuple
 
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 # Import from utils directory
-from utils.common import create_partition_paths, save_metadata_to_file, cleanup_old_partitions, handle_rate_limit, load_config, DataManager, create_storage_backend
+from utils.common import create_partition_paths, save_metadata_to_file, cleanup_old_partitions, handle_rate_limit, load_config, DataManager, create_storage_backend, create_http_session, json_dumps_bytes, json_loads
+from utils.logger import queued_logging
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+SP500_WIKIPEDIA_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+WIKIPEDIA_REQUEST_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; project-three pipeline)"}
+# ETag/Last-Modified of the last fetched page plus its parsed tickers, kept
+# in the ticker log directory for conditional requests
+WIKIPEDIA_CACHE_FILE = "wikipedia_cache.json"
+# Matches class="wikitable" as well as multi-class values like "wikitable sortable"
+WIKITABLE_CLASS = re.compile(r"(?:^|\s)wikitable(?:\s|$)")
+
 class TickerFetcher:
     def __init__(self, config_path: str = "config/settings.yaml", storage_provider: str = "local", storage_config_path: str = None):
         self.config = load_config(config_path, "tickers")
         self.logger = logging.getLogger(__name__)
+        self._http_session = None
         
         # Initialize storage backend and DataManager
         self.storage_provider = storage_provider
@@ -94,6 +106,29 @@ class TickerFetcher:
                 self.mode = 'prod'
         self.logger.info(f"[PIPELINE MODE] Running in {self.mode.upper()} mode.")
 
+    @property
+    def http_session(self):
+        """
+        Keep-alive HTTP session, created on first use, for Wikipedia requests.
+        
+        urllib3 retries are disabled: run() retries with its own rate-limit
+        backoff, and each attempt reuses the pooled connection.
+        """
+        if self._http_session is None:
+            self._http_session = create_http_session(
+                retries=0,
+                pool_connections=4,
+                pool_maxsize=8,
+                headers=WIKIPEDIA_REQUEST_HEADERS
+            )
+        return self._http_session
+
+    def close(self) -> None:
+        """Close the HTTP session and its pooled connections."""
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
+
     def fetch_sp500_tickers(self) -> Tuple[List[str], List[str]]:
         """
         Fetch S&P 500 ticker symbols and company names from Wikipedia.
@@ -101,34 +136,30 @@ class TickerFetcher:
         Returns:
             Tuple of (tickers, company_names) lists
         """
-        url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+        url = SP500_WIKIPEDIA_URL
         
         try:
             self.logger.info(f"Fetching S&P 500 tickers from {url}")
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Revalidate the previously parsed page instead of downloading it
+            cache = self._load_page_cache(url)
+            headers = {}
+            if cache is not None:
+                if cache.get("etag"):
+                    headers["If-None-Match"] = cache["etag"]
+                if cache.get("last_modified"):
+                    headers["If-Modified-Since"] = cache["last_modified"]
+            response = self.http_session.get(url, headers=headers, timeout=(5, 30))
             
-            # Find the main table with ticker data
-            table = soup.find('table', {'class': 'wikitable'})
-            if not table:
-                raise ValueError("Could not find ticker table on Wikipedia page")
-            
-            tickers = []
-            company_names = []
+            if cache is not None and response.status_code == 304:
+                self.logger.info(f"Page not modified, reusing {len(cache['tickers'])} cached tickers")
+                return cache["tickers"], cache["company_names"]
+            response.raise_for_status()
             
-            # Extract data from table rows
-            rows = table.find_all('tr')[1:]  # Skip header row
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) >= 2:
-                    ticker = cells[0].get_text(strip=True)
-                    company_name = cells[1].get_text(strip=True)
-                    
-                    if ticker and company_name:
-                        tickers.append(ticker)
-                        company_names.append(company_name)
+            parsed = self._read_constituents_table(response.content)
+            if parsed is None:
+                parsed = self._parse_first_wikitable(response.content)
+            tickers, company_names = parsed
+            self._save_page_cache(url, response, tickers, company_names)
             
             self.logger.info(f"Successfully fetched {len(tickers)} tickers")
             return tickers, company_names
@@ -140,6 +171,97 @@ class TickerFetcher:
             self.logger.error(f"Error parsing ticker data: {e}")
             raise
 
+    def _page_cache_path(self) -> Path:
+        """Path of the conditional-request cache for the Wikipedia page."""
+        return Path(self.config.get("base_log_path", "logs/")) / self.config.get("ticker_log_path", "tickers") / WIKIPEDIA_CACHE_FILE
+
+    def _load_page_cache(self, url: str) -> Optional[Dict[str, Any]]:
+        """Load the cached validators and tickers for url, or None if unusable."""
+        try:
+            cache = json_loads(self._page_cache_path().read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cache, dict) or cache.get("url") != url or not cache.get("tickers"):
+            return None
+        if len(cache["tickers"]) != len(cache.get("company_names", [])):
+            return None
+        return cache
+
+    def _save_page_cache(self, url: str, response, tickers: List[str], company_names: List[str]) -> None:
+        """Store the response's ETag/Last-Modified with the tickers parsed from it."""
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        }
+        validators = {key: value for key, value in validators.items() if isinstance(value, str)}
+        if not validators:
+            return
+        
+        cache = {
+            "url": url,
+            **validators,
+            "cached_at": datetime.now().isoformat(),
+            "tickers": tickers,
+            "company_names": company_names
+        }
+        cache_path = self._page_cache_path()
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(json_dumps_bytes(cache))
+        except OSError as e:
+            self.logger.warning(f"Could not save page cache {cache_path}: {e}")
+
+    @staticmethod
+    def _read_constituents_table(content: bytes) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Read the Symbol/Security columns of the page's constituents table.
+        
+        The table is parsed in one pass by lxml (pandas.read_html) rather than
+        cell by cell. Returns None if the page has no such table.
+        """
+        try:
+            table = pd.read_html(io.BytesIO(content), attrs={"id": "constituents"},
+                                 flavor="lxml", keep_default_na=False)[0]
+        except ValueError:
+            return None
+        if not {"Symbol", "Security"}.issubset(table.columns):
+            return None
+        
+        symbols = table["Symbol"].astype(str).str.strip()
+        names = table["Security"].astype(str).str.strip()
+        keep = (symbols != "") & (names != "")
+        return symbols[keep].tolist(), names[keep].tolist()
+
+    @staticmethod
+    def _parse_first_wikitable(content: bytes) -> Tuple[List[str], List[str]]:
+        """Extract tickers and company names from the first wikitable on the page."""
+        # Only wikitable subtrees are built, with the C-backed lxml parser;
+        # the rest of the page is skipped
+        strainer = SoupStrainer('table', {'class': WIKITABLE_CLASS})
+        soup = BeautifulSoup(content, 'lxml', parse_only=strainer)
+        
+        # Find the main table with ticker data
+        table = soup.find('table')
+        if not table:
+            raise ValueError("Could not find ticker table on Wikipedia page")
+        
+        tickers = []
+        company_names = []
+        
+        # Extract data from table rows
+        rows = table.find_all('tr')[1:]  # Skip header row
+        for row in rows:
+            cells = row.find_all('td')
+            if len(cells) >= 2:
+                ticker = cells[0].get_text(strip=True)
+                company_name = cells[1].get_text(strip=True)
+                
+                if ticker and company_name:
+                    tickers.append(ticker)
+                    company_names.append(company_name)
+        
+        return tickers, company_names
+
     def clean_ticker_symbols(self, tickers: List[str]) -> List[str]:
         """
         Clean and validate ticker symbols.
@@ -150,16 +272,19 @@ class TickerFetcher:
         Returns:
             List of cleaned ticker symbols
         """
+        # A plain loop over the C-implemented str methods is several times
+        # faster than pandas' .str accessors for a list of ~500 symbols
         cleaned = []
+        seen = set()
         for ticker in tickers:
             # Remove any whitespace and convert to uppercase
-            cleaned_ticker = ticker.strip().upper()
+            symbol = ticker.strip().upper() if isinstance(ticker, str) else ""
             
-            # Basic validation - ticker should be 1-5 characters, alphanumeric
-            if (1 <= len(cleaned_ticker) <= 5 and 
-                cleaned_ticker.isalnum() and 
-                cleaned_ticker not in cleaned):
-                cleaned.append(cleaned_ticker)
+            # Basic validation - ticker should be 1-5 characters, alphanumeric,
+            # and not a repeat of an earlier symbol
+            if 1 <= len(symbol) <= 5 and symbol.isalnum() and symbol not in seen:
+                seen.add(symbol)
+                cleaned.append(symbol)
             else:
                 self.logger.warning(f"Invalid ticker symbol: {ticker}")
         
@@ -253,7 +378,7 @@ class TickerFetcher:
                 self.logger.info(f"Partition does not exist: {csv_path}")
                 return False
     
-    def get_previous_ticker_set(self, test_mode: bool = False) -> Set[str]:
+    def get_previous_ticker_set(self, test_mode: bool = False) -> FrozenSet[str]:
         """
         Get the set of tickers from the previous day's partition.
         
@@ -261,7 +386,7 @@ class TickerFetcher:
             test_mode: If True, look in test directories
             
         Returns:
-            Set of ticker symbols from previous day
+            Frozen set of ticker symbols from previous day
         """
         yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
         
@@ -272,16 +397,16 @@ class TickerFetcher:
             
             if self.data_manager.storage.exists(csv_path):
                 try:
-                    df = self.data_manager.load_dataframe(csv_path, format='csv')
-                    tickers = set(df['symbol'].tolist())
+                    df = self.data_manager.load_dataframe(csv_path, format='csv', columns=['symbol'])
+                    tickers = frozenset(df['symbol'])
                     self.logger.info(f"Found {len(tickers)} tickers from previous day")
                     return tickers
                 except Exception as e:
                     self.logger.warning(f"Could not read previous tickers: {e}")
-                    return set()
+                    return frozenset()
             else:
                 self.logger.info("No previous ticker file found")
-                return set()
+                return frozenset()
         else:
             # Fall back to original method
             data_path, _ = create_partition_paths(yesterday, self.config, "tickers", test_mode)
@@ -289,18 +414,23 @@ class TickerFetcher:
             
             if csv_path.exists():
                 try:
-                    df = pd.read_csv(csv_path)
-                    tickers = set(df['symbol'].tolist())
+                    # Only the symbol column is needed, so the csv module reads it
+                    # without pandas' parsing overhead (and keeps a ticker such
+                    # as "NA" as text)
+                    with open(csv_path, newline='') as f:
+                        reader = csv.reader(f)
+                        symbol_index = next(reader).index('symbol')
+                        tickers = frozenset(row[symbol_index] for row in reader if row)
                     self.logger.info(f"Found {len(tickers)} tickers from previous day")
                     return tickers
                 except Exception as e:
                     self.logger.warning(f"Could not read previous tickers: {e}")
-                    return set()
+                    return frozenset()
             else:
                 self.logger.info("No previous ticker file found")
-                return set()
+                return frozenset()
     
-    def calculate_ticker_changes(self, current_tickers: List[str], previous_tickers: Set[str]) -> Tuple[List[str], List[str]]:
+    def calculate_ticker_changes(self, current_tickers: List[str], previous_tickers: AbstractSet[str]) -> Tuple[List[str], List[str]]:
         """
         Calculate which tickers were added or removed.
         
@@ -351,8 +481,7 @@ class TickerFetcher:
             self.logger.info(f"[DRY RUN] Would save diff log to {diff_path}")
             return str(diff_path)
         
-        with open(diff_path, 'w') as f:
-            json.dump(diff_data, f, indent=2)
+        diff_path.write_bytes(json_dumps_bytes(diff_data))
         
         self.logger.info(f"Saved ticker diff to {diff_path}")
         return str(diff_path)
@@ -436,7 +565,8 @@ class TickerFetcher:
         cleaned_company_names = [ticker_to_company[ticker] for ticker in cleaned_tickers]
         
         # Validate ticker count
-        if not self.validate_ticker_count(len(cleaned_tickers)):
+        validation_passed = self.validate_ticker_count(len(cleaned_tickers))
+        if not validation_passed:
             self.logger.warning("Ticker count validation failed, but continuing")
         
         # Get previous tickers for comparison
@@ -460,7 +590,7 @@ class TickerFetcher:
             "tickers_added": len(added_tickers),
             "tickers_removed": len(removed_tickers),
             "net_change": len(added_tickers) - len(removed_tickers),
-            "validation_passed": self.validate_ticker_count(len(cleaned_tickers)),
+            "validation_passed": validation_passed,
             "status": "success",
             "runtime_seconds": runtime,
             "runtime_minutes": runtime / 60,
@@ -509,27 +639,30 @@ def main():
         storage_config_path=args.storage_config
     )
     
-    try:
-        result = fetcher.run(
-            force=args.force,
-            dry_run=args.dry_run,
-            full_test=args.full_test,
-            test=args.test
-        )
-        
-        if result["status"] == "success":
-            print("Ticker fetching completed successfully!")
-            sys.exit(0)
-        elif result["status"] == "skipped":
-            print("Ticker fetching skipped (partition already exists)")
-            sys.exit(0)
-        else:
-            print("Ticker fetching failed!")
-            sys.exit(1)
+    with queued_logging():
+        try:
+            result = fetcher.run(
+                force=args.force,
+                dry_run=args.dry_run,
+                full_test=args.full_test,
+                test=args.test
+            )
+        
+            if result["status"] == "success":
+                print("Ticker fetching completed successfully!")
+                sys.exit(0)
+            elif result["status"] == "skipped":
+                print("Ticker fetching skipped (partition already exists)")
+                sys.exit(0)
+            else:
+                print("Ticker fetching failed!")
+                sys.exit(1)
             
-    except Exception as e:
-        print(f"Ticker fetching failed with error: {e}")
-        sys.exit(1)
+        except Exception as e:
+            print(f"Ticker fetching failed with error: {e}")
+            sys.exit(1)
+        finally:
+            fetcher.close()
 
 
 if __name__ == "__main__":
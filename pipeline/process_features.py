@@ -26,7 +26,6 @@ Features:
 
 import argparse
 import json
-import yaml
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
@@ -37,6 +36,7 @@ import sys
 import os
 
 # Import from utils directory
+from utils.common import json_dumps_bytes, load_raw_partition, load_yaml_file, parquet_write_options
 from utils.progress import get_progress_tracker
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -64,12 +64,10 @@ class FeatureProcessor:
             yaml_path = Path("config/settings.yaml")
             if yaml_path.exists():
                 logging.warning(f"{config_path} not found, using {yaml_path}")
-                with open(yaml_path, "r") as f:
-                    return yaml.safe_load(f)
+                return load_yaml_file(yaml_path)
             raise FileNotFoundError(f"Config file not found at {config_path}")
         if path.suffix == ".yaml":
-            with open(path, "r") as f:
-                return yaml.safe_load(f)
+            return load_yaml_file(path)
         else:
             with open(path, "r") as f:
                 return json.load(f)
@@ -295,26 +293,27 @@ class FeatureProcessor:
         # Create output paths
         processed_path, metadata_path = self.create_output_paths(date_str, test_mode)
         
-        # Get all CSV files in the raw data directory
-        csv_files = list(latest_raw.glob("*.csv"))
-        if not csv_files:
-            logging.error(f"No CSV files found in {latest_raw}")
+        # Load the partition's OHLCV data split by ticker; test mode is
+        # limited to 5 tickers
+        try:
+            raw_data = load_raw_partition(latest_raw, limit=5 if test_mode else None)
+        except Exception as e:
+            logging.error(f"Could not read raw data in {latest_raw}: {e}")
+            return False
+        if not raw_data:
+            logging.error(f"No ticker data found in {latest_raw}")
             return False
         
-        logging.info(f"Found {len(csv_files)} CSV files to process")
-        
-        # Apply test mode limitations
+        logging.info(f"Found {len(raw_data)} tickers to process")
         if test_mode:
-            # Limit to 5 files for test mode
-            csv_files = csv_files[:5]
-            logging.info(f"[TEST MODE] Processing only 5 files: {[f.stem for f in csv_files]}")
+            logging.info(f"[TEST MODE] Processing only 5 tickers: {list(raw_data)}")
         
-        # Process files with progress tracking
+        # Process tickers with progress tracking
         show_progress = self.config.get("progress", True)
         with get_progress_tracker(
-            total=len(csv_files), 
+            total=len(raw_data), 
             desc="Processing features", 
-            unit="file",
+            unit="ticker",
             disable=not show_progress
         ) as progress:
             
@@ -322,12 +321,8 @@ class FeatureProcessor:
             failed_tickers = []
             total_rows_dropped = 0
             
-            for csv_file in csv_files:
-                ticker = csv_file.stem
+            for ticker, df in raw_data.items():
                 try:
-                    # Load data
-                    df = pd.read_csv(csv_file)
-                    
                     # Add features using historical data if available
                     if self.config.get("incremental_mode", True):
                         processed_df, rows_dropped = self.process_ticker_with_historical(ticker, df)
@@ -367,7 +362,7 @@ class FeatureProcessor:
             
             # Save processed data
             output_file = processed_path / "features.parquet"
-            combined_df.to_parquet(output_file, index=False)
+            combined_df.to_parquet(output_file, index=False, **parquet_write_options(self.config))
             
             # Calculate runtime
             runtime = time.time() - start_time
@@ -377,7 +372,7 @@ class FeatureProcessor:
                 "run_date": datetime.now().strftime('%Y-%m-%d'),
                 "processing_date": datetime.now().isoformat(),
                 "raw_data_date": date_str,
-                "files_processed": len(csv_files),
+                "files_processed": len(raw_data),
                 "tickers_processed": len(processed_data),
                 "tickers_successful": len(processed_data),
                 "tickers_failed": len(failed_tickers),
@@ -401,8 +396,7 @@ class FeatureProcessor:
             }
             
             metadata_file = metadata_path / "metadata.json"
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            metadata_file.write_bytes(json_dumps_bytes(metadata))
             
             runtime = time.time() - start_time
             logging.info(f"Feature processing completed in {runtime:.2f} seconds")
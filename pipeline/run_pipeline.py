@@ -22,14 +22,15 @@ import time
 import argparse
 import logging
 import importlib.util
+import os
 import shutil
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta
 
 # Import common utilities
 sys.path.insert(0, str(Path(__file__).parent / "utils"))
-from common import PipelineConfig, DataManager, LogManager
+from common import PipelineConfig, DataManager, LogManager, json_dumps_bytes
 from progress import format_time
 from logger import get_logger, get_structured_logger
 
@@ -119,12 +120,13 @@ def save_integrity_report(report, report_type="daily"):
     report_dir.mkdir(parents=True, exist_ok=True)
     
     report_file = report_dir / f"{today}.json"
-    with open(report_file, 'w') as f:
-        json.dump(report, f, indent=2)
+    report_file.write_bytes(json_dumps_bytes(report))
     
     logging.info(f"Integrity report saved to: {report_file}")
     return report_file
 
+STEP_LOG_DIR = Path('logs/pipeline_steps')
+
 def clean_pipeline_data(test_mode=False):
     """Delete data/processed/* and logs/features/* for a fresh test run."""
     if test_mode:
@@ -138,38 +140,86 @@ def clean_pipeline_data(test_mode=False):
         dirs_to_clean = [
             Path('data/processed'),
             Path('logs/features'),
+            STEP_LOG_DIR,
         ]
     
+    def delete_entry(entry):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+            return f"Deleted directory: {entry.path}"
+        os.unlink(entry.path)
+        return f"Deleted file: {entry.path}"
+    
+    max_workers = min(16, (os.cpu_count() or 1) * 4)
     for d in dirs_to_clean:
         if d.exists():
             logging.info(f"Cleaning directory: {d}")
-            for item in d.iterdir():
-                try:
-                    if item.is_dir():
-                        shutil.rmtree(item)
-                        logging.info(f"Deleted directory: {item}")
-                    else:
-                        item.unlink()
-                        logging.info(f"Deleted file: {item}")
-                except Exception as e:
-                    logging.warning(f"Failed to delete {item}: {e}")
+            with os.scandir(d) as it:
+                entries = list(it)
+            if not entries:
+                continue
+            # rmtree is syscall-bound; overlap deletions of sibling subtrees
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(entries))) as executor:
+                futures = {executor.submit(delete_entry, entry): entry for entry in entries}
+                for future in as_completed(futures):
+                    try:
+                        logging.info(future.result())
+                    except Exception as e:
+                        logging.warning(f"Failed to delete {futures[future].path}: {e}")
         else:
             logging.info(f"Directory does not exist, skipping: {d}")
 
-def run_cmd(cmd, desc=None):
+def prune_step_logs(retention_days, log_dir=STEP_LOG_DIR):
+    """Delete step log files older than retention_days; returns the number deleted."""
+    if not log_dir.exists():
+        return 0
+    cutoff = time.time() - retention_days * 86400
+    deleted = 0
+    for log_file in log_dir.glob('*.log'):
+        try:
+            if log_file.stat().st_mtime < cutoff:
+                log_file.unlink()
+                deleted += 1
+        except OSError as e:
+            logging.warning(f"Failed to delete {log_file}: {e}")
+    if deleted:
+        logging.info(f"Deleted {deleted} step logs older than {retention_days} days from {log_dir}")
+    return deleted
+
+def _read_tail(path, max_bytes=4096):
+    """Return the last max_bytes of a file as text."""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - max_bytes))
+        return f.read().decode('utf-8', errors='replace')
+
+def run_cmd(cmd, desc=None, log_dir=STEP_LOG_DIR):
     logging.info(f"Running: {' '.join(cmd)}" + (f" [{desc}]" if desc else ""))
     start = time.time()
+    # Child output is streamed line by line to a log file and to our stdout
+    # (which API-run jobs relay to their log stream), never buffered whole
+    log_dir.mkdir(parents=True, exist_ok=True)
+    step_name = desc or Path(cmd[1] if len(cmd) > 1 else cmd[0]).stem
+    log_file = log_dir / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{step_name}.log"
+    out = sys.stdout.buffer
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        logging.info(result.stdout)
-        if result.stderr:
-            logging.warning(result.stderr)
-        return True, time.time() - start
-    except subprocess.CalledProcessError as e:
-        logging.error(f"Command failed: {' '.join(cmd)}")
-        logging.error(e.stdout)
-        logging.error(e.stderr)
+        with open(log_file, 'wb') as lf, \
+                subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as proc:
+            for line in proc.stdout:
+                lf.write(line)
+                out.write(line)
+                out.flush()
+        returncode = proc.returncode
+    except OSError as e:
+        logging.error(f"Command failed to start: {' '.join(cmd)}: {e}")
+        return False, time.time() - start
+    
+    if returncode != 0:
+        logging.error(f"Command failed: {' '.join(cmd)} (exit code {returncode}, output: {log_file})")
+        logging.error(_read_tail(log_file))
         return False, time.time() - start
+    logging.info(f"Output written to: {log_file}")
+    return True, time.time() - start
 
 def check_pytest(auto_install=False):
     spec = importlib.util.find_spec("pytest")
@@ -325,6 +375,9 @@ def main():
         print(f"\n=== Cleaning pipeline data ({'test' if test_mode else 'production'}) ===\n")
         clean_pipeline_data(test_mode=test_mode)
 
+    # Step logs are written once per step and run; keep them as long as other logs
+    prune_step_logs(PipelineConfig().get("retention_days", 30))
+
     # Log checkpoint for cleanup
     if monitor and run_id:
         monitor.log_checkpoint(run_id, "cleanup", 0, 1, time.time() - start_time)
@@ -531,18 +584,19 @@ def main():
         report_file = save_integrity_report(integrity_report, args.report_type)
         print(f"Integrity report generated: {report_file}")
 
-    # Final summary banner
-    print("\n=== PIPELINE SUMMARY ===")
-    print(f"fetch_tickers.py:     {'PASS' if summary.get('fetch_tickers', True) else 'FAIL'} ({t_time:.1f}s)")
-    print(f"fetch_data.py:        {'PASS' if summary.get('fetch_data', True) else 'FAIL'} ({d_time:.1f}s)")
-    print(f"process_features.py:  {'PASS' if summary.get('process_features', True) else 'FAIL'} ({f_time:.1f}s)")
+    # Final summary banner, buffered and written to stdout in one call
+    lines = [
+        "\n=== PIPELINE SUMMARY ===",
+        f"fetch_tickers.py:     {'PASS' if summary.get('fetch_tickers', True) else 'FAIL'} ({t_time:.1f}s)",
+        f"fetch_data.py:        {'PASS' if summary.get('fetch_data', True) else 'FAIL'} ({d_time:.1f}s)",
+        f"process_features.py:  {'PASS' if summary.get('process_features', True) else 'FAIL'} ({f_time:.1f}s)",
+    ]
     if not args.prod:
-        print(f"run_all_tests.py:     {'PASS' if summary.get('run_all_tests', True) else 'FAIL'} ({test_time:.1f}s)")
-    print(f"Total pipeline time:  {total_time:.1f} seconds")
+        lines.append(f"run_all_tests.py:     {'PASS' if summary.get('run_all_tests', True) else 'FAIL'} ({test_time:.1f}s)")
+    lines.append(f"Total pipeline time:  {total_time:.1f} seconds")
     
-    # Print ticker/row summary if possible
+    # Add ticker/row summary if possible
     try:
-        from glob import glob
         import pandas as pd
         
         if test_mode:
@@ -556,31 +610,35 @@ def main():
                 df = pd.read_parquet(parquet_file)
                 n_tickers = df['ticker'].nunique() if 'ticker' in df.columns else 'N/A'
                 n_rows = len(df)
-                print(f"Tickers in output: {n_tickers}")
-                print(f"Total rows processed: {n_rows}")
+                lines.append(f"Tickers in output: {n_tickers}")
+                lines.append(f"Total rows processed: {n_rows}")
     except Exception as e:
-        print(f"[WARN] Could not summarize output: {e}")
+        lines.append(f"[WARN] Could not summarize output: {e}")
     
     if args.prod:
-        print(f"Errors: {errors if errors else 'None'}")
-        print("\n=== PROD RUN COMPLETE ===\n")
-        sys.exit(0)
-    if args.full_test:
-        print("Test mode: FULL (all tests including heavy tests)")
-    elif test_mode:
-        print("Test mode: QUICK (smoke/quick tests only)")
+        lines.append(f"Errors: {errors if errors else 'None'}")
+        lines.append("\n=== PROD RUN COMPLETE ===\n")
+        exit_code = 0
     else:
-        print("Mode: PRODUCTION (full data processing)")
+        if args.full_test:
+            lines.append("Test mode: FULL (all tests including heavy tests)")
+        elif test_mode:
+            lines.append("Test mode: QUICK (smoke/quick tests only)")
+        else:
+            lines.append("Mode: PRODUCTION (full data processing)")
+        
+        if success:
+            lines.append("\n🎉 Pipeline completed successfully and all tests passed!")
+            exit_code = 0
+        else:
+            lines.append("\n❌ Pipeline failed.")
+            if failed_steps:
+                lines.append(f"Failed steps: {', '.join(failed_steps)}")
+            lines.append("Tests failed. Run `python run_all_tests.py` for details.")
+            exit_code = 1
     
-    if success:
-        print("\n🎉 Pipeline completed successfully and all tests passed!")
-        sys.exit(0)
-    else:
-        print("\n❌ Pipeline failed.")
-        if failed_steps:
-            print(f"Failed steps: {', '.join(failed_steps)}")
-        print("Tests failed. Run `python run_all_tests.py` for details.")
-        sys.exit(1)
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -6,7 +6,7 @@ Common utilities for the stock evaluation pipeline.
 """
 
 from .common import PipelineConfig, DataManager, LogManager, validate_dataframe, safe_divide
-from .logger import get_logger, get_structured_logger, PipelineLogger, StructuredLogger
+from .logger import get_logger, get_structured_logger, queued_logging, PipelineLogger, StructuredLogger
 from .progress import get_progress_tracker, progress_context, ProgressTracker, SimpleProgressTracker, format_time, format_progress
 
 __all__ = [
@@ -19,6 +19,7 @@ __all__ = [
     'safe_divide',
     'get_logger',
     'get_structured_logger',
+    'queued_logging',
     'PipelineLogger',
     'StructuredLogger',
     'get_progress_tracker',
@@ -6,13 +6,22 @@ Common utilities and shared functions for the stock evaluation pipeline.
 Consolidates duplicate logic from fetch_tickers.py, fetch_data.py, and process_features.py.
 """
 
+import asyncio
+import copy
+import hashlib
+import importlib.util
 import json
 import logging
 import os
 import sys
+import threading
 import time
 import shutil
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union, BinaryIO
@@ -21,6 +30,12 @@ import io
 import pandas as pd
 import yaml
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -35,27 +50,123 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
-# Storage backend imports (optional dependencies)
-try:
-    import boto3
-    from botocore.exceptions import ClientError, NoCredentialsError
-    S3_AVAILABLE = True
-except ImportError:
-    S3_AVAILABLE = False
+# Storage backend imports (optional dependencies). The cloud SDKs are heavy,
+# so only their availability is checked here; they are imported on first use
+# by the backend that needs them.
+def _module_available(module_name: str) -> bool:
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+S3_AVAILABLE = _module_available("boto3")
+GCS_AVAILABLE = _module_available("google.cloud.storage")
+AZURE_AVAILABLE = _module_available("azure.storage.blob")
+
+boto3 = None
+BotoConfig = None
+TransferConfig = None
+ClientError = NoCredentialsError = None
+storage = None
+NotFound = None
+
+# Connection pool size for S3 clients; botocore's default of 10 serializes
+# parallel transfers.
+S3_MAX_POOL_CONNECTIONS = 50
+
+# Multipart upload settings for S3 writes (same keys as aws.transfer in
+# config/cloud_settings.yaml)
+S3_TRANSFER_DEFAULTS = {
+    "multipart_threshold": 8 * 1024 * 1024,
+    "multipart_chunksize": 8 * 1024 * 1024,
+    "max_concurrency": 10,
+    "use_threads": True,
+}
+
+_boto3_sessions: Dict[Tuple[Optional[str], str], Any] = {}
+_boto3_sessions_lock = threading.Lock()
 
-try:
-    from google.cloud import storage
-    from google.cloud.exceptions import NotFound
-    GCS_AVAILABLE = True
-except ImportError:
-    GCS_AVAILABLE = False
 
+def _import_s3_sdk() -> None:
+    """Import boto3 and botocore exceptions into module scope."""
+    global boto3, BotoConfig, TransferConfig, ClientError, NoCredentialsError
+    if boto3 is None:
+        import boto3 as _boto3
+        boto3 = _boto3
+    if BotoConfig is None:
+        from botocore.config import Config as _BotoConfig
+        BotoConfig = _BotoConfig
+    if TransferConfig is None:
+        from boto3.s3.transfer import TransferConfig as _TransferConfig
+        TransferConfig = _TransferConfig
+    if ClientError is None:
+        from botocore.exceptions import ClientError as _ClientError, NoCredentialsError as _NoCredentialsError
+        ClientError, NoCredentialsError = _ClientError, _NoCredentialsError
+
+
+def _get_boto3_session(aws_access_key_id: Optional[str] = None,
+                       aws_secret_access_key: Optional[str] = None,
+                       region_name: Optional[str] = None,
+                       aws_session_token: Optional[str] = None):
+    """
+    Return a shared boto3 Session for the given region and credentials.
+    
+    Creating a Session loads botocore's service models, which dominates S3
+    backend start-up, so sessions are memoized per (region, credential hash).
+    Credentials are only kept inside the Session itself. When no keys are
+    given, boto3's default chain (env vars, shared config, instance/task
+    role) resolves them.
+    """
+    fingerprint = hashlib.sha256(
+        f"{aws_access_key_id or ''}:{aws_secret_access_key or ''}:{aws_session_token or ''}".encode()
+    ).hexdigest()[:16]
+    key = (region_name, fingerprint)
+    
+    with _boto3_sessions_lock:
+        session = _boto3_sessions.get(key)
+        if session is None:
+            session = boto3.session.Session(
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                aws_session_token=aws_session_token,
+                region_name=region_name
+            )
+            _boto3_sessions[key] = session
+        return session
+
+
+def _clear_boto3_sessions() -> None:
+    """Forget memoized boto3 sessions (e.g. after rotating credentials)."""
+    with _boto3_sessions_lock:
+        _boto3_sessions.clear()
+
+
+def _import_gcs_sdk() -> None:
+    """Import google-cloud-storage and its exceptions into module scope."""
+    global storage, NotFound
+    if storage is None:
+        from google.cloud import storage as _storage
+        storage = _storage
+    if NotFound is None:
+        from google.cloud.exceptions import NotFound as _NotFound
+        NotFound = _NotFound
+
+# Fast JSON serialization (optional dependency)
 try:
-    from azure.storage.blob import BlobServiceClient
-    from azure.core.exceptions import ResourceNotFoundError
-    AZURE_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    AZURE_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+# Direct parquet encoding (optional dependency, imported on first write)
+PYARROW_AVAILABLE = _module_available("pyarrow")
+
+# Default parquet codec; pipeline stages can override it with the
+# parquet_compression / parquet_compression_level settings
+PARQUET_COMPRESSION = "zstd"
+PARQUET_COMPRESSION_LEVEL = 3
+# Codecs that accept a compression level in pyarrow
+_LEVELED_PARQUET_CODECS = {"zstd", "gzip", "brotli"}
 
 class StorageBackend(ABC):
     """Abstract base class for storage backends."""
@@ -95,6 +206,10 @@ class StorageBackend(ABC):
         """Delete a directory and its contents."""
         pass
     
+    def delete_prefix(self, path: str) -> None:
+        """Delete everything under path using as few round-trips as the backend allows."""
+        self.delete_directory(path)
+    
     @abstractmethod
     def get_file_size(self, path: str) -> int:
         """Get file size in bytes."""
@@ -145,16 +260,21 @@ class S3StorageBackend(StorageBackend):
     """AWS S3 storage backend."""
     
     def __init__(self, bucket_name: str, aws_access_key_id: Optional[str] = None, 
-                 aws_secret_access_key: Optional[str] = None, region_name: Optional[str] = None):
+                 aws_secret_access_key: Optional[str] = None, region_name: Optional[str] = None,
+                 aws_session_token: Optional[str] = None,
+                 transfer_config: Optional[Dict[str, Any]] = None):
         if not S3_AVAILABLE:
             raise ImportError("boto3 is required for S3 storage. Install with: pip install boto3")
+        _import_s3_sdk()
         
         self.bucket_name = bucket_name
-        self.s3_client = boto3.client(
+        transfer_settings = {**S3_TRANSFER_DEFAULTS, **(transfer_config or {})}
+        self.multipart_threshold = transfer_settings["multipart_threshold"]
+        self.transfer_config = TransferConfig(**transfer_settings)
+        session = _get_boto3_session(aws_access_key_id, aws_secret_access_key, region_name, aws_session_token)
+        self.s3_client = session.client(
             's3',
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            region_name=region_name
+            config=BotoConfig(max_pool_connections=S3_MAX_POOL_CONNECTIONS)
         )
     
     def _normalize_path(self, path: str) -> str:
@@ -184,21 +304,8 @@ class S3StorageBackend(StorageBackend):
             return False
     
     def mkdir(self, path: str, parents: bool = True, exist_ok: bool = True) -> None:
-        # S3 doesn't have real directories, but we can create a placeholder object
-        normalized_path = self._normalize_path(path)
-        if normalized_path and not normalized_path.endswith('/'):
-            normalized_path += '/'
-        
-        if normalized_path:
-            try:
-                self.s3_client.put_object(
-                    Bucket=self.bucket_name,
-                    Key=normalized_path + '.keep',
-                    Body=''
-                )
-            except Exception as e:
-                if not exist_ok:
-                    raise e
+        # S3 has no real directories; prefixes appear when objects are written
+        pass
     
     def listdir(self, path: str) -> List[str]:
         normalized_path = self._normalize_path(path)
@@ -253,11 +360,20 @@ class S3StorageBackend(StorageBackend):
             content = content.encode('utf-8')
         
         try:
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=normalized_path,
-                Body=content
-            )
+            if len(content) < self.multipart_threshold:
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=normalized_path,
+                    Body=content
+                )
+            else:
+                # Large payloads are split into parts uploaded in parallel
+                self.s3_client.upload_fileobj(
+                    io.BytesIO(content),
+                    self.bucket_name,
+                    normalized_path,
+                    Config=self.transfer_config
+                )
         except Exception as e:
             raise IOError(f"Failed to write file {path}: {e}")
     
@@ -269,26 +385,25 @@ class S3StorageBackend(StorageBackend):
             pass  # Ignore errors for missing files
     
     def delete_directory(self, path: str) -> None:
+        try:
+            self.delete_prefix(path)
+        except Exception:
+            pass
+    
+    def delete_prefix(self, path: str) -> None:
         normalized_path = self._normalize_path(path)
         if normalized_path and not normalized_path.endswith('/'):
             normalized_path += '/'
         
-        try:
-            # List all objects with the prefix
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=normalized_path
-            )
-            
-            if 'Contents' in response:
-                objects_to_delete = [{'Key': obj['Key']} for obj in response['Contents']]
-                if objects_to_delete:
-                    self.s3_client.delete_objects(
-                        Bucket=self.bucket_name,
-                        Delete={'Objects': objects_to_delete}
-                    )
-        except Exception:
-            pass
+        # One DeleteObjects request per listed page (up to 1000 keys each)
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=normalized_path):
+            objects_to_delete = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+            if objects_to_delete:
+                self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={'Objects': objects_to_delete, 'Quiet': True}
+                )
     
     def get_file_size(self, path: str) -> int:
         normalized_path = self._normalize_path(path)
@@ -309,12 +424,18 @@ class S3StorageBackend(StorageBackend):
 class GCSStorageBackend(StorageBackend):
     """Google Cloud Storage backend."""
     
-    def __init__(self, bucket_name: str, project_id: Optional[str] = None):
+    def __init__(self, bucket_name: str, project_id: Optional[str] = None,
+                 credentials_file: Optional[str] = None):
         if not GCS_AVAILABLE:
             raise ImportError("google-cloud-storage is required for GCS storage. Install with: pip install google-cloud-storage")
+        _import_gcs_sdk()
         
         self.bucket_name = bucket_name
-        self.storage_client = storage.Client(project=project_id)
+        if credentials_file:
+            self.storage_client = storage.Client.from_service_account_json(credentials_file, project=project_id)
+        else:
+            # Application Default Credentials (GOOGLE_APPLICATION_CREDENTIALS, gcloud, metadata server)
+            self.storage_client = storage.Client(project=project_id)
         self.bucket = self.storage_client.bucket(bucket_name)
     
     def _normalize_path(self, path: str) -> str:
@@ -330,18 +451,8 @@ class GCSStorageBackend(StorageBackend):
         return blob.exists()
     
     def mkdir(self, path: str, parents: bool = True, exist_ok: bool = True) -> None:
-        # GCS doesn't have real directories, but we can create a placeholder object
-        normalized_path = self._normalize_path(path)
-        if normalized_path and not normalized_path.endswith('/'):
-            normalized_path += '/'
-        
-        if normalized_path:
-            try:
-                blob = self.bucket.blob(normalized_path + '.keep')
-                blob.upload_from_string('')
-            except Exception as e:
-                if not exist_ok:
-                    raise e
+        # GCS has no real directories; prefixes appear when objects are written
+        pass
     
     def listdir(self, path: str) -> List[str]:
         normalized_path = self._normalize_path(path)
@@ -400,6 +511,18 @@ class GCSStorageBackend(StorageBackend):
         for blob in blobs:
             blob.delete(ignore_errors=True)
     
+    def delete_prefix(self, path: str) -> None:
+        normalized_path = self._normalize_path(path)
+        if normalized_path and not normalized_path.endswith('/'):
+            normalized_path += '/'
+        
+        # Send deletes as batched requests of up to 100 calls each
+        blobs = list(self.storage_client.list_blobs(self.bucket_name, prefix=normalized_path))
+        for start in range(0, len(blobs), 100):
+            with self.storage_client.batch():
+                for blob in blobs[start:start + 100]:
+                    blob.delete()
+    
     def get_file_size(self, path: str) -> int:
         normalized_path = self._normalize_path(path)
         blob = self.bucket.blob(normalized_path)
@@ -416,14 +539,140 @@ class GCSStorageBackend(StorageBackend):
             return blob.updated.replace(tzinfo=None)
         return datetime.now()
 
+class PrefetchingStorageBackend(StorageBackend):
+    """
+    Read-through wrapper that prefetches neighbouring files into an LRU cache.
+    
+    On a cache miss, the requested file's directory is listed and up to
+    ``prefetch_size`` following siblings with the same extension are fetched
+    concurrently, so scans over partitioned files pay one round-trip per
+    window instead of one per file. Writes and deletes invalidate the cache.
+    """
+    
+    def __init__(self, backend: StorageBackend, prefetch_size: int = 16, max_entries: int = 64):
+        self.backend = backend
+        self.prefetch_size = prefetch_size
+        self.max_entries = max(max_entries, prefetch_size + 1)
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _cache_put(self, path: str, content: bytes) -> None:
+        with self._lock:
+            self._cache[path] = content
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+    
+    def _invalidate(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._cache if key == prefix or key.startswith(prefix.rstrip('/') + '/')]:
+                del self._cache[key]
+    
+    def _prefetch_neighbours(self, path: str) -> None:
+        parent, _, name = path.rpartition('/')
+        prefix = f"{parent}/" if parent else ""
+        suffix = Path(name).suffix
+        siblings = sorted(item for item in self.backend.listdir(parent or ".") if Path(item).suffix == suffix)
+        if name not in siblings:
+            return
+        
+        start = siblings.index(name) + 1
+        with self._lock:
+            window = [prefix + item for item in siblings[start:start + self.prefetch_size]
+                      if prefix + item not in self._cache]
+        if not window:
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(window))) as executor:
+            futures = {executor.submit(self.backend.read_file, neighbour, 'rb'): neighbour for neighbour in window}
+            for future, neighbour in futures.items():
+                try:
+                    self._cache_put(neighbour, future.result())
+                except Exception:
+                    continue  # Prefetch is best-effort
+    
+    def read_file(self, path: str, mode: str = 'r') -> Union[str, bytes]:
+        with self._lock:
+            content = self._cache.get(path)
+            if content is not None:
+                self._cache.move_to_end(path)
+        
+        if content is None:
+            content = self.backend.read_file(path, mode='rb')
+            self._cache_put(path, content)
+            if self.prefetch_size > 0:
+                try:
+                    self._prefetch_neighbours(path)
+                except Exception:
+                    pass
+        
+        return content.decode('utf-8') if mode == 'r' else content
+    
+    def write_file(self, path: str, content: Union[str, bytes], mode: str = 'w') -> None:
+        self._invalidate(path)
+        self.backend.write_file(path, content, mode)
+    
+    def delete_file(self, path: str) -> None:
+        self._invalidate(path)
+        self.backend.delete_file(path)
+    
+    def delete_directory(self, path: str) -> None:
+        self._invalidate(path)
+        self.backend.delete_directory(path)
+    
+    def delete_prefix(self, path: str) -> None:
+        self._invalidate(path)
+        self.backend.delete_prefix(path)
+    
+    def exists(self, path: str) -> bool:
+        with self._lock:
+            if path in self._cache:
+                return True
+        return self.backend.exists(path)
+    
+    def mkdir(self, path: str, parents: bool = True, exist_ok: bool = True) -> None:
+        self.backend.mkdir(path, parents=parents, exist_ok=exist_ok)
+    
+    def listdir(self, path: str) -> List[str]:
+        return self.backend.listdir(path)
+    
+    def get_file_size(self, path: str) -> int:
+        return self.backend.get_file_size(path)
+    
+    def get_last_modified(self, path: str) -> datetime:
+        return self.backend.get_last_modified(path)
+
+# Default parquet read cache size for local storage; remote backends opt in
+DATAFRAME_CACHE_BYTES = 512 * 1024 * 1024
+
+
 class DataManager:
     """Manages data directory structure and file operations with support for multiple storage backends."""
     
     def __init__(self, base_dir: str = "data", test_mode: bool = False, 
-                 storage_backend: Optional[StorageBackend] = None):
+                 storage_backend: Optional[StorageBackend] = None, prefetch_size: int = 0,
+                 dataframe_cache_bytes: Optional[int] = None):
         self.base_dir = base_dir
         self.test_mode = test_mode
         self.storage = storage_backend or LocalStorageBackend()
+        is_local = isinstance(self.storage, LocalStorageBackend)
+        if prefetch_size > 0:
+            self.storage = PrefetchingStorageBackend(self.storage, prefetch_size=prefetch_size)
+        
+        # Parquet reads keyed by (path, column set), bounded by in-memory size.
+        # Local entries are checked against the file's mtime (a stat call);
+        # on remote backends that check is a round trip per read, so the
+        # cache is opt-in there and relies on save_dataframe invalidating it.
+        if dataframe_cache_bytes is None:
+            dataframe_cache_bytes = DATAFRAME_CACHE_BYTES if is_local else 0
+        self.dataframe_cache_bytes = dataframe_cache_bytes
+        self._validate_dataframe_cache = is_local
+        self._dataframe_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._dataframe_cache_size = 0
+        self._dataframe_cache_lock = threading.Lock()
+        
+        # Arrow schemas keyed by (column, dtype) signature, reused across writes
+        self._arrow_schema_cache: Dict[tuple, Any] = {}
         
         # Set up directory paths
         if test_mode:
@@ -499,10 +748,14 @@ class DataManager:
     
     def save_dataframe(self, df: pd.DataFrame, path: str, format: str = 'parquet') -> None:
         """Save DataFrame to storage."""
+        self._invalidate_dataframe_cache(path)
         if format == 'parquet':
-            buffer = io.BytesIO()
-            df.to_parquet(buffer, index=False)
-            self.storage.write_file(path, buffer.getvalue(), mode='wb')
+            if PYARROW_AVAILABLE:
+                self.storage.write_file(path, self._encode_parquet(df), mode='wb')
+            else:
+                buffer = io.BytesIO()
+                df.to_parquet(buffer, index=False)
+                self.storage.write_file(path, buffer.getvalue(), mode='wb')
         elif format == 'csv':
             csv_content = df.to_csv(index=False)
             self.storage.write_file(path, csv_content, mode='w')
@@ -512,32 +765,129 @@ class DataManager:
         else:
             raise ValueError(f"Unsupported format: {format}")
     
-    def load_dataframe(self, path: str, format: str = 'parquet') -> pd.DataFrame:
-        """Load DataFrame from storage."""
+    def _encode_parquet(self, df: pd.DataFrame) -> bytes:
+        """
+        Encode a DataFrame as zstd-compressed parquet bytes with pyarrow.
+        
+        The Arrow schema is cached per column/dtype signature so repeated
+        writes of same-shaped frames skip schema inference. If a cached
+        schema no longer fits (e.g. an object column changed type), it is
+        inferred again and replaced.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        signature = tuple((str(column), str(dtype)) for column, dtype in df.dtypes.items())
+        schema = self._arrow_schema_cache.get(signature)
+        table = None
+        if schema is not None:
+            try:
+                table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                table = None
+        if table is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self._arrow_schema_cache[signature] = table.schema
+        
+        sink = pa.BufferOutputStream()
+        pq.write_table(
+            table, sink,
+            compression=PARQUET_COMPRESSION,
+            compression_level=PARQUET_COMPRESSION_LEVEL,
+            use_dictionary=True
+        )
+        return sink.getvalue().to_pybytes()
+    
+    def _invalidate_dataframe_cache(self, path: str) -> None:
+        """Drop every cached column set read from ``path``."""
+        with self._dataframe_cache_lock:
+            for key in [key for key in self._dataframe_cache if key[0] == path]:
+                _, _, size = self._dataframe_cache.pop(key)
+                self._dataframe_cache_size -= size
+    
+    def _get_cached_dataframe(self, key: tuple, modified: Optional[datetime]) -> Optional[pd.DataFrame]:
+        with self._dataframe_cache_lock:
+            entry = self._dataframe_cache.get(key)
+            if entry is None:
+                return None
+            df, cached_modified, size = entry
+            if cached_modified != modified:
+                del self._dataframe_cache[key]
+                self._dataframe_cache_size -= size
+                return None
+            self._dataframe_cache.move_to_end(key)
+            return df
+    
+    def _cache_dataframe(self, key: tuple, modified: Optional[datetime], df: pd.DataFrame) -> None:
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.dataframe_cache_bytes:
+            return
+        with self._dataframe_cache_lock:
+            previous = self._dataframe_cache.pop(key, None)
+            if previous is not None:
+                self._dataframe_cache_size -= previous[2]
+            self._dataframe_cache[key] = (df, modified, size)
+            self._dataframe_cache_size += size
+            while self._dataframe_cache_size > self.dataframe_cache_bytes:
+                _, (_, _, evicted_size) = self._dataframe_cache.popitem(last=False)
+                self._dataframe_cache_size -= evicted_size
+    
+    def _read_parquet(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        buffer = io.BytesIO(self.storage.read_file(path, mode='rb'))
+        return pd.read_parquet(buffer, columns=columns)
+    
+    def _load_parquet(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load a parquet file, decoding only ``columns`` and caching the result."""
+        if self.dataframe_cache_bytes <= 0:
+            return self._read_parquet(path, columns)
+        
+        key = (path, frozenset(columns) if columns is not None else None)
+        modified = None
+        if self._validate_dataframe_cache:
+            try:
+                modified = self.storage.get_last_modified(path)
+            except Exception:
+                return self._read_parquet(path, columns)
+        
+        df = self._get_cached_dataframe(key, modified)
+        if df is None:
+            df = self._read_parquet(path, columns)
+            self._cache_dataframe(key, modified, df)
+        
+        # Copy so callers can mutate the result without corrupting the cache
+        return df[list(columns)].copy() if columns is not None else df.copy()
+    
+    def load_dataframe(self, path: str, format: str = 'parquet',
+                       columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load DataFrame from storage.
+        
+        For parquet, ``columns`` limits decoding to the listed columns and
+        results are cached per (path, column set) until the file changes
+        (see ``dataframe_cache_bytes``).
+        """
         if format == 'parquet':
-            content = self.storage.read_file(path, mode='rb')
-            buffer = io.BytesIO(content)
-            return pd.read_parquet(buffer)
+            return self._load_parquet(path, columns)
         elif format == 'csv':
             content = self.storage.read_file(path, mode='r')
             buffer = io.StringIO(content)
-            return pd.read_csv(buffer)
+            return pd.read_csv(buffer, usecols=columns)
         elif format == 'json':
             content = self.storage.read_file(path, mode='r')
             buffer = io.StringIO(content)
-            return pd.read_json(buffer, orient='records')
+            df = pd.read_json(buffer, orient='records')
+            return df[list(columns)] if columns is not None else df
         else:
             raise ValueError(f"Unsupported format: {format}")
     
     def save_json(self, data: Dict[str, Any], path: str) -> None:
         """Save JSON data to storage."""
-        json_content = json.dumps(data, indent=2, default=str)
-        self.storage.write_file(path, json_content, mode='w')
+        self.storage.write_file(path, json_dumps_bytes(data), mode='wb')
     
     def load_json(self, path: str) -> Dict[str, Any]:
         """Load JSON data from storage."""
-        content = self.storage.read_file(path, mode='r')
-        return json.loads(content)
+        content = self.storage.read_file(path, mode='rb')
+        return json_loads(content)
     
     def get_storage_info(self) -> Dict[str, Any]:
         """Get information about the storage backend."""
@@ -560,6 +910,24 @@ def create_storage_backend(storage_type: str = "local", **kwargs) -> StorageBack
     else:
         raise ValueError(f"Unsupported storage type: {storage_type}")
 
+@lru_cache(maxsize=8)
+def _parse_yaml_file(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file once per path and modification state."""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=YamlSafeLoader)
+
+
+def load_yaml_file(path: Union[str, Path]) -> Any:
+    """
+    Load a YAML file with the libyaml loader when available.
+    
+    Parsed documents are cached per path until the file changes. Callers
+    get a deep copy, so they may modify the result freely.
+    """
+    stat = os.stat(path)
+    return copy.deepcopy(_parse_yaml_file(os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+
+
 def load_config(config_path: str, config_type: str = "general") -> Dict[str, Any]:
     """
     Load configuration from YAML file with fallback defaults.
@@ -617,9 +985,16 @@ def load_config(config_path: str, config_type: str = "general") -> Dict[str, Any
             "performance_logging": True,
             "progress": True,
             "parallel_workers": None,
-            "adaptive_reduce_every": 3,
+            "requests_per_second": 5,
             "incremental_mode": True,
-            "min_historical_days": 730
+            "min_historical_days": 730,
+            "ohlcv_cache_enabled": True,
+            "ohlcv_cache_path": "cache/ohlcv",
+            "async_fetch_enabled": True,
+            "async_max_concurrency": 50,
+            "async_initial_concurrency": 10,
+            "parquet_compression": "zstd",
+            "parquet_compression_level": 3
         },
         "general": {
             "base_data_path": "data/",
@@ -642,12 +1017,8 @@ def load_config(config_path: str, config_type: str = "general") -> Dict[str, Any
     default_config = default_configs.get(config_type, default_configs["general"])
     
     try:
-        with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
-            # Merge with defaults for missing keys
-            for key, value in default_config.items():
-                if key not in config:
-                    config[key] = value
+        # Merge with defaults for missing keys
+        config = {**default_config, **(load_yaml_file(config_path) or {})}
     except FileNotFoundError:
         logging.warning(f"Config file {config_path} not found, using defaults")
         config = default_config
@@ -725,16 +1096,14 @@ class PipelineConfig:
         """Load main settings from config/settings.yaml."""
         settings_path = self.config_dir / "settings.yaml"
         if settings_path.exists():
-            with open(settings_path, 'r') as f:
-                return yaml.safe_load(f)
+            return load_yaml_file(settings_path)
         return {}
     
     def _load_test_schedules(self) -> Dict[str, Any]:
         """Load test schedules from config/test_schedules.yaml."""
         schedules_path = self.config_dir / "test_schedules.yaml"
         if schedules_path.exists():
-            with open(schedules_path, 'r') as f:
-                return yaml.safe_load(f)
+            return load_yaml_file(schedules_path)
         return {}
     
     def get(self, key: str, default: Any = None) -> Any:
@@ -824,8 +1193,7 @@ class LogManager:
         metadata["stage"] = stage
         metadata["test_mode"] = self.test_mode
         
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2, default=str)
+        metadata_file.write_bytes(json_dumps_bytes(metadata))
     
     def load_metadata(self, stage: str, date: Union[str, datetime]) -> Optional[Dict[str, Any]]:
         """Load metadata for a pipeline stage."""
@@ -837,8 +1205,7 @@ class LogManager:
         metadata_file = self.log_dir / stage / f"dt={date_str}" / "metadata.json"
         
         if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                return json.load(f)
+            return json_loads(metadata_file.read_bytes())
         
         return None
 
@@ -894,6 +1261,143 @@ def create_partition_paths(date_str: str, config: Dict[str, Any], data_type: str
     logging.info(f"Created partition paths: {data_path}, {log_path}")
     return data_path, log_path
 
+# Single file holding every ticker's rows for a raw partition
+RAW_PARTITION_FILE = "ohlcv.parquet"
+
+# Zero-byte marker written once a partition has been completely saved
+PARTITION_SUCCESS_MARKER = "_SUCCESS"
+
+# Directory of finished batch files kept while a raw partition is written;
+# it is combined into RAW_PARTITION_FILE and removed when the run completes
+RAW_PARTITION_PARTS_DIR = RAW_PARTITION_FILE + ".parts"
+
+def list_raw_ticker_files(partition_path: Path) -> List[Path]:
+    """
+    List legacy per-ticker files in a raw data partition.
+    
+    Parquet files are preferred; CSV files from older runs are included for
+    tickers that have no parquet file. The combined partition file is not
+    included.
+    
+    Args:
+        partition_path: Raw partition directory (dt=YYYY-MM-DD)
+        
+    Returns:
+        List of file paths, one per ticker, sorted by ticker
+    """
+    files = {path.stem: path for path in partition_path.glob("*.csv")}
+    files.update((path.stem, path) for path in partition_path.glob("*.parquet")
+                 if path.name != RAW_PARTITION_FILE)
+    return [files[ticker] for ticker in sorted(files)]
+
+def read_raw_ticker_file(path: Path) -> pd.DataFrame:
+    """Read a per-ticker raw data file written as parquet or CSV."""
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+def raw_partition_has_data(partition_path: Path) -> bool:
+    """Check whether a raw partition contains any ticker data."""
+    if (partition_path / RAW_PARTITION_FILE).exists():
+        return True
+    return len(list_raw_ticker_files(partition_path)) > 0
+
+def load_raw_partition(partition_path: Path, limit: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Load the OHLCV data of a raw partition, split by ticker.
+    
+    Reads the combined ohlcv.parquet (one file with a ``symbol`` column) when
+    present, otherwise the legacy per-ticker files.
+    
+    Args:
+        partition_path: Raw partition directory (dt=YYYY-MM-DD)
+        limit: Optional maximum number of tickers to load
+        
+    Returns:
+        Dictionary of ticker -> DataFrame, ordered by ticker
+    """
+    combined_path = partition_path / RAW_PARTITION_FILE
+    if combined_path.exists():
+        df = pd.read_parquet(combined_path)
+        data = {}
+        for symbol, group in df.groupby('symbol', sort=True, observed=True):
+            if limit is not None and len(data) >= limit:
+                break
+            data[str(symbol)] = group.drop(columns='symbol').reset_index(drop=True)
+        return data
+    
+    files = list_raw_ticker_files(partition_path)
+    if limit is not None:
+        files = files[:limit]
+    return {path.stem: read_raw_ticker_file(path) for path in files}
+
+
+def raw_partition_parts(partition_path: Path) -> List[Path]:
+    """List the finished batch files of a partially written raw partition, in write order."""
+    return sorted((partition_path / RAW_PARTITION_PARTS_DIR).glob("part-*.parquet"))
+
+
+def load_raw_partition_parts(partition_path: Path) -> Dict[str, pd.DataFrame]:
+    """
+    Load the tickers saved so far by an interrupted raw partition write.
+    
+    Args:
+        partition_path: Raw partition directory (dt=YYYY-MM-DD)
+        
+    Returns:
+        Dictionary of ticker -> DataFrame, empty if no batch was finished
+    """
+    parts = raw_partition_parts(partition_path)
+    if not parts:
+        return {}
+    df = pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+    return {str(symbol): group.drop(columns='symbol').reset_index(drop=True)
+            for symbol, group in df.groupby('symbol', sort=False, observed=True)}
+
+
+def parquet_write_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return the parquet compression keyword arguments for a configuration.
+    
+    The result can be passed to DataFrame.to_parquet as well as pyarrow's
+    write_table / ParquetWriter. The level is only included for codecs
+    that accept one, and only when pyarrow is the parquet engine.
+    """
+    compression = config.get("parquet_compression", PARQUET_COMPRESSION)
+    options = {"compression": compression}
+    if PYARROW_AVAILABLE and str(compression).lower() in _LEVELED_PARQUET_CODECS:
+        options["compression_level"] = config.get("parquet_compression_level", PARQUET_COMPRESSION_LEVEL)
+    return options
+
+
+def json_dumps_bytes(obj: Any, indent: bool = True) -> bytes:
+    """
+    Serialize an object to UTF-8 JSON bytes, using orjson when available.
+    
+    Unsupported types fall back to str(), matching json.dumps(default=str).
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=str).encode('utf-8')
+
+
+def json_dumps(obj: Any, indent: bool = True) -> str:
+    """Serialize an object to a JSON string, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return json_dumps_bytes(obj, indent).decode()
+    return json.dumps(obj, indent=2 if indent else None, default=str)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or bytes, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def save_metadata_to_file(metadata: Dict[str, Any], log_path: Path, dry_run: bool = False) -> str:
     """
     Save metadata to JSON file.
@@ -912,12 +1416,47 @@ def save_metadata_to_file(metadata: Dict[str, Any], log_path: Path, dry_run: boo
         logging.info(f"[DRY RUN] Would save metadata to {metadata_path}")
         return str(metadata_path)
     
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2, default=str)
+    metadata_path.write_bytes(json_dumps_bytes(metadata))
     
     logging.info(f"Saved metadata to {metadata_path}")
     return str(metadata_path)
 
+def _expired_partitions(base: Path, cutoff_name: str, label: str) -> List[str]:
+    """List dt=YYYY-MM-DD directories under base whose name sorts at or before cutoff_name."""
+    try:
+        # scandir entries carry their file type, so is_dir() needs no stat call
+        with os.scandir(base) as entries:
+            partitions = sorted((entry.name, entry.path) for entry in entries
+                                if entry.name.startswith("dt=") and entry.is_dir(follow_symlinks=False))
+    except FileNotFoundError:
+        return []
+    
+    expired = []
+    for name, path in partitions:
+        if len(name) != len(cutoff_name):
+            logging.warning(f"Could not parse date from {label} name: {name}")
+            continue
+        if name > cutoff_name:
+            break
+        expired.append(path)
+    return expired
+
+
+def _delete_partitions(partitions: List[Tuple[str, str]], dry_run: bool) -> None:
+    """Delete (path, label) partition directories, removing several trees at once."""
+    if dry_run:
+        for path, label in partitions:
+            logging.info(f"[DRY RUN] Would delete old {label}: {path}")
+        return
+    if not partitions:
+        return
+    
+    # rmtree is dominated by unlink syscalls, which release the GIL
+    with ThreadPoolExecutor(max_workers=min(4, len(partitions)), thread_name_prefix="cleanup") as executor:
+        for (path, label), _ in zip(partitions, executor.map(shutil.rmtree, [path for path, _ in partitions])):
+            logging.info(f"Deleted old {label}: {path}")
+
+
 def cleanup_old_partitions(config: Dict[str, Any], data_type: str, dry_run: bool = False, test_mode: bool = False) -> Dict[str, Any]:
     """
     Clean up old partitions based on retention policy.
@@ -962,46 +1501,15 @@ def cleanup_old_partitions(config: Dict[str, Any], data_type: str, dry_run: bool
         else:
             raise ValueError(f"Unknown data type: {data_type}")
     
-    deleted_partitions = []
-    total_deleted = 0
-    
-    # Clean up data partitions
-    if base_data_path.exists():
-        for partition_dir in base_data_path.iterdir():
-            if partition_dir.is_dir() and partition_dir.name.startswith("dt="):
-                try:
-                    partition_date_str = partition_dir.name[3:]  # Remove "dt=" prefix
-                    partition_date = datetime.strptime(partition_date_str, "%Y-%m-%d")
-                    
-                    if partition_date < cutoff_date:
-                        if dry_run:
-                            logging.info(f"[DRY RUN] Would delete old partition: {partition_dir}")
-                        else:
-                            shutil.rmtree(partition_dir)
-                            logging.info(f"Deleted old partition: {partition_dir}")
-                        deleted_partitions.append(str(partition_dir))
-                        total_deleted += 1
-                except ValueError:
-                    logging.warning(f"Could not parse date from partition name: {partition_dir.name}")
-    
-    # Clean up log partitions
-    if base_log_path.exists():
-        for partition_dir in base_log_path.iterdir():
-            if partition_dir.is_dir() and partition_dir.name.startswith("dt="):
-                try:
-                    partition_date_str = partition_dir.name[3:]  # Remove "dt=" prefix
-                    partition_date = datetime.strptime(partition_date_str, "%Y-%m-%d")
-                    
-                    if partition_date < cutoff_date:
-                        if dry_run:
-                            logging.info(f"[DRY RUN] Would delete old log partition: {partition_dir}")
-                        else:
-                            shutil.rmtree(partition_dir)
-                            logging.info(f"Deleted old log partition: {partition_dir}")
-                        deleted_partitions.append(str(partition_dir))
-                        total_deleted += 1
-                except ValueError:
-                    logging.warning(f"Could not parse date from log partition name: {partition_dir.name}")
+    # dt=YYYY-MM-DD names sort chronologically, so partitions are compared
+    # by name. Partition dates are midnight, so the cutoff day itself is
+    # already older than the cutoff time.
+    cutoff_name = f"dt={cutoff_date:%Y-%m-%d}"
+    expired = [(path, "partition") for path in _expired_partitions(base_data_path, cutoff_name, "partition")]
+    expired += [(path, "log partition") for path in _expired_partitions(base_log_path, cutoff_name, "log partition")]
+    _delete_partitions(expired, dry_run)
+    deleted_partitions = [path for path, _ in expired]
+    total_deleted = len(deleted_partitions)
     
     # Save cleanup log
     cleanup_log = {
@@ -1024,15 +1532,110 @@ def cleanup_old_partitions(config: Dict[str, Any], data_type: str, dry_run: bool
     cleanup_file = cleanup_log_path / f"cleanup_{datetime.now().strftime('%Y-%m-%d')}.json"
     
     if not dry_run:
-        with open(cleanup_file, 'w') as f:
-            json.dump(cleanup_log, f, indent=2)
+        cleanup_file.write_bytes(json_dumps_bytes(cleanup_log))
         logging.info(f"Saved cleanup log to {cleanup_file}")
     
     return cleanup_log
 
-def handle_rate_limit(attempt: int, config: Dict[str, Any]) -> None:
+def create_http_session(retries: int = 3, backoff_factor: float = 0.5,
+                        pool_connections: int = 16, pool_maxsize: int = 32,
+                        status_forcelist: Tuple[int, ...] = (500, 502, 503, 504),
+                        headers: Optional[Dict[str, str]] = None):
     """
-    Handle rate limiting with exponential backoff.
+    Create a requests.Session with keep-alive connection pooling and retries.
+    
+    Reusing one session avoids a DNS lookup and TLS handshake per request.
+    By default only transient 5xx responses are retried by urllib3; 429
+    handling is left to callers so they can apply their own rate-limit
+    backoff, unless 429 is added to status_forcelist. Default headers
+    (keep-alive, gzip, plus any given) are set once on the session.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=list(status_forcelist),
+        allowed_methods=["GET"],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"})
+    if headers:
+        session.headers.update(headers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency limit for asyncio tasks.
+    
+    Each success raises the limit by 1/limit (about +1 per limit's worth of
+    successes); a rate-limit response multiplies it by ``decrease_factor``.
+    The limit therefore climbs toward the API's throttling point and backs
+    off when it is hit. Every change of the integer limit is recorded in
+    ``resizes``.
+    """
+    
+    def __init__(self, initial: int, min_concurrency: int = 1, max_concurrency: Optional[int] = None,
+                 decrease_factor: float = 0.7):
+        self.min_concurrency = max(1, int(min_concurrency))
+        self.max_concurrency = max(self.min_concurrency, int(max_concurrency or initial))
+        self.current = float(min(max(initial, self.min_concurrency), self.max_concurrency))
+        self.initial = self.limit
+        self.decrease_factor = decrease_factor
+        self.resizes: List[Dict[str, Any]] = []
+        self._active = 0
+        self._condition: Optional[asyncio.Condition] = None
+    
+    @property
+    def limit(self) -> int:
+        return max(self.min_concurrency, int(self.current))
+    
+    def _resize(self, current: float, reason: str) -> None:
+        old_limit = self.limit
+        self.current = min(max(current, self.min_concurrency), self.max_concurrency)
+        if self.limit != old_limit:
+            self.resizes.append({
+                "from": old_limit,
+                "to": self.limit,
+                "reason": reason,
+                "timestamp": datetime.now().isoformat()
+            })
+    
+    def on_success(self) -> None:
+        """Additive increase after a successful request."""
+        self._resize(self.current + 1 / self.current, "success")
+    
+    def on_overload(self) -> None:
+        """Multiplicative decrease after a rate-limit response."""
+        self._resize(self.current * self.decrease_factor, "rate_limited")
+    
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the currently allowed concurrent slots."""
+        if self._condition is None:
+            # Created on first use so it belongs to the running loop
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+
+def compute_rate_limit_cooldown(attempt: int, config: Dict[str, Any]) -> float:
+    """
+    Return the exponential backoff delay in seconds for a rate-limit hit.
     
     Args:
         attempt: Current attempt number
@@ -1043,13 +1646,22 @@ def handle_rate_limit(attempt: int, config: Dict[str, Any]) -> None:
     max_cooldown = config.get("max_cooldown_seconds", 60)
     
     if attempt >= max_hits:
-        cooldown = max_cooldown
-    else:
-        cooldown = min(base_cooldown * (2 ** attempt), max_cooldown)
+        return max_cooldown
+    return min(base_cooldown * (2 ** attempt), max_cooldown)
+
+
+def handle_rate_limit(attempt: int, config: Dict[str, Any]) -> None:
+    """
+    Handle rate limiting with exponential backoff.
+    
+    Args:
+        attempt: Current attempt number
+        config: Configuration dictionary
+    """
+    cooldown = compute_rate_limit_cooldown(attempt, config)
     
-    debug = config.get("debug_rate_limit", False)
-    if debug:
-        print(f"[DEBUG-RATE-LIMIT] Simulating rate limit hit. Sleeping for {cooldown} seconds (attempt {attempt})")
+    if config.get("debug_rate_limit", False):
+        print(f"[DEBUG-RATE-LIMIT] Rate limit hit. Sleeping for {cooldown} seconds (attempt {attempt})")
     logging.info(f"Rate limit cooldown: {cooldown} seconds (attempt {attempt})")
     time.sleep(cooldown)
 
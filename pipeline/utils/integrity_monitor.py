@@ -34,6 +34,8 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict, field
 import shutil
 
+from common import json_dumps_bytes, json_loads
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -113,8 +115,8 @@ class IntegrityMonitor:
             return []
         
         try:
-            with open(self.runs_file, 'r') as f:
-                return json.load(f)
+            data = self.runs_file.read_bytes()
+            return json_loads(data)
         except Exception as e:
             logging.error(f"Failed to load runs: {e}")
             return []
@@ -122,16 +124,14 @@ class IntegrityMonitor:
     def _save_runs(self) -> None:
         """Save pipeline runs to JSON file."""
         try:
-            with open(self.runs_file, 'w') as f:
-                json.dump(self.runs, f, indent=2, default=str)
+            self.runs_file.write_bytes(json_dumps_bytes(self.runs))
         except Exception as e:
             logging.error(f"Failed to save runs: {e}")
     
     def _save_status(self, status_data: Dict[str, Any]) -> None:
         """Save current pipeline status to JSON file."""
         try:
-            with open(self.status_file, 'w') as f:
-                json.dump(status_data, f, indent=2, default=str)
+            self.status_file.write_bytes(json_dumps_bytes(status_data))
         except Exception as e:
             logging.error(f"Failed to save status: {e}")
     
@@ -281,8 +281,7 @@ class IntegrityMonitor:
         
         metadata_file = log_dir / f"run_{run_id}_metadata.json"
         try:
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            metadata_file.write_bytes(json_dumps_bytes(metadata))
             logging.info(f"Metadata saved to {metadata_file}")
         except Exception as e:
             logging.error(f"Failed to save metadata: {e}")
@@ -632,8 +631,7 @@ class IntegrityMonitor:
         reports_dir.mkdir(parents=True, exist_ok=True)
         
         report_file = reports_dir / f"integrity_report_{datetime.now().strftime('%Y%m%d')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        report_file.write_bytes(json_dumps_bytes(report))
         
         print(f"Integrity report saved to: {report_file}")
         return report
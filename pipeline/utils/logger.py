@@ -8,10 +8,13 @@ Provides consistent logging format and structure across all components.
 
 import json
 import logging
+import queue
 import sys
+from contextlib import contextmanager
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 class PipelineLogger:
     """Standardized logger for pipeline components."""
@@ -191,4 +194,38 @@ def get_logger(name: str, log_dir: str = "logs", test_mode: bool = False) -> Pip
 
 def get_structured_logger(name: str, log_dir: str = "logs", test_mode: bool = False) -> StructuredLogger:
     """Get a structured logger instance."""
-    return StructuredLogger(name, log_dir, test_mode) 
\ No newline at end of file
+    return StructuredLogger(name, log_dir, test_mode)
+
+@contextmanager
+def queued_logging(logger: Optional[logging.Logger] = None) -> Iterator[None]:
+    """
+    Move a logger's handlers onto a background writer thread.
+    
+    The logger's handlers are handed to a QueueListener and replaced with a
+    single QueueHandler, so logging calls on fetch threads only enqueue the
+    record. On exit the listener drains the queue and the original handlers
+    are restored.
+    
+    Args:
+        logger: Logger whose handlers to queue (root logger by default)
+    """
+    logger = logger or logging.getLogger()
+    handlers = [h for h in logger.handlers if not isinstance(h, QueueHandler)]
+    if not handlers:
+        yield
+        return
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(queue_handler)
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        logger.removeHandler(queue_handler)
+        for handler in handlers:
+            logger.addHandler(handler)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+rate_limit.py
+
+Request rate limiting shared by the pipeline fetchers and the bootstrap tools.
+Only depends on the standard library and has no import-time side effects, so
+it can be imported before logging is configured.
+
+Usage:
+    from rate_limit import TokenBucket
+    
+    bucket = TokenBucket(rate=5, period=60.0)
+    bucket.acquire()
+"""
+
+import asyncio
+import logging
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting calls to ``rate`` per ``period`` seconds.
+
+    ``throttle()`` halves the rate after a 429; each granted token then
+    restores it by ``recovery`` (a fraction of the configured rate) until
+    the configured rate is reached again.
+    """
+
+    def __init__(self, rate: float, capacity: float = 10, min_rate: float = 0.1,
+                 recovery: float = 0.05, period: float = 1.0):
+        self.max_rate = max(float(rate), min_rate)
+        self.rate = self.max_rate
+        self.period = float(period)
+        self.capacity = max(1.0, float(capacity))
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """
+        Consume a token if one is available.
+        
+        Returns 0 on success, otherwise the seconds until a token will be
+        available (callers on an event loop can await asyncio.sleep on it).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / self.period)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                if self.rate < self.max_rate:
+                    self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery)
+                return 0.0
+            return (1 - self._tokens) * self.period / self.rate
+    
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        wait = self.try_acquire()
+        while wait > 0:
+            time.sleep(wait)
+            wait = self.try_acquire()
+
+    async def acquire_async(self) -> None:
+        """Wait on the event loop until a token is available, then consume it."""
+        wait = self.try_acquire()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self.try_acquire()
+
+    def throttle(self) -> None:
+        """Halve the rate and drop any burst allowance after a rate-limit response."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 1.0)
+        logging.info(f"Rate limited; request rate reduced to {self.rate:.2f} per {self.period:g}s")
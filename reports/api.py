@@ -6,21 +6,146 @@ Simple API endpoints for frontend dashboard consumption.
 Provides JSON endpoints for pipeline status, reports, and metadata.
 """
 
+import hmac
 import json
+import os
+import subprocess
 import sys
+import threading
+import time
+import uuid
+from collections import deque
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import urllib.parse
 
 # Import common utilities
 sys.path.insert(0, str(Path(__file__).parent.parent / "pipeline" / "utils"))
 try:
-    from common import PipelineConfig, DataManager, LogManager
+    from common import PipelineConfig, DataManager, LogManager, json_dumps_bytes
 except ImportError:
     print("Warning: Could not import common utilities")
 
+PIPELINE_SCRIPT = Path(__file__).parent.parent / "pipeline" / "run_pipeline.py"
+PIPELINE_MODES = {"test": "--test", "full": "--full", "prod": "--prod"}
+PIPELINE_STORAGE_PROVIDERS = ("local", "s3", "gcs", "azure")
+PIPELINE_TIMEOUT_SECONDS = 900
+PIPELINE_LOG_LINES = 500
+# Finished jobs are forgotten after a while, and only the newest are kept
+PIPELINE_JOB_TTL_SECONDS = 3600
+PIPELINE_MAX_JOBS = 50
+PIPELINE_ACTIVE_STATES = ("PENDING", "RUNNING")
+
+# Starting a run requires "Authorization: Bearer <token>" when this variable
+# is set; without it only clients on the local machine may start runs
+PIPELINE_API_TOKEN_ENV = "PIPELINE_API_TOKEN"
+LOOPBACK_ADDRESSES = ("127.0.0.1", "::1", "::ffff:127.0.0.1")
+
+# Background pipeline jobs keyed by job id; logs keep only the most recent lines
+_pipeline_jobs: Dict[str, Dict[str, Any]] = {}
+_pipeline_job_logs: Dict[str, deque] = {}
+_pipeline_jobs_lock = threading.Lock()
+
+
+def _run_pipeline_job(job_id: str, cmd: List[str]) -> None:
+    """Run a pipeline subprocess in a worker thread, streaming its output into the job log."""
+    with _pipeline_jobs_lock:
+        _pipeline_jobs[job_id].update(state="RUNNING", started_at=datetime.now(timezone.utc).isoformat())
+    log = _pipeline_job_logs[job_id]
+    timer = None
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+        timer = threading.Timer(PIPELINE_TIMEOUT_SECONDS, proc.kill)
+        timer.start()
+        for line in proc.stdout:
+            with _pipeline_jobs_lock:
+                _pipeline_jobs[job_id]["lines"] += 1
+                log.append((_pipeline_jobs[job_id]["lines"], line.rstrip("\n")))
+        returncode = proc.wait()
+        
+        if not timer.is_alive():
+            outcome = {"state": "FAILURE", "returncode": returncode, "error": f"Pipeline timed out after {PIPELINE_TIMEOUT_SECONDS} seconds"}
+        else:
+            outcome = {"state": "SUCCESS" if returncode == 0 else "FAILURE", "returncode": returncode}
+    except Exception as e:
+        outcome = {"state": "FAILURE", "error": str(e)}
+    finally:
+        if timer is not None:
+            timer.cancel()
+    
+    outcome["finished_at"] = datetime.now(timezone.utc).isoformat()
+    with _pipeline_jobs_lock:
+        _pipeline_jobs[job_id].update(outcome)
+
+
+def _prune_pipeline_jobs() -> None:
+    """Drop finished jobs past their TTL, then the oldest finished ones over the cap (lock held)."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=PIPELINE_JOB_TTL_SECONDS)
+    finished = sorted((job["finished_at"], job_id) for job_id, job in _pipeline_jobs.items()
+                      if job["state"] not in PIPELINE_ACTIVE_STATES and "finished_at" in job)
+    excess = len(_pipeline_jobs) - PIPELINE_MAX_JOBS + 1
+    for index, (finished_at, job_id) in enumerate(finished):
+        if index >= excess and datetime.fromisoformat(finished_at) >= cutoff:
+            break
+        del _pipeline_jobs[job_id]
+        _pipeline_job_logs.pop(job_id, None)
+
+
+def get_active_pipeline_job() -> Optional[str]:
+    """Return the id of the pending or running pipeline job, if any."""
+    with _pipeline_jobs_lock:
+        return next((job_id for job_id, job in _pipeline_jobs.items()
+                     if job["state"] in PIPELINE_ACTIVE_STATES), None)
+
+
+def start_pipeline_job(mode: str = "test", storage_provider: str = "local") -> Optional[str]:
+    """
+    Start run_pipeline.py in the background and return its job id.
+    
+    Only one run may be active at a time, since concurrent runs would write
+    the same partitions; returns None while another job is pending or running.
+    """
+    if mode not in PIPELINE_MODES:
+        raise ValueError(f"Unsupported mode: {mode}")
+    if storage_provider not in PIPELINE_STORAGE_PROVIDERS:
+        raise ValueError(f"Unsupported storage provider: {storage_provider}")
+    cmd = [sys.executable, str(PIPELINE_SCRIPT), PIPELINE_MODES[mode], "--storage-provider", storage_provider]
+    job_id = uuid.uuid4().hex
+    with _pipeline_jobs_lock:
+        if any(job["state"] in PIPELINE_ACTIVE_STATES for job in _pipeline_jobs.values()):
+            return None
+        _prune_pipeline_jobs()
+        _pipeline_jobs[job_id] = {
+            "job_id": job_id,
+            "state": "PENDING",
+            "mode": mode,
+            "storage_provider": storage_provider,
+            "submitted_at": datetime.now(timezone.utc).isoformat(),
+            "lines": 0
+        }
+        _pipeline_job_logs[job_id] = deque(maxlen=PIPELINE_LOG_LINES)
+    threading.Thread(target=_run_pipeline_job, args=(job_id, cmd), daemon=True).start()
+    return job_id
+
+
+def get_pipeline_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Return a snapshot of a background pipeline job, or None if unknown."""
+    with _pipeline_jobs_lock:
+        job = _pipeline_jobs.get(job_id)
+        if job is None:
+            return None
+        snapshot = dict(job)
+        snapshot["log_tail"] = [line for _, line in list(_pipeline_job_logs[job_id])[-20:]]
+        return snapshot
+
+
+def get_pipeline_job_lines(job_id: str, after: int) -> List[tuple]:
+    """Return buffered (sequence, line) log entries newer than ``after``."""
+    with _pipeline_jobs_lock:
+        return [entry for entry in _pipeline_job_logs.get(job_id, ()) if entry[0] > after]
+
 class PipelineAPIHandler(BaseHTTPRequestHandler):
     """HTTP request handler for pipeline API endpoints."""
     
@@ -32,6 +157,7 @@ class PipelineAPIHandler(BaseHTTPRequestHandler):
     
     def do_GET(self):
         """Handle GET requests."""
+        self.request_timestamp = datetime.now(timezone.utc).isoformat()
         try:
             parsed_path = urllib.parse.urlparse(self.path)
             path = parsed_path.path
@@ -48,6 +174,10 @@ class PipelineAPIHandler(BaseHTTPRequestHandler):
                 self._handle_data_freshness()
             elif path == "/api/pipeline/runs":
                 self._handle_pipeline_runs()
+            elif path.startswith("/api/pipeline/run/") and path.endswith("/logs"):
+                self._handle_pipeline_job_logs(path[len("/api/pipeline/run/"):-len("/logs")])
+            elif path.startswith("/api/pipeline/run/"):
+                self._handle_pipeline_job(path[len("/api/pipeline/run/"):])
             elif path == "/":
                 self._handle_index()
             else:
@@ -56,6 +186,21 @@ class PipelineAPIHandler(BaseHTTPRequestHandler):
         except Exception as e:
             self._handle_error(str(e))
     
+    def do_POST(self):
+        """Handle POST requests."""
+        self.request_timestamp = datetime.now(timezone.utc).isoformat()
+        try:
+            parsed_path = urllib.parse.urlparse(self.path)
+            path = parsed_path.path
+            
+            if path == "/api/pipeline/run":
+                self._handle_pipeline_run()
+            else:
+                self._handle_404()
+                
+        except Exception as e:
+            self._handle_error(str(e))
+    
     def _send_json_response(self, data: Dict[str, Any], status_code: int = 200):
         """Send JSON response."""
         self.send_response(status_code)
@@ -66,12 +211,12 @@ class PipelineAPIHandler(BaseHTTPRequestHandler):
         self.end_headers()
         
         response = {
-            "timestamp": datetime.now().isoformat(),
-            "status": "success" if status_code == 200 else "error",
+            "timestamp": self.request_timestamp,
+            "status": "success" if status_code < 400 else "error",
             "data": data
         }
         
-        self.wfile.write(json.dumps(response, indent=2, default=str).encode())
+        self.wfile.write(json_dumps_bytes(response))
     
     def _handle_status(self):
         """Handle /api/status endpoint."""
@@ -107,6 +252,93 @@ class PipelineAPIHandler(BaseHTTPRequestHandler):
         runs = self._get_pipeline_runs()
         self._send_json_response(runs)
     
+    def _is_authorized(self) -> bool:
+        """Check that the client may start pipeline runs."""
+        token = os.environ.get(PIPELINE_API_TOKEN_ENV)
+        if token:
+            supplied = self.headers.get('Authorization', '')
+            return hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode())
+        return self.client_address[0] in LOOPBACK_ADDRESSES
+    
+    def _handle_pipeline_run(self):
+        """Handle POST /api/pipeline/run by queueing a background pipeline job."""
+        if not self._is_authorized():
+            self._send_json_response({"error": "Not authorized to start pipeline runs"}, 401)
+            return
+        # A JSON content type makes browsers send a CORS preflight, which this
+        # server does not answer, so other sites cannot post runs
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            self._send_json_response({"error": "Content-Type must be application/json"}, 415)
+            return
+        
+        try:
+            length = int(self.headers.get('Content-Length', 0) or 0)
+            body = json.loads(self.rfile.read(length)) if length > 0 else {}
+        except ValueError as e:
+            self._send_json_response({"error": f"Invalid JSON body: {e}"}, 400)
+            return
+        if not isinstance(body, dict):
+            self._send_json_response({"error": "Request body must be a JSON object"}, 400)
+            return
+        
+        mode = body.get("mode", "test")
+        storage_provider = body.get("storage_provider", "local")
+        if mode not in PIPELINE_MODES:
+            self._send_json_response({"error": f"Unsupported mode: {mode}", "modes": list(PIPELINE_MODES)}, 400)
+            return
+        if storage_provider not in PIPELINE_STORAGE_PROVIDERS:
+            self._send_json_response({"error": f"Unsupported storage provider: {storage_provider}",
+                                      "storage_providers": list(PIPELINE_STORAGE_PROVIDERS)}, 400)
+            return
+        
+        job_id = start_pipeline_job(mode, storage_provider)
+        if job_id is None:
+            active = get_active_pipeline_job()
+            self._send_json_response({"error": "A pipeline run is already in progress", "job_id": active,
+                                      "status_url": f"/api/pipeline/run/{active}"}, 409)
+            return
+        self._send_json_response({"job_id": job_id, "status_url": f"/api/pipeline/run/{job_id}"}, 202)
+    
+    def _handle_pipeline_job(self, job_id: str):
+        """Handle /api/pipeline/run/<job_id> endpoint."""
+        job = get_pipeline_job(job_id)
+        if job is None:
+            self._send_json_response({"error": f"Unknown job id: {job_id}"}, 404)
+            return
+        self._send_json_response(job)
+    
+    def _handle_pipeline_job_logs(self, job_id: str):
+        """Handle /api/pipeline/run/<job_id>/logs as a Server-Sent Events stream."""
+        if get_pipeline_job(job_id) is None:
+            self._send_json_response({"error": f"Unknown job id: {job_id}"}, 404)
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        
+        last_seen = 0
+        try:
+            while True:
+                job = get_pipeline_job(job_id)
+                if job is None:
+                    break
+                state = job["state"]
+                for seq, line in get_pipeline_job_lines(job_id, last_seen):
+                    self.wfile.write(f"id: {seq}\ndata: {line}\n\n".encode())
+                    last_seen = seq
+                self.wfile.flush()
+                if state in ("SUCCESS", "FAILURE"):
+                    self.wfile.write(f"event: end\ndata: {state}\n\n".encode())
+                    self.wfile.flush()
+                    break
+                time.sleep(0.5)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    
     def _handle_index(self):
         """Handle root endpoint with API documentation."""
         api_docs = {
@@ -116,7 +348,10 @@ class PipelineAPIHandler(BaseHTTPRequestHandler):
                 "/api/reports/daily": "Get daily reports",
                 "/api/reports/weekly": "Get weekly reports",
                 "/api/data/freshness": "Get data freshness information",
-                "/api/pipeline/runs": "Get recent pipeline runs"
+                "/api/pipeline/runs": "Get recent pipeline runs",
+                "POST /api/pipeline/run": "Start a pipeline run in the background and return its job id",
+                "/api/pipeline/run/<job_id>": "Get the state of a background pipeline run",
+                "/api/pipeline/run/<job_id>/logs": "Stream a background pipeline run's output (Server-Sent Events)"
             },
             "version": "1.0.0",
             "description": "Pipeline API for frontend dashboard"
@@ -133,7 +368,8 @@ class PipelineAPIHandler(BaseHTTPRequestHandler):
                 "/api/reports/daily",
                 "/api/reports/weekly",
                 "/api/data/freshness",
-                "/api/pipeline/runs"
+                "/api/pipeline/runs",
+                "/api/pipeline/run/<job_id>"
             ]
         }
         self._send_json_response(error_data, 404)
@@ -356,11 +592,11 @@ class PipelineAPIHandler(BaseHTTPRequestHandler):
         except ImportError:
             return None
 
-def run_api_server(port: int = 8080):
-    """Run the API server."""
-    server_address = ('', port)
-    httpd = HTTPServer(server_address, PipelineAPIHandler)
-    print(f"Pipeline API server running on port {port}")
+def run_api_server(port: int = 8080, host: str = "127.0.0.1"):
+    """Run the API server (local connections only unless another host is given)."""
+    server_address = (host, port)
+    httpd = ThreadingHTTPServer(server_address, PipelineAPIHandler)
+    print(f"Pipeline API server running on {host}:{port}")
     print(f"API documentation available at: http://localhost:{port}/")
     httpd.serve_forever()
 
@@ -369,6 +605,8 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description="Pipeline API Server")
     parser.add_argument("--port", type=int, default=8080, help="Port to run server on")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help=f"Interface to bind (use 0.0.0.0 to expose it; set {PIPELINE_API_TOKEN_ENV} to protect pipeline runs)")
     args = parser.parse_args()
     
-    run_api_server(args.port) 
\ No newline at end of file
+    run_api_server(args.port, args.host) 
\ No newline at end of file
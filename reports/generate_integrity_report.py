@@ -159,11 +159,11 @@ def analyze_pipeline_data(date_str=None) -> Dict[str, Any]:
                     analysis["data_availability"][data_type] = {"exists": True, "no_features": True}
                     total_missing_files += 1
             else:
-                csv_files = list(data_path.glob("*.csv"))
+                data_files = [f for f in data_path.iterdir() if f.suffix in (".csv", ".parquet")]
                 analysis["data_availability"][data_type] = {
                     "exists": True,
-                    "file_count": len(csv_files),
-                    "total_size_mb": sum(f.stat().st_size for f in csv_files) / (1024 * 1024)
+                    "file_count": len(data_files),
+                    "total_size_mb": sum(f.stat().st_size for f in data_files) / (1024 * 1024)
                 }
                 total_expected_files += 1
         else:
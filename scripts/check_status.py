@@ -7,15 +7,21 @@ Check pipeline status and recent activity.
 import sys
 from pathlib import Path
 
-# Add project root to path
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
-
 try:
     from tools.monitoring.generate_dashboard_report import main as generate_report
+except ImportError:
+    # Running as a plain script from outside the project root
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    try:
+        from tools.monitoring.generate_dashboard_report import main as generate_report
+    except ImportError as e:
+        generate_report = None
+        import_error = e
+
+if generate_report is not None:
     print("🚀 Generating dashboard report...")
     generate_report()
-except ImportError as e:
+else:
     print("❌ Dashboard report generator not found")
-    print(f"Error: {e}")
+    print(f"Error: {import_error}")
     print("Run: python tools/monitoring/generate_dashboard_report.py")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Tests for the pipeline API's background run endpoints.
+
+This module tests:
+- Authorization of POST /api/pipeline/run (bearer token or loopback clients)
+- Request validation (Content-Type, JSON body, mode and storage provider)
+- Rejection of concurrent runs with 409
+- Pruning of finished jobs from the job registry
+- Streaming job output from /api/pipeline/run/<job_id>/logs
+"""
+
+import http.client
+import json
+import sys
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Add reports directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "reports"))
+
+import api
+
+
+def _finished_job(job_id: str, finished_at: datetime) -> dict:
+    return {"job_id": job_id, "state": "SUCCESS", "lines": 0, "finished_at": finished_at.isoformat()}
+
+
+class TestPipelineRunEndpoint:
+    """Test POST /api/pipeline/run and the job endpoints against a local server."""
+
+    def setup_method(self):
+        """Start the API server on an ephemeral loopback port."""
+        api._pipeline_jobs.clear()
+        api._pipeline_job_logs.clear()
+        self.release = threading.Event()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), api.PipelineAPIHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @pytest.fixture(autouse=True)
+    def _isolated(self, tmp_path, monkeypatch):
+        """Run in a scratch directory (handlers create data/) with no API token set."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv(api.PIPELINE_API_TOKEN_ENV, raising=False)
+
+    def teardown_method(self):
+        """Stop the server and finish any job still held open."""
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+        api._pipeline_jobs.clear()
+        api._pipeline_job_logs.clear()
+
+    def _fake_run(self, job_id, cmd):
+        """Stand-in for the pipeline subprocess: runs until the test releases it."""
+        with api._pipeline_jobs_lock:
+            api._pipeline_jobs[job_id]["state"] = "RUNNING"
+        self.release.wait(timeout=10)
+        with api._pipeline_jobs_lock:
+            api._pipeline_jobs[job_id].update(state="SUCCESS", finished_at=datetime.now(timezone.utc).isoformat())
+
+    def _request(self, method, path, body=None, headers=None):
+        conn = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=10)
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            return response.status, response.read()
+        finally:
+            conn.close()
+
+    def _post_run(self, payload=None, headers=None):
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        body = json.dumps(payload if payload is not None else {"mode": "test"})
+        status, data = self._request("POST", "/api/pipeline/run", body, headers)
+        return status, json.loads(data)
+
+    def test_rejects_non_json_content_type(self):
+        """Test that form posts (which skip CORS preflight) are refused with 415."""
+        status, data = self._request("POST", "/api/pipeline/run", "mode=test",
+                                     {"Content-Type": "application/x-www-form-urlencoded"})
+        assert status == 415
+        assert not api._pipeline_jobs
+
+    @pytest.mark.parametrize("body", ['{"mode": ', '["test"]', '{"mode": "nope"}', '{"storage_provider": "/tmp/x"}'])
+    def test_rejects_malformed_body(self, body):
+        """Test that invalid JSON, non-object bodies and unknown options get 400, not 500."""
+        status, _ = self._request("POST", "/api/pipeline/run", body, {"Content-Type": "application/json"})
+        assert status == 400
+        assert not api._pipeline_jobs
+
+    def test_concurrent_run_conflicts(self):
+        """Test that a second run is refused with 409 while the first is active."""
+        with patch.object(api, "_run_pipeline_job", self._fake_run):
+            status, first = self._post_run()
+            assert status == 202
+            job_id = first["data"]["job_id"]
+
+            status, second = self._post_run({"mode": "full"})
+            assert status == 409
+            assert second["data"]["job_id"] == job_id
+
+            self.release.set()
+            for _ in range(100):
+                if api.get_active_pipeline_job() is None:
+                    break
+                threading.Event().wait(0.05)
+            status, third = self._post_run()
+        assert status == 202
+        assert third["data"]["job_id"] != job_id
+
+    def test_bearer_token_required_when_configured(self, monkeypatch):
+        """Test that a configured token is required even from loopback clients."""
+        monkeypatch.setenv(api.PIPELINE_API_TOKEN_ENV, "s3cret")
+        with patch.object(api, "_run_pipeline_job", self._fake_run):
+            assert self._post_run()[0] == 401
+            assert self._post_run(headers={"Authorization": "Bearer wrong"})[0] == 401
+            assert self._post_run(headers={"Authorization": "Bearer s3cret"})[0] == 202
+
+    def test_log_stream(self):
+        """Test that buffered job output is streamed as events, followed by an end event."""
+        api._pipeline_jobs["job1"] = {"job_id": "job1", "state": "SUCCESS", "lines": 2}
+        api._pipeline_job_logs["job1"] = deque([(1, "step one"), (2, "step two")])
+
+        status, data = self._request("GET", "/api/pipeline/run/job1/logs")
+        assert status == 200
+        assert data.decode() == "id: 1\ndata: step one\n\nid: 2\ndata: step two\n\nevent: end\ndata: SUCCESS\n\n"
+        assert self._request("GET", "/api/pipeline/run/missing/logs")[0] == 404
+
+
+class TestPipelineRunAuthorization:
+    """Test the authorization check on a handler built without a socket."""
+
+    def _handler(self, client_ip, headers=None):
+        handler = api.PipelineAPIHandler.__new__(api.PipelineAPIHandler)
+        handler.client_address = (client_ip, 50000)
+        handler.headers = headers or {}
+        return handler
+
+    def test_loopback_only_without_token(self, monkeypatch):
+        """Test that without a token only local clients may start runs."""
+        monkeypatch.delenv(api.PIPELINE_API_TOKEN_ENV, raising=False)
+        assert self._handler("127.0.0.1")._is_authorized()
+        assert self._handler("::1")._is_authorized()
+        assert not self._handler("192.168.1.20")._is_authorized()
+
+    def test_token_allows_remote_clients(self, monkeypatch):
+        """Test that a valid bearer token authorizes non-local clients."""
+        monkeypatch.setenv(api.PIPELINE_API_TOKEN_ENV, "s3cret")
+        assert self._handler("192.168.1.20", {"Authorization": "Bearer s3cret"})._is_authorized()
+        assert not self._handler("192.168.1.20", {"Authorization": "Bearer nope"})._is_authorized()
+        assert not self._handler("127.0.0.1")._is_authorized()
+
+
+class TestPipelineJobRegistry:
+    """Test start_pipeline_job validation and pruning."""
+
+    def setup_method(self):
+        api._pipeline_jobs.clear()
+        api._pipeline_job_logs.clear()
+
+    def teardown_method(self):
+        api._pipeline_jobs.clear()
+        api._pipeline_job_logs.clear()
+
+    def test_rejects_unknown_options(self):
+        """Test that only allowlisted modes and storage providers are accepted."""
+        with pytest.raises(ValueError):
+            api.start_pipeline_job("debug")
+        with pytest.raises(ValueError):
+            api.start_pipeline_job("test", "--config=/etc/passwd")
+
+    def test_prunes_expired_and_excess_jobs(self):
+        """Test that finished jobs past the TTL or over the cap are dropped on submit."""
+        now = datetime.now(timezone.utc)
+        expired = now - timedelta(seconds=api.PIPELINE_JOB_TTL_SECONDS + 60)
+        api._pipeline_jobs["old"] = _finished_job("old", expired)
+        api._pipeline_job_logs["old"] = deque()
+        for i in range(api.PIPELINE_MAX_JOBS):
+            job_id = f"recent{i:02d}"
+            api._pipeline_jobs[job_id] = _finished_job(job_id, now - timedelta(seconds=api.PIPELINE_MAX_JOBS - i))
+            api._pipeline_job_logs[job_id] = deque()
+
+        with patch.object(api, "_run_pipeline_job", Mock()):
+            job_id = api.start_pipeline_job("test")
+
+        assert job_id in api._pipeline_jobs
+        assert "old" not in api._pipeline_jobs and "old" not in api._pipeline_job_logs
+        assert "recent00" not in api._pipeline_jobs, "Oldest finished job should make room for the new one"
+        assert "recent01" in api._pipeline_jobs
+        assert len(api._pipeline_jobs) == api.PIPELINE_MAX_JOBS
@@ -25,7 +25,7 @@ import pytest
 # Import the modules to test
 from pipeline.utils.common import (
     StorageBackend, LocalStorageBackend, DataManager,
-    create_storage_backend
+    PrefetchingStorageBackend, create_storage_backend
 )
 
 
@@ -248,6 +248,44 @@ class TestDataManagerWithLocalStorage:
         loaded_df = data_manager.load_dataframe(df_file)
         pd.testing.assert_frame_equal(loaded_df, self.test_df)
     
+    def test_data_manager_load_dataframe_columns(self):
+        """Test column pushdown and cache invalidation for parquet loads."""
+        data_manager = DataManager(base_dir=self.temp_dir, test_mode=True)
+        df_file = os.path.join(self.temp_dir, "columns.parquet")
+        data_manager.save_dataframe(self.test_df, df_file)
+        
+        loaded_df = data_manager.load_dataframe(df_file, columns=["B"])
+        pd.testing.assert_frame_equal(loaded_df, self.test_df[["B"]])
+        
+        updated_df = pd.DataFrame({"A": [7], "B": [8]})
+        data_manager.save_dataframe(updated_df, df_file)
+        loaded_df = data_manager.load_dataframe(df_file, columns=["B"])
+        pd.testing.assert_frame_equal(loaded_df, updated_df[["B"]])
+    
+    def test_data_manager_remote_cache_skips_metadata_calls(self):
+        """Test that remote parquet reads do not pay a metadata round trip per load."""
+        remote = Mock(wraps=LocalStorageBackend())
+        df_file = os.path.join(self.temp_dir, "remote.parquet")
+        
+        data_manager = DataManager(base_dir=self.temp_dir, test_mode=True, storage_backend=remote)
+        data_manager.save_dataframe(self.test_df, df_file)
+        data_manager.load_dataframe(df_file)
+        data_manager.load_dataframe(df_file)
+        assert remote.read_file.call_count == 2, "Remote caching should be opt-in"
+        remote.get_last_modified.assert_not_called()
+        
+        remote.reset_mock()
+        data_manager = DataManager(base_dir=self.temp_dir, test_mode=True, storage_backend=remote,
+                                   dataframe_cache_bytes=1024 * 1024)
+        data_manager.load_dataframe(df_file)
+        data_manager.load_dataframe(df_file)
+        assert remote.read_file.call_count == 1
+        remote.get_last_modified.assert_not_called()
+        
+        updated_df = pd.DataFrame({"A": [7], "B": [8]})
+        data_manager.save_dataframe(updated_df, df_file)
+        pd.testing.assert_frame_equal(data_manager.load_dataframe(df_file), updated_df)
+    
     def test_data_manager_partition_operations(self):
         """Test DataManager partition operations."""
         data_manager = DataManager(
@@ -300,6 +338,44 @@ class TestDataManagerWithLocalStorage:
         assert data_manager.partition_exists(recent_date, "raw")
 
 
+class TestPrefetchingStorageBackend:
+    """Test the prefetching read cache wrapper."""
+    
+    def setup_method(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.local = LocalStorageBackend()
+        for i in range(5):
+            self.local.write_file(os.path.join(self.temp_dir, f"part_{i}.json"), str(i))
+        self.backend = PrefetchingStorageBackend(self.local, prefetch_size=4)
+    
+    def teardown_method(self):
+        """Clean up test environment."""
+        import shutil
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def test_prefetches_sibling_files(self):
+        """Test that neighbouring files are served from the cache."""
+        with patch.object(self.local, 'read_file', wraps=self.local.read_file) as read_file:
+            contents = [
+                self.backend.read_file(os.path.join(self.temp_dir, f"part_{i}.json"))
+                for i in range(5)
+            ]
+        
+        assert contents == ["0", "1", "2", "3", "4"]
+        assert read_file.call_count == 5
+        assert self.backend.read_file(os.path.join(self.temp_dir, "part_3.json")) == "3"
+    
+    def test_write_invalidates_cache(self):
+        """Test that writes are visible through the cache."""
+        path = os.path.join(self.temp_dir, "part_1.json")
+        assert self.backend.read_file(path) == "1"
+        
+        self.backend.write_file(path, "updated")
+        assert self.backend.read_file(path) == "updated"
+
+
 class TestCreateStorageBackend:
     """Test create_storage_backend factory function."""
     
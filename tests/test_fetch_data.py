@@ -6,6 +6,7 @@ This module tests the OHLCVFetcher class and its various functionalities
 including data fetching, validation, and error handling.
 """
 
+import concurrent.futures
 import json
 import os
 import sys
@@ -21,7 +22,8 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent / "pipeline"))
 
 from fetch_data import OHLCVFetcher
-from utils.common import cleanup_old_partitions, handle_rate_limit
+from utils.common import cleanup_old_partitions, handle_rate_limit, AdaptiveConcurrency
+from utils.rate_limit import TokenBucket
 
 @pytest.mark.quick
 def test_metadata_matches_processed_count():
@@ -246,6 +248,43 @@ def test_rate_limit_handling():
     
     assert True
 
+@pytest.mark.quick
+def test_token_bucket_throttle():
+    """Test that the request bucket halves its rate on 429 and restores it."""
+    print("\n=== Testing Token Bucket Throttling ===")
+    
+    bucket = TokenBucket(rate=4, capacity=20)
+    bucket.throttle()
+    assert bucket.rate == 2, f"Rate should be halved to 2, got {bucket.rate}"
+    
+    # Burst capacity covers every acquire, so no waiting is needed
+    for _ in range(20):
+        bucket.acquire()
+    assert bucket.rate == 4, f"Rate should be restored to 4, got {bucket.rate}"
+    
+    # A per-minute quota spaces tokens over the minute once the burst is spent
+    per_minute = TokenBucket(rate=5, capacity=1, period=60.0)
+    assert per_minute.try_acquire() == 0
+    assert per_minute.try_acquire() > 11, "Next token should be about 12s away at 5 per minute"
+    
+    print("✅ Token bucket throttling works")
+
+@pytest.mark.quick
+def test_adaptive_concurrency():
+    """Test that the AIMD limiter grows on success and shrinks on rate limits."""
+    print("\n=== Testing Adaptive Concurrency ===")
+    
+    limiter = AdaptiveConcurrency(initial=4, min_concurrency=1, max_concurrency=8)
+    for _ in range(50):
+        limiter.on_success()
+    assert limiter.limit == 8, f"Limit should grow to the maximum of 8, got {limiter.limit}"
+    
+    limiter.on_overload()
+    assert limiter.limit == 5, f"Limit should drop to 5 after a rate limit, got {limiter.limit}"
+    assert limiter.resizes[-1]['reason'] == 'rate_limited', "Decrease should be recorded"
+    
+    print("✅ Adaptive concurrency works")
+
 @pytest.mark.heavy
 def test_full_test_mode():
     """Test full test mode functionality."""
@@ -438,6 +477,218 @@ def test_batch_error_handling():
 
         print("✅ Batch error handling works correctly")
 
+@pytest.mark.quick
+def test_resume_after_interrupted_run():
+    """Test that a run killed mid-partition is resumed without refetching saved batches."""
+    print("\n=== Testing Resume After Interruption ===")
+    
+    tickers = ['T0', 'T1', 'T2', 'T3', 'T4', 'T5']
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fetcher = OHLCVFetcher()
+        fetcher.config.update({
+            'base_data_path': str(Path(temp_dir) / "data"),
+            'base_log_path': str(Path(temp_dir) / "logs"),
+            'incremental_mode': False,
+            'async_fetch_enabled': False,
+            'cleanup_enabled': False,
+            'progress': False,
+            'batch_size': 2
+        })
+        fetched = []
+        
+        def fake_fetch(ticker, days, interrupt_at=None):
+            if ticker == interrupt_at:
+                raise KeyboardInterrupt
+            fetched.append(ticker)
+            return pd.DataFrame({
+                'date': [pd.Timestamp('2025-01-14'), pd.Timestamp('2025-01-15')],
+                'open': [1.0, 2.0], 'high': [2.0, 3.0], 'low': [0.5, 1.5],
+                'close': [1.5, 2.5], 'volume': [100, 200]
+            })
+        
+        with patch.object(fetcher, 'get_latest_ticker_file', return_value=Path('dummy.csv')), \
+             patch.object(fetcher, 'load_tickers', return_value=tickers):
+            # Killed while fetching T4: the batches T0-T1 and T2-T3 are finished
+            with patch.object(fetcher, 'fetch_ohlcv_data', side_effect=lambda t, d: fake_fetch(t, d, 'T4')):
+                with pytest.raises(KeyboardInterrupt):
+                    fetcher.run()
+            assert fetched == ['T0', 'T1', 'T2', 'T3'], f"Unexpected first run fetches: {fetched}"
+            
+            fetched.clear()
+            with patch.object(fetcher, 'fetch_ohlcv_data', side_effect=fake_fetch):
+                result = fetcher.run()
+        
+        assert fetched == ['T4', 'T5'], f"Resumed run should only fetch the remaining tickers, got {fetched}"
+        assert result['tickers_processed'] == len(tickers)
+        assert sorted(result['successful_tickers']) == tickers
+        
+        data_path = Path(result['data_path'])
+        saved = pd.read_parquet(data_path / "ohlcv.parquet")
+        assert sorted(saved['symbol'].astype(str).unique()) == tickers
+        assert len(saved) == 2 * len(tickers), "Each ticker should be saved exactly once"
+        assert (data_path / "_SUCCESS").exists()
+        assert not (data_path / "ohlcv.parquet.parts").exists(), "Part files should be removed once combined"
+        
+        print("✅ Interrupted run resumes with only the remaining tickers")
+
+@pytest.mark.quick
+def test_chart_fetch_plan():
+    """Test that streamed chart requests are only planned for tickers that need a fetch, each with its own days."""
+    print("\n=== Testing Chart Fetch Plan ===")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fetcher = OHLCVFetcher()
+        fetcher.config.update({
+            'historical_data_path': str(Path(temp_dir) / "historical"),
+            'ohlcv_cache_enabled': False
+        })
+        today = pd.Timestamp(datetime.now().date())
+        for ticker, latest in [('FRESH', today), ('STALE', today - pd.Timedelta(days=10))]:
+            frame = pd.DataFrame({'date': [latest - pd.Timedelta(days=400), latest], 'close': [1.0, 2.0]})
+            assert fetcher.save_historical_data(ticker, frame)
+        
+        plan = fetcher._chart_fetch_plan(['FRESH', 'STALE', 'NEW'], incremental_mode=True)
+        assert 'FRESH' not in plan, "Up-to-date tickers should not be fetched"
+        assert plan['STALE'] == 15, f"Stale ticker should fetch since its last update, got {plan.get('STALE')}"
+        assert plan['NEW'] == 30, "Tickers without history should fetch the full window"
+        
+        with patch.object(fetcher, '_submit_chart_fetch', side_effect=lambda ticker, days: (ticker, days)):
+            fetcher._start_chart_stream(plan)
+        assert fetcher._chart_futures == {'STALE': (15, ('STALE', 15)), 'NEW': (30, ('NEW', 30))}
+        fetcher._chart_futures = {}
+        
+        print("✅ Chart requests planned per ticker")
+
+
+@pytest.mark.quick
+def test_failed_history_saves_reported():
+    """Test that failed background historical saves are reported in the run metadata."""
+    print("\n=== Testing Historical Save Failures ===")
+    
+    tickers = ['T0', 'T1', 'T2', 'T3', 'T4', 'T5']
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fetcher = OHLCVFetcher()
+        fetcher.config.update({
+            'base_data_path': str(Path(temp_dir) / "data"),
+            'base_log_path': str(Path(temp_dir) / "logs"),
+            'incremental_mode': True,
+            'async_fetch_enabled': False,
+            'cleanup_enabled': False,
+            'progress': False,
+            'batch_size': 2
+        })
+        frame = pd.DataFrame({
+            'date': [pd.Timestamp('2025-01-14'), pd.Timestamp('2025-01-15')],
+            'open': [1.0, 2.0], 'high': [2.0, 3.0], 'low': [0.5, 1.5],
+            'close': [1.5, 2.5], 'volume': [100, 200]
+        })
+        saved = []
+        
+        def fake_save(ticker, df):
+            saved.append(ticker)
+            return ticker != 'T3'
+        
+        with patch.object(fetcher, 'get_latest_ticker_file', return_value=Path('dummy.csv')), \
+             patch.object(fetcher, 'load_tickers', return_value=tickers), \
+             patch.object(fetcher, 'fetch_incremental_data', return_value=frame), \
+             patch.object(fetcher, 'merge_with_historical', return_value=frame), \
+             patch.object(fetcher, 'save_historical_data', side_effect=fake_save):
+            result = fetcher.run()
+        
+        assert sorted(saved) == tickers, "Every ticker's history should be saved"
+        assert result['failed_history_tickers'] == ['T3']
+        assert result['status'] == 'partial_success'
+        assert sorted(result['successful_tickers']) == tickers, "Partition data is still saved"
+        
+        print("✅ Failed historical saves are reported")
+
+
+@pytest.mark.quick
+def test_alpha_vantage_split_convention():
+    """Test that Alpha Vantage rows mark "no split" with 0.0, like the other sources."""
+    print("\n=== Testing Alpha Vantage Split Convention ===")
+    
+    fetcher = OHLCVFetcher()
+    fetcher.config['alpha_vantage_api_key'] = 'test'
+    payload = {"Time Series (Daily)": {
+        "2025-01-14": {"1. open": "1", "2. high": "2", "3. low": "0.5", "4. close": "1.5", "5. volume": "100"},
+        "2025-01-15": {"1. open": "2", "2. high": "3", "3. low": "1.5", "4. close": "2.5", "5. volume": "200"}
+    }}
+    response = MagicMock(status_code=200, content=json.dumps(payload).encode())
+    
+    with patch.object(fetcher.http_session, 'get', return_value=response):
+        df = fetcher.fetch_ohlcv_alpha_vantage('TEST', 30)
+    
+    assert list(df['stock_splits']) == [0.0, 0.0], "Alpha Vantage rows should not look like splits"
+    assert list(df['dividends']) == [0.0, 0.0]
+    
+    print("✅ Alpha Vantage rows use the shared split convention")
+
+
+@pytest.mark.quick
+def test_failed_stream_not_refetched():
+    """Test that a failed streamed chart request is not sent again synchronously."""
+    print("\n=== Testing Failed Streamed Chart Request ===")
+    
+    fetcher = OHLCVFetcher()
+    failed = concurrent.futures.Future()
+    failed.set_exception(ConnectionError("HTTP 429"))
+    fetcher._chart_futures = {'FAIL': (30, failed)}
+    
+    with patch.object(fetcher, 'fetch_ohlcv_chart') as fetch_chart, \
+         patch.object(fetcher, '_yf_ticker') as yf_ticker:
+        assert fetcher.fetch_ohlcv_yfinance('FAIL', 30) is None
+    fetch_chart.assert_not_called()
+    yf_ticker.assert_not_called()
+    assert fetcher._chart_futures == {}
+    
+    print("✅ Failed streamed requests fall back without a second chart request")
+
+
+@pytest.mark.quick
+def test_alpha_vantage_rate_limit_retry():
+    """Test that Alpha Vantage "Note"/"Information" throttling is retried, then given up."""
+    print("\n=== Testing Alpha Vantage Rate Limit Retry ===")
+    
+    fetcher = OHLCVFetcher()
+    fetcher.config['alpha_vantage_api_key'] = 'test'
+    fetcher.config['api_retry_attempts'] = 3
+    
+    # Both throttling keys are detected; other notices are not
+    assert fetcher._alpha_vantage_rate_limit_message(
+        {"Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute."})
+    assert fetcher._alpha_vantage_rate_limit_message(
+        {"Information": "We have detected your API key and our standard API rate limit is 25 requests per day."})
+    assert fetcher._alpha_vantage_rate_limit_message({"Information": "The demo API key is for demo purposes only."}) is None
+    assert fetcher._alpha_vantage_rate_limit_message({"Time Series (Daily)": {}}) is None
+    
+    throttled = MagicMock(status_code=200, content=json.dumps(
+        {"Information": "Our standard API rate limit is 25 requests per day."}).encode())
+    payload = {"Time Series (Daily)": {
+        "2025-01-15": {"1. open": "2", "2. high": "3", "3. low": "1.5", "4. close": "2.5", "5. volume": "200"}
+    }}
+    ok = MagicMock(status_code=200, content=json.dumps(payload).encode())
+    
+    # Throttled once, then served: the same ticker is retried after a backoff
+    with patch.object(fetcher.http_session, 'get', side_effect=[throttled, ok]) as mock_get, \
+         patch('fetch_data.handle_rate_limit') as backoff:
+        df = fetcher.fetch_ohlcv_alpha_vantage('TEST', 30)
+    assert df is not None and len(df) == 1, "Ticker should be fetched after the retry"
+    assert mock_get.call_count == 2
+    backoff.assert_called_once_with(0, fetcher.config)
+    
+    # Throttled on every attempt: give up after api_retry_attempts without a final backoff
+    with patch.object(fetcher.http_session, 'get', return_value=throttled) as mock_get, \
+         patch('fetch_data.handle_rate_limit') as backoff:
+        assert fetcher.fetch_ohlcv_alpha_vantage('TEST', 30) is None
+    assert mock_get.call_count == 3
+    assert [c.args[0] for c in backoff.call_args_list] == [0, 1]
+    
+    print("✅ Alpha Vantage throttling is retried and then given up")
+
+
 def main():
     """Run all tests."""
     print("Starting OHLCV Data Fetcher Tests...")
@@ -450,12 +701,20 @@ def main():
         test_force_flag,
         test_retention_cleanup,
         test_rate_limit_handling,
+        test_token_bucket_throttle,
+        test_adaptive_concurrency,
         test_full_test_mode,
         test_dry_run_mode,
         test_batch_processing,
         test_cooldown_metadata,
         test_progress_bar,
-        test_batch_error_handling
+        test_batch_error_handling,
+        test_resume_after_interrupted_run,
+        test_chart_fetch_plan,
+        test_failed_history_saves_reported,
+        test_alpha_vantage_split_convention,
+        test_failed_stream_not_refetched,
+        test_alpha_vantage_rate_limit_retry
     ]
     
     passed = 0
@@ -16,6 +16,7 @@ from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pytest
+import requests
 
 # Add the pipeline directory to the path
 sys.path.insert(0, str(Path(__file__).parent.parent / "pipeline"))
@@ -166,8 +167,8 @@ def test_mock_api_failure():
     
     fetcher = TickerFetcher()
     
-    # Mock requests.get to simulate API failure
-    with patch('requests.get') as mock_get:
+    # Mock the HTTP session to simulate API failure
+    with patch.object(fetcher.http_session, 'get') as mock_get:
         mock_get.side_effect = Exception("API timeout")
         
         # Test that the script handles failures gracefully
@@ -188,7 +189,7 @@ def test_full_test_mode():
     fetcher = TickerFetcher()
     
     # Test full-test mode with dry-run
-    with patch('requests.get') as mock_get:
+    with patch.object(fetcher.http_session, 'get') as mock_get:
         # Mock successful response
         mock_response = MagicMock()
         mock_response.content = b"<html><table class='wikitable'><tr><td>AAPL</td><td>Apple</td></tr></table></html>"
@@ -206,7 +207,7 @@ def test_dry_run_mode():
     fetcher = TickerFetcher()
     
     # Test dry-run mode
-    with patch('requests.get') as mock_get:
+    with patch.object(fetcher.http_session, 'get') as mock_get:
         # Mock successful response
         mock_response = MagicMock()
         mock_response.content = b"<html><table class='wikitable'><tr><td>AAPL</td><td>Apple</td></tr></table></html>"
@@ -293,6 +294,107 @@ def test_partition_path_creation():
     
     print("✅ Partition path creation works correctly")
 
+def _mock_page_response(content=b"", status_code=200, headers=None):
+    """Build a mocked Wikipedia response."""
+    response = MagicMock()
+    response.content = content
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+def test_page_cache_not_modified():
+    """Test that a 304 response reuses the cached tickers."""
+    print("\n=== Testing Page Cache Revalidation ===")
+    
+    fetcher = TickerFetcher()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fetcher.config['base_log_path'] = temp_dir
+        url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+        
+        # Cache the tickers parsed from a response carrying validators
+        fetcher._save_page_cache(url, _mock_page_response(headers={"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+                                 ['AAPL', 'MSFT'], ['Apple Inc.', 'Microsoft'])
+        assert fetcher._load_page_cache(url) is not None, "Page cache not saved"
+        
+        with patch.object(fetcher.http_session, 'get') as mock_get:
+            mock_get.return_value = _mock_page_response(status_code=304)
+            tickers, company_names = fetcher.fetch_sp500_tickers()
+        
+        sent_headers = mock_get.call_args.kwargs['headers']
+        assert sent_headers == {"If-None-Match": '"abc"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}, \
+            f"Conditional headers not sent: {sent_headers}"
+        assert tickers == ['AAPL', 'MSFT'], f"Cached tickers not reused: {tickers}"
+        assert company_names == ['Apple Inc.', 'Microsoft'], f"Cached names not reused: {company_names}"
+    
+    print("✅ Not-modified page reuses cached tickers")
+
+def test_page_cache_rejects_bad_entries():
+    """Test that malformed or mismatched page caches are ignored."""
+    print("\n=== Testing Page Cache Validation ===")
+    
+    fetcher = TickerFetcher()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fetcher.config['base_log_path'] = temp_dir
+        url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+        cache_path = fetcher._page_cache_path()
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        valid = {"url": url, "etag": '"abc"', "tickers": ['AAPL'], "company_names": ['Apple Inc.']}
+        bad_entries = {
+            "malformed JSON": b'{"url": ',
+            "non-object": json.dumps([valid]).encode(),
+            "other URL": json.dumps({**valid, "url": "https://example.com"}).encode(),
+            "no tickers": json.dumps({**valid, "tickers": [], "company_names": []}).encode(),
+            "length mismatch": json.dumps({**valid, "company_names": []}).encode(),
+        }
+        for label, content in bad_entries.items():
+            cache_path.write_bytes(content)
+            assert fetcher._load_page_cache(url) is None, f"Cache with {label} should be ignored"
+        
+        # An ignored cache means an unconditional request, so a 304 is not trusted
+        with patch.object(fetcher.http_session, 'get') as mock_get:
+            mock_get.return_value = _mock_page_response(status_code=304)
+            mock_get.return_value.raise_for_status.side_effect = requests.HTTPError("304")
+            with pytest.raises(requests.HTTPError):
+                fetcher.fetch_sp500_tickers()
+        assert mock_get.call_args.kwargs['headers'] == {}, "Conditional headers sent for an ignored cache"
+    
+    print("✅ Malformed and mismatched page caches are ignored")
+
+def test_constituents_table_parsing():
+    """Test the constituents table parser and its wikitable fallback."""
+    print("\n=== Testing Constituents Table Parsing ===")
+    
+    fetcher = TickerFetcher()
+    rows = "<tr><td>AAPL</td><td>Apple Inc.</td></tr><tr><td>BRK.B</td><td>Berkshire Hathaway</td></tr>"
+    constituents_page = (
+        "<html><body><table class='wikitable'><tr><th>Other</th></tr><tr><td>X</td></tr></table>"
+        "<table class='wikitable sortable' id='constituents'>"
+        f"<tr><th>Symbol</th><th>Security</th><th>GICS Sector</th></tr>{rows.replace('</td></tr>', '</td><td>IT</td></tr>')}"
+        "</table></body></html>"
+    ).encode()
+    fallback_page = f"<html><body><div>intro</div><table class='sortable wikitable'><tr><th>Symbol</th><th>Security</th></tr>{rows}</table></body></html>".encode()
+    
+    # The table is found by id, not by position
+    assert fetcher._read_constituents_table(constituents_page) == (
+        ['AAPL', 'BRK.B'], ['Apple Inc.', 'Berkshire Hathaway']
+    ), "Constituents table not parsed"
+    
+    # Without id="constituents" the first wikitable is parsed instead
+    assert fetcher._read_constituents_table(fallback_page) is None, "Page without constituents table should return None"
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fetcher.config['base_log_path'] = temp_dir
+        with patch.object(fetcher.http_session, 'get') as mock_get:
+            mock_get.return_value = _mock_page_response(content=fallback_page)
+            tickers, company_names = fetcher.fetch_sp500_tickers()
+    
+    assert tickers == ['AAPL', 'BRK.B'], f"Fallback tickers mismatch: {tickers}"
+    assert company_names == ['Apple Inc.', 'Berkshire Hathaway'], f"Fallback names mismatch: {company_names}"
+    
+    print("✅ Constituents table and wikitable fallback parsed")
+
 def main():
     """Run all tests."""
     print("Starting Ticker Fetcher Tests...")
@@ -310,7 +412,10 @@ def main():
         test_ticker_changes_calculation,
         test_ticker_validation,
         test_ticker_cleaning,
-        test_partition_path_creation
+        test_partition_path_creation,
+        test_page_cache_not_modified,
+        test_page_cache_rejects_bad_entries,
+        test_constituents_table_parsing
     ]
     
     passed = 0
@@ -21,7 +21,7 @@ import pytest
 # Add pipeline directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "pipeline"))
 
-from utils.common import create_storage_backend, DataManager, LocalStorageBackend
+from utils.common import create_storage_backend, DataManager, LocalStorageBackend, _clear_boto3_sessions
 
 
 class TestStorageProviderCLI:
@@ -49,12 +49,17 @@ class TestStorageProviderCLI:
         with patch('pipeline.utils.common.S3_AVAILABLE', True):
             with patch('pipeline.utils.common.boto3') as mock_boto3:
                 mock_s3_client = Mock()
-                mock_boto3.client.return_value = mock_s3_client
+                mock_session = mock_boto3.session.Session.return_value
+                mock_session.client.return_value = mock_s3_client
+                _clear_boto3_sessions()
                 
                 backend = create_storage_backend("s3", bucket_name="test-bucket")
+                create_storage_backend("s3", bucket_name="test-bucket")
                 
                 assert backend.bucket_name == "test-bucket"
-                mock_boto3.client.assert_called_once()
+                assert backend.s3_client is mock_s3_client
+                mock_boto3.session.Session.assert_called_once()
+                _clear_boto3_sessions()
     
     def test_create_storage_backend_gcs(self):
         """Test creating GCS storage backend."""
@@ -97,7 +102,8 @@ class TestStorageProviderCLI:
         with patch('pipeline.utils.common.S3_AVAILABLE', True):
             with patch('pipeline.utils.common.boto3') as mock_boto3:
                 mock_s3_client = Mock()
-                mock_boto3.client.return_value = mock_s3_client
+                mock_boto3.session.Session.return_value.client.return_value = mock_s3_client
+                _clear_boto3_sessions()
                 
                 s3_backend = create_storage_backend("s3", bucket_name="test-bucket")
                 data_manager = DataManager(
@@ -109,6 +115,7 @@ class TestStorageProviderCLI:
                 assert data_manager.storage.bucket_name == "test-bucket"
                 assert data_manager.base_dir == "test_data"
                 assert data_manager.test_mode is True
+                _clear_boto3_sessions()
 
 
 class TestCLIArgumentParsing:
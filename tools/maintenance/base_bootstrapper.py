@@ -8,26 +8,72 @@ Handles statistics tracking, batch processing, rate limiting, and summary genera
 
 import json
 import logging
+import sys
+import threading
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import pandas as pd
-from tqdm import tqdm
+
+# Optional fast JSON serialization for large summaries
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class RateLimitError(Exception):
+    """Raised by fetch_historical_data when the data provider throttles a request."""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _per_minute_token_bucket(calls_per_minute: float):
+    """
+    Build the pipeline's shared TokenBucket for a per-minute call quota.
+    
+    rate_limit is imported from pipeline/utils on first use rather than
+    through the utils package, whose import configures logging.
+    """
+    try:
+        from rate_limit import TokenBucket
+    except ImportError:
+        sys.path.append(str(Path(__file__).resolve().parent.parent.parent / "pipeline" / "utils"))
+        from rate_limit import TokenBucket
+    return TokenBucket(calls_per_minute, capacity=max(1.0, min(calls_per_minute, 5.0)), period=60.0)
 
 
 class BaseBootstrapper(ABC):
     """Base class for historical data bootstrapping with shared functionality."""
     
-    def __init__(self, output_dir: Path, batch_size: int = 10, rate_limit_delay: float = 1.0):
+    def __init__(self, output_dir: Path, batch_size: int = 10, rate_limit_delay: float = 1.0,
+                 max_workers: int = 4, calls_per_minute: Optional[float] = None,
+                 max_retries: int = 3, max_backoff: float = 60.0, progress_every: int = 25):
         self.output_dir = output_dir
         self.batch_size = batch_size
         self.rate_limit_delay = rate_limit_delay
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max(1, max_retries)
+        self.max_backoff = max_backoff
+        self.progress_every = max(1, progress_every)
+        self._completed = 0
+        
+        # Rate limiting: an explicit per-minute quota (e.g. 5 for the free AV plan,
+        # 75 for paid) takes precedence over the legacy per-call delay
+        if calls_per_minute is None and rate_limit_delay > 0:
+            calls_per_minute = 60.0 / rate_limit_delay
+        self.rate_limiter = _per_minute_token_bucket(calls_per_minute) if calls_per_minute else None
         
         # Setup logging
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._stats_lock = threading.Lock()
         
         # Create output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -40,6 +86,7 @@ class BaseBootstrapper(ABC):
             "total_rows": 0,
             "start_time": None,
             "end_time": None,
+            "rate_limited_retries": 0,
             "failed_tickers_list": [],
             "errors": {}
         }
@@ -61,51 +108,102 @@ class BaseBootstrapper(ABC):
             return False
         return True
     
+    def _record_failure(self, ticker, error: Optional[str] = None) -> None:
+        """Record a failed ticker in the shared statistics."""
+        with self._stats_lock:
+            self.stats["failed_tickers"] += 1
+            self.stats["failed_tickers_list"].append(str(ticker))
+            if error is not None:
+                self.stats["errors"][str(ticker)] = error
+    
+    def fetch_with_retry(self, ticker: str) -> Optional[pd.DataFrame]:
+        """Fetch a ticker, backing off and retrying when the provider throttles."""
+        for attempt in range(self.max_retries):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                return self.fetch_historical_data(ticker)
+            except RateLimitError as e:
+                if attempt + 1 >= self.max_retries:
+                    raise
+                base_delay = self.rate_limit_delay if self.rate_limit_delay > 0 else 1.0
+                delay = e.retry_after if e.retry_after is not None else min(self.max_backoff, base_delay * 2 ** attempt)
+                with self._stats_lock:
+                    self.stats["rate_limited_retries"] += 1
+                self.logger.warning(f"Rate limited on {ticker}, retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+        return None
+    
     def process_single_ticker(self, ticker: str) -> bool:
         """Process a single ticker with error handling."""
         try:
             if not self.validate_ticker(ticker):
-                self.stats["failed_tickers"] += 1
-                self.stats["failed_tickers_list"].append(str(ticker))
+                self._record_failure(ticker)
                 return False
             
             # Fetch data
-            df = self.fetch_historical_data(ticker)
+            df = self.fetch_with_retry(ticker)
             
             if df is not None and len(df) > 0:
                 # Save data
                 if self.save_ticker_data(ticker, df):
-                    self.stats["successful_tickers"] += 1
-                    self.stats["total_rows"] += len(df)
+                    with self._stats_lock:
+                        self.stats["successful_tickers"] += 1
+                        self.stats["total_rows"] += len(df)
                     self.logger.info(f"✅ Successfully processed {ticker} ({len(df)} rows)")
                     return True
                 else:
-                    self.stats["failed_tickers"] += 1
-                    self.stats["failed_tickers_list"].append(ticker)
+                    self._record_failure(ticker)
                     self.logger.error(f"❌ Failed to save data for {ticker}")
                     return False
             else:
-                self.stats["failed_tickers"] += 1
-                self.stats["failed_tickers_list"].append(ticker)
+                self._record_failure(ticker)
                 self.logger.error(f"❌ Failed to fetch data for {ticker}")
                 return False
                 
         except Exception as e:
             error_msg = f"Unexpected error processing {ticker}: {str(e)}"
             self.logger.error(error_msg)
-            self.stats["errors"][str(ticker)] = str(e)
-            self.stats["failed_tickers"] += 1
-            self.stats["failed_tickers_list"].append(str(ticker))
+            self._record_failure(ticker, str(e))
             return False
     
-    def process_batch(self, tickers: List[str]) -> None:
-        """Process a batch of tickers with rate limiting."""
-        for ticker in tickers:
-            self.process_single_ticker(ticker)
-            
-            # Rate limiting
-            if self.rate_limit_delay > 0:
-                time.sleep(self.rate_limit_delay)
+    def _log_progress(self) -> None:
+        """Count a finished ticker and log progress every ``progress_every`` completions."""
+        with self._stats_lock:
+            self._completed += 1
+            completed = self._completed
+            total = self.stats["total_tickers"]
+        if completed % self.progress_every == 0 or completed == total:
+            with self._stats_lock:
+                failed = self.stats["failed_tickers"]
+            self.logger.info(f"Bootstrap progress: {completed}/{total} tickers ({failed} failed)")
+    
+    def _process_and_count(self, ticker: str) -> bool:
+        result = self.process_single_ticker(ticker)
+        self._log_progress()
+        return result
+    
+    def process_batch(self, tickers: List[str], executor: Optional[ThreadPoolExecutor] = None) -> None:
+        """
+        Process a batch of tickers concurrently under the shared rate limiter.
+        
+        Uses ``executor`` when given (run() shares one pool across batches),
+        otherwise a pool for this batch only. Results are collected as each
+        ticker finishes rather than in submission order.
+        """
+        if self.max_workers == 1 or len(tickers) == 1:
+            for ticker in tickers:
+                self._process_and_count(ticker)
+            return
+        
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tickers))) as batch_executor:
+                self.process_batch(tickers, batch_executor)
+            return
+        
+        futures = [executor.submit(self._process_and_count, ticker) for ticker in tickers]
+        for future in as_completed(futures):
+            future.result()
     
     def validate_tickers_list(self, tickers: List) -> List[str]:
         """Validate and filter tickers list."""
@@ -133,19 +231,28 @@ class BaseBootstrapper(ABC):
         
         self.stats["start_time"] = datetime.now()
         self.stats["total_tickers"] = len(valid_tickers)
+        self._completed = 0
         
         self.logger.info(f"Starting bootstrap for {len(valid_tickers)} tickers")
         self.logger.info(f"Output directory: {self.output_dir}")
         self.logger.info(f"Batch size: {self.batch_size}")
         self.logger.info(f"Rate limit delay: {self.rate_limit_delay} seconds")
+        self.logger.info(f"Max workers: {self.max_workers}")
         
         # Process tickers in batches
         batches = [valid_tickers[i:i + self.batch_size] for i in range(0, len(valid_tickers), self.batch_size)]
         
-        with tqdm(total=len(valid_tickers), desc="Bootstrap Progress") as pbar:
+        # One worker pool for the whole run instead of one per batch
+        executor = None
+        if self.max_workers > 1:
+            executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(valid_tickers)),
+                                          thread_name_prefix="bootstrap")
+        try:
             for batch in batches:
-                self.process_batch(batch)
-                pbar.update(len(batch))
+                self.process_batch(batch, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
         
         self.stats["end_time"] = datetime.now()
         runtime = (self.stats["end_time"] - self.stats["start_time"]).total_seconds()
@@ -170,6 +277,7 @@ class BaseBootstrapper(ABC):
                 "failed_tickers": self.stats["failed_tickers"],
                 "success_rate": f"{(self.stats['successful_tickers'] / self.stats['total_tickers'] * 100):.2f}%" if self.stats['total_tickers'] > 0 else "0.00%",
                 "total_rows": self.stats["total_rows"],
+                "rate_limited_retries": self.stats["rate_limited_retries"],
                 "runtime_seconds": runtime,
                 "runtime_minutes": runtime / 60,
                 "runtime_hours": runtime / 3600,
@@ -183,8 +291,12 @@ class BaseBootstrapper(ABC):
     def save_summary(self, summary: Dict) -> None:
         """Save summary to file."""
         summary_file = self.output_dir / "bootstrap_summary.json"
-        with open(summary_file, 'w') as f:
-            json.dump(summary, f, indent=2, default=str)
+        if ORJSON_AVAILABLE:
+            with open(summary_file, 'wb') as f:
+                f.write(orjson.dumps(summary, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(summary_file, 'w') as f:
+                json.dump(summary, f, indent=2, default=str)
         self.logger.info(f"Summary saved to: {summary_file}")
     
     def log_summary(self, summary: Dict) -> None:
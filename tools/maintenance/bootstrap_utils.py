@@ -7,13 +7,24 @@ configuration loading, and argument parsing.
 """
 
 import argparse
+import json
 import logging
 import sys
+import time
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 import yaml
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
+SP500_CACHE_FILE = Path("data/cache/sp500_tickers.json")
+SP500_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
 
 def setup_logging(log_level: str = "INFO", verbose: bool = False) -> logging.Logger:
     """Setup logging configuration."""
@@ -31,7 +42,7 @@ def load_config(config_path: str = "config/settings.yaml") -> dict:
     """Load configuration from YAML file."""
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YamlSafeLoader)
         return config or {}
     except Exception as e:
         print(f"❌ Error loading config file: {e}")
@@ -68,8 +79,40 @@ def get_tickers_from_args(args: argparse.Namespace) -> Tuple[List[str], bool]:
     return default_tickers, False
 
 
-def get_sp500_tickers() -> Tuple[List[str], bool]:
-    """Fetch S&P 500 tickers using TickerFetcher."""
+def _load_cached_sp500_tickers(cache_file: Path, ttl_seconds: float) -> Optional[List[str]]:
+    """Return cached S&P 500 tickers if the cache file is younger than the TTL."""
+    try:
+        if time.time() - cache_file.stat().st_mtime >= ttl_seconds:
+            return None
+        with open(cache_file, 'r') as f:
+            tickers = json.load(f)
+        return tickers if isinstance(tickers, list) and tickers else None
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_sp500_tickers(cache_file: Path, tickers: List[str]) -> None:
+    """Persist the S&P 500 ticker list for later bootstrap runs."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(tickers, f)
+        tmp_file.replace(cache_file)
+    except OSError as e:
+        print(f"⚠️  Could not write ticker cache {cache_file}: {e}")
+
+
+def get_sp500_tickers(cache_file: Path = SP500_CACHE_FILE,
+                      ttl_seconds: float = SP500_CACHE_TTL_SECONDS,
+                      refresh: bool = False) -> Tuple[List[str], bool]:
+    """Fetch S&P 500 tickers using TickerFetcher, memoized on disk for ttl_seconds."""
+    if not refresh:
+        cached = _load_cached_sp500_tickers(cache_file, ttl_seconds)
+        if cached:
+            print(f"✅ Loaded {len(cached)} S&P 500 tickers from cache ({cache_file})")
+            return cached, True
+    
     try:
         # Add pipeline directory to path for imports
         project_root = Path(__file__).parent.parent.parent
@@ -95,6 +138,7 @@ def get_sp500_tickers() -> Tuple[List[str], bool]:
             print("❌ Failed to fetch S&P 500 tickers")
             return [], False
         
+        _save_cached_sp500_tickers(cache_file, tickers)
         return tickers, True
         
     except Exception as e:
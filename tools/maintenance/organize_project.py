@@ -174,65 +174,25 @@ def create_project_index():
     print("✅ Created PROJECT_INDEX.md")
 
 def create_quick_access_scripts():
-    """Create quick access scripts for common operations."""
+    """Check that the quick access scripts are in place.
     
-    # Create a quick status check script
-    status_script = """#!/usr/bin/env python3
-\"\"\"
-Quick Status Check
-Check pipeline status and recent activity.
-\"\"\"
-
-import sys
-from pathlib import Path
-
-    # Add project root to path
-    project_root = Path(__file__).parent
-    sys.path.insert(0, str(project_root))
-
-    try:
-        from tools.monitoring.generate_dashboard_report import main as generate_report
-    print("🚀 Generating dashboard report...")
-    generate_report()
-except ImportError:
-    print("❌ Dashboard report generator not found")
-    print("Run: python tools/monitoring/generate_dashboard_report.py")
-"""
-    
-    with open("check_status.py", "w") as f:
-        f.write(status_script)
+    The canonical entry points live in scripts/; earlier versions of this tool
+    wrote second copies into the project root, which drifted out of sync.
+    """
     
-    # Create a quick diagnostics script
-    diagnostics_script = """#!/usr/bin/env python3
-\"\"\"
-Quick Diagnostics
-Run basic diagnostics on the pipeline.
-\"\"\"
-
-import sys
-from pathlib import Path
-
-    # Add project root to path
-    project_root = Path(__file__).parent
-    sys.path.insert(0, str(project_root))
-
-    try:
-        from tools.diagnostics.investigate_api_issues import main as run_diagnostics
-    print("🔍 Running API diagnostics...")
-    run_diagnostics()
-except ImportError:
-    print("❌ Diagnostics tools not found")
-    print("Run: python tools/diagnostics/investigate_api_issues.py")
-"""
-    
-    with open("run_diagnostics.py", "w") as f:
-        f.write(diagnostics_script)
+    quick_scripts = [Path("scripts/check_status.py"), Path("scripts/run_diagnostics.py")]
+    for script in quick_scripts:
+        if script.exists():
+            os.chmod(script, 0o755)
+        else:
+            print(f"⚠️  Missing quick access script: {script}")
     
-    # Make scripts executable
-    os.chmod("check_status.py", 0o755)
-    os.chmod("run_diagnostics.py", 0o755)
+    # Flag stale root-level copies generated by earlier versions
+    for stale in ("check_status.py", "run_diagnostics.py"):
+        if Path(stale).exists():
+            print(f"⚠️  Duplicate {stale} in project root; scripts/{stale} is the maintained copy")
     
-    print("✅ Created quick access scripts: check_status.py, run_diagnostics.py")
+    print("✅ Quick access scripts: scripts/check_status.py, scripts/run_diagnostics.py")
 
 def cleanup_temp_files():
     """Clean up temporary and cache files."""
@@ -280,7 +240,7 @@ def main():
     
     print("🎉 Project organization completed!")
     print("\n📖 Check PROJECT_INDEX.md for the new structure")
-    print("⚡ Use check_status.py and run_diagnostics.py for quick access")
+    print("⚡ Use scripts/check_status.py and scripts/run_diagnostics.py for quick access")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -13,7 +13,7 @@ from unittest.mock import Mock, patch
 # Add current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from base_bootstrapper import BaseBootstrapper
+from base_bootstrapper import BaseBootstrapper, RateLimitError
 from bootstrap_utils import (
     create_common_parser, get_api_key_from_config, get_tickers_from_args,
     load_config, setup_logging, validate_tickers
@@ -149,6 +149,54 @@ def test_error_handling():
     print("✅ Error handling test passed")
 
 
+def test_rate_limit_retry():
+    """Test that fetch_with_retry backs off on RateLimitError and gives up after max_retries."""
+    print("Testing rate limit retry...")
+    
+    class ThrottledBootstrapper(TestBootstrapper):
+        """Raises RateLimitError for the first ``throttled`` calls."""
+        
+        def __init__(self, output_dir: Path, throttled: int, retry_after=None):
+            super().__init__(output_dir)
+            self.max_retries = 3
+            self.throttled = throttled
+            self.retry_after = retry_after
+        
+        def fetch_historical_data(self, ticker: str):
+            if len(self.fetch_calls) < self.throttled:
+                self.fetch_calls.append(ticker)
+                raise RateLimitError("Our standard API rate limit is 25 requests per day.", self.retry_after)
+            return super().fetch_historical_data(ticker)
+    
+    output_dir = Path("/tmp/test_rate_limit_bootstrap")
+    
+    # Throttled twice, then served: exponential backoff from rate_limit_delay
+    bootstrapper = ThrottledBootstrapper(output_dir, throttled=2)
+    with patch("base_bootstrapper.time.sleep") as mock_sleep:
+        df = bootstrapper.fetch_with_retry("AAPL")
+    assert df is not None and len(df) > 0
+    assert bootstrapper.fetch_calls == ["AAPL"] * 3
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [0.1, 0.2]
+    assert bootstrapper.stats["rate_limited_retries"] == 2
+    
+    # A provider-supplied Retry-After takes precedence over the backoff
+    bootstrapper = ThrottledBootstrapper(output_dir, throttled=1, retry_after=7.0)
+    with patch("base_bootstrapper.time.sleep") as mock_sleep:
+        assert bootstrapper.fetch_with_retry("AAPL") is not None
+    mock_sleep.assert_called_once_with(7.0)
+    
+    # Throttled on every attempt: the ticker fails after max_retries fetches
+    bootstrapper = ThrottledBootstrapper(output_dir, throttled=10)
+    with patch("base_bootstrapper.time.sleep") as mock_sleep:
+        assert bootstrapper.process_single_ticker("AAPL") == False
+    assert bootstrapper.fetch_calls == ["AAPL"] * 3
+    assert mock_sleep.call_count == 2, "No backoff after the final attempt"
+    assert bootstrapper.stats["failed_tickers_list"] == ["AAPL"]
+    assert "rate limit" in bootstrapper.stats["errors"]["AAPL"]
+    
+    print("✅ Rate limit retry test passed")
+
+
 def main():
     """Run all tests."""
     print("Running refactored bootstrap tests...")
@@ -158,6 +206,7 @@ def main():
         test_base_bootstrapper()
         test_bootstrap_utils()
         test_error_handling()
+        test_rate_limit_retry()
         
         print("=" * 50)
         print("✅ All tests passed! Refactoring is working correctly.")
@@ -0,0 +1,5 @@
+"""
+Monitoring and reporting tools for the data pipeline.
+"""
+
+__version__ = "1.0.0" 
\ No newline at end of file